@@ -22,25 +22,41 @@
 ##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 ##    SOFTWARE.
 
+import sys
+import time
+
+## startup timing start, reported with --profile-startup
+startupTimes = (time.perf_counter(), time.process_time(), len(sys.modules))
+
+## runs the headless command line tools instead of the GUI when a command is given, e.g. MemphisRider.py batch manifest.json
+if __name__ == '__main__' and len(sys.argv) > 1 and sys.argv[1] in ('batch', 'crack', 'index', 'serialized-xname', 'restore', 'diff', 'merge', 'fleet', 'similar', 'archive', 'compress', '-h', '--help'):
+    import runpy
+    runpy.run_module('memphisrider', run_name='__main__', alter_sys=True)
+
 import tkinter as tk
 from tkinter import ttk
 from tkinter import simpledialog
 from tkinter import filedialog
 from tkinter import messagebox
 from tkinter import StringVar
-from idlelib.tooltip import Hovertip
-import json
+import tkinter.font
+tkinterImported = (time.perf_counter(), len(sys.modules))
 import os
 import io
-import binascii
-import struct
 import hashlib
 import datetime
+import memphisrider
+from memphisrider import MY_CARS, CAREER, xnames
+from memphisrider.startup import StartupProfile
+
+startupProfile = StartupProfile('--profile-startup' in sys.argv[1:], *startupTimes)
+startupProfile.mark("import tkinter", *tkinterImported)
+startupProfile.mark("import memphisrider and stdlib")
 
 ## sets current working directory to script location's
 os.chdir(os.path.realpath(os.path.dirname(__file__)))
 
-## check for unsaved changes upon being called on opening
+## check for unsaved changes upon being called on opening; the queued writes are finished before exiting
 def unsavedChanges():
     if dirtyFlag == 1:
         confirmChanges = messagebox.askyesnocancel("Confirm exit", "You have unsaved changes, do you want to save before exiting?")
@@ -48,11 +64,12 @@ def unsavedChanges():
             return
         elif confirmChanges:
             saveProfile()
-            root.destroy()
-        else:
-            root.destroy()
-    else:
-        root.destroy()
+            flushWrites()
+            ## the save failed and said so, stay open
+            if dirtyFlag == 1:
+                return
+    flushWrites()
+    root.destroy()
 
 ## "About" dialog
 def aboutDlg(*args):
@@ -87,9 +104,6 @@ root = tk.Tk()
 root.title("MemphisRider for NFSU2")
 root.protocol('WM_DELETE_WINDOW', unsavedChanges)
 root.minsize(300,450)
-smallIcon = tk.PhotoImage(data=sIconData)
-largeIcon = tk.PhotoImage(data=lIconData)
-root.iconphoto(False, largeIcon, smallIcon)
 
 mainFrame = ttk.Frame(root, padding=(5,10,5,10))
 mainFrame.grid(row = 0, column = 0, sticky="NSEW")
@@ -139,22 +153,39 @@ bottomFrame.columnconfigure(0, weight=1)
 mainNotebook.add(myCarsTab, text = "My Cars Garage")
 mainNotebook.add(careerTab, text = "Career Garage")
 
-## loads button icon data for use
-openBtnIcon = tk.PhotoImage(data=openBtnIconData)
-saveBtnIcon = tk.PhotoImage(data=saveBtnIconData)
-saveAsBtnIcon = tk.PhotoImage(data=saveAsBtnIconData)
-reloadBtnIcon = tk.PhotoImage(data=reloadBtnIconData)
-toolsBtnIcon = tk.PhotoImage(data=toolsBtnIconData)
-addXnameBtnIcon = tk.PhotoImage(data=addXnameBtnIconData)
-chgXnameBtnIcon = tk.PhotoImage(data=chgXnameBtnIconData)
-aboutBtnIcon = tk.PhotoImage(data=aboutBtnIconData)
-slotExportIcon = tk.PhotoImage(data=slotExportIconData)
-slotImportIcon = tk.PhotoImage(data=slotImportIconData)
-slotClearIcon = tk.PhotoImage(data=slotClearIconData)
-moveSlotUpIcon = tk.PhotoImage(data=moveSlotUpIconData)
-moveSlotDownIcon = tk.PhotoImage(data=moveSlotDownIconData)
-exportPresetIcon = tk.PhotoImage(data=exportPresetIconData)
-importPresetIcon = tk.PhotoImage(data=importPresetIconData)
+## the icons are decoded and the tooltips (which import much of idlelib) created only once the window is on screen, see finishStartup.
+## until then widgets are registered with lazyIcon and lazyTooltip
+icons = {}
+pendingIcons = []
+pendingTooltips = []
+tooltips = []
+
+def lazyIcon(widget, iconData, menuLabel=None):
+    pendingIcons.append((widget, iconData, menuLabel))
+
+def lazyTooltip(widget, text):
+    pendingTooltips.append((widget, text))
+
+## decodes the icons, each one once, and puts them on the window and the registered widgets and menu entries
+def loadIcons():
+    for iconData in (sIconData, lIconData):
+        icons[iconData] = tk.PhotoImage(data=iconData)
+    root.iconphoto(False, icons[lIconData], icons[sIconData])
+    for widget, iconData, menuLabel in pendingIcons:
+        if iconData not in icons:
+            icons[iconData] = tk.PhotoImage(data=iconData)
+        if menuLabel is None:
+            widget.configure(image=icons[iconData])
+        else:
+            widget.entryconfigure(menuLabel, image=icons[iconData])
+    pendingIcons.clear()
+
+def loadTooltips():
+    from idlelib.tooltip import Hovertip
+    for widget, text in pendingTooltips:
+        tooltips.append(Hovertip(widget, text))
+    pendingTooltips.clear()
+
 
 ## defines tab button style
 tabButton = ttk.Style()
@@ -163,54 +194,19 @@ tabButton.configure('TabButton.TButton', anchor='w')
 ## initializing main variables
 dirtyFlag = 0
 
-xnames = {
-            "PEUGOT":"0x13E5B272",
-            "FOCUS": "0xDF04CA02",
-            "COROLLA":"0xEB137CF7",
-            "240SX":"0x80FB5001",
-            "MIATA":"0x6B5D4503",
-            "CIVIC":"0x4DC09002",
-            "PEUGOT106":"0x0A07104B",
-            "CORSA":"0xD7FA9302",
-            "HUMMER":"0x4DDD2661",
-            "NAVIGATOR":"0x4AC91902",
-            "ESCALADE":"0x714770CF",
-            "TIBURON":"0x2205FD04",
-            "SENTRA":"0xECBFAE79",
-            "CELICA":"0x60EC5A54",
-            "IS300":"0xEE360203",
-            "SUPRA":"0x8AC4B803",
-            "GOLF":"0x87301600",
-            "A3":"0x53040000",
-            "RSX":"0x7CDB0000",
-            "ECLIPSE":"0x84DA0275",
-            "TT":"0xE7060000",
-            "RX8":"0x01DC0000",
-            "350Z":"0xD1C60A00",
-            "G35":"0x6EA80000",
-            "3000GT":"0x5D9B7C2D",
-            "GTO":"0xC9AC0000",
-            "MUSTANGGT":"0x19581635",
-            "SKYLINE":"0x5E3748BE",
-            "LANCEREVO8":"0xF6EFD209",
-            "RX7":"0x00DC0000",
-            "IMPREZAWRX":"0xF85844CF",
-            "(empty)": "0x00000000"
-          }
-
-userXnames = {}
-
-userDirPaths = {
-            "openProfileDir":"",
-            "importPresetDir":"",
-            "exportPresetDir":"",
-            "importSlotDir":"",
-            "exportSlotDir":"",
-            }
+## user XNAMEs, recent folders and the preset history (see memphisrider.settings); these names are the store's own dicts, which
+## re-reads update in place, and edits are written back by settingsChanged
+settings = memphisrider.SettingsStore()
+userXnames = settings.userXnames
+xnameIndex = memphisrider.XnameIndex()
+
+userDirPaths = settings.userDirPaths
 
 openProfilePath = ''
 openProfilePathPrev = ''
 
+profile = None
+
 myCarsSlotsList = []
 myCarsSlotsListVar = tk.StringVar()
 selectedMyCarsSlot = 0
@@ -225,121 +221,130 @@ newXname = tk.StringVar()
 newXnameHash = tk.StringVar()
 
 filePathStr = tk.StringVar()
+writesStr = tk.StringVar()
 
 activeList = 0
 
 presetImportFlag = 0
 
-carSlots = []
 selSlot = 0
 
-myCarsSlots = []
-careerSlots = []
+myCarsSlotNames = ['(empty)']*memphisrider.MY_CARS_COUNT
+careerSlotNames = ['(empty)']*memphisrider.CAREER_COUNT
 
 importPerfLvCnc = 0
+importPerfLvSel = None
 
-slotsPresetNames = {}
-
-reloadFlag = False
-
-fileLabelAfterIDs = []
+presetHistory = settings.presetHistory
 
-dontLoadPresetDetails = False
+## saves, the recent folders and history lines are written by a background thread (see memphisrider.writer) so slow drives
+## don't freeze the window; finished writes are picked up every WRITES_POLL_MS while any are pending
+WRITES_POLL_MS = 50
+ioWriter = memphisrider.BackgroundWriter()
+writesPollID = None
 
-## function to clear slot lists upon being called
-def clearCarSlots():
-    global myCarsSlots
-    global careerSlots
-    
-    myCarsSlots.clear()
-    for i in range(20):
-        myCarsSlots.append(list())
-        myCarsSlots[i].append(0)
-        myCarsSlots[i].append(0)
-        myCarsSlots[i].append(0)
-
-    careerSlots.clear()
-    for i in range(20):
-        careerSlots.append(list())
-        careerSlots[i].append(0)
-        careerSlots[i].append(0)
-        careerSlots[i].append(0)
-        careerSlots[i].append(0)
-        
-## function to load user XNAMES from a file
-def loadUserXnames():
-    global userXnames
+## settings are written this long after the last change, so a burst of changes is one write
+SETTINGS_WRITE_MS = 500
+settingsWriteID = None
 
-    if os.path.isfile("MemphisRider_userXnames.json") == True or os.path.isfile("MemphisRider_userXnames.txt") == True:
-        if os.path.isfile("MemphisRider_userXnames.json"):
-            userXnamesFilename = "MemphisRider_userXnames.json"
-        else:
-            userXnamesFilename = "MemphisRider_userXnames.txt"
-        with open (userXnamesFilename, 'r') as userXnamesFile:
-            try:
-                userXnames = json.load(userXnamesFile, parse_int=True)
-            except json.decoder.JSONDecodeError:
-                jsonErrorMsg = messagebox.showerror("Error", f'{userXnamesFile} is corrupted or misconfigured.')
-                raise Exception(f'{userXnamesFile} is corrupted or misconfigured.')
-            userXnamesFile.close()
-    else:
-        userXnames.clear()
+## near-duplicate search index, loaded on first use
+similarityIndex = None
 
-## function to load list of recent folders for profiles, presets and slots from a file
-def loadUserDirPaths():
-    global userDirPaths
-    
-    if os.path.isfile("MemphisRider_userDirHistory.json") == True or os.path.isfile("MemphisRider_userDirPaths.txt") == True:
-        if os.path.isfile("MemphisRider_userDirHistory.json"):
-            userDirHistoryFilename = "MemphisRider_userDirHistory.json"
-        else:
-            userDirHistoryFilename = "MemphisRider_userDirPaths.txt"
-        with open (userDirHistoryFilename, 'r') as userDirPathsFile:
-            try:
-                userDirPaths = json.load(userDirPathsFile, parse_int=True)
-            except json.decoder.JSONDecodeError:
-                jsonErrorMsg = messagebox.showerror("Error",f'{userDirHistoryFilename} is corrupted or misconfigured.')
-                raise Exception(f'{userDirHistoryFilename} is corrupted or misconfigured.')
-            userDirPathsFile.close()
-    else:
-        pass
-    
-## writes list of recent folders for profiles, presets and slots to a file
-def saveUserDirPaths():
-    global userDirPaths
-    
-    with open ("MemphisRider_userDirHistory.json", 'w') as userDirPathsFile:
-        userDirPathsFile.write(json.dumps(userDirPaths, indent=4))
-        userDirPathsFile.close
+reloadFlag = False
 
+fileLabelAfterIDs = []
 
-## function to load list of preset hashes
-def loadSlotPresetNames():
-    global slotsPresetNames
-    
-    if os.path.isfile("MemphisRider_presetHistory.json") == True or os.path.isfile("MemphisRider_slotPresetNames.txt") == True:
-        if os.path.isfile("MemphisRider_presetHistory.json"):
-            presetHistoryFilename = "MemphisRider_presetHistory.json"
-        else:
-            presetHistoryFilename = "MemphisRider_slotPresetNames.txt"
-        with open (presetHistoryFilename, 'r') as slotPresetNamesFile:
-            try:
-                slotsPresetNames = json.load(slotPresetNamesFile, parse_int=True)
-                for key, value in slotsPresetNames.items():
-                    if isinstance(value, dict):
-                        pass
-                    else:
-                        slotsPresetNames[key]={"presetName":slotsPresetNames[key], "lastPath":'n/a', "lastDate":"n/a"}
-            except json.decoder.JSONDecodeError:
-                jsonErrorMsg = messagebox.showerror("Error",f'{presetHistoryFilename} is corrupted or misconfigured.')
-                raise Exception(f'{presetHistoryFilename} is corrupted or misconfigured.')
-            slotPresetNamesFile.close()
+## status bar state: the variants of the current message (longest first), the variant picked per width bucket and the measured
+## pixel width of each variant, and the pending refit after a resize
+STATUS_WIDTH_BUCKET = 8
+statusVariants = ('',)
+statusFits = {}
+statusTextWidths = {}
+statusFont = None
+statusFitID = None
+
+## garage list rows waiting to be redrawn by refreshRows, and its pending idle call
+pendingRows = set()
+rowsRefreshID = None
+
+## re-reads the settings files that changed on disk since they were last read or written
+def refreshSettings(force=False):
+    try:
+        refreshed = settings.refresh(force)
+    except (memphisrider.SettingsError, memphisrider.HistoryError) as settingsError:
+        jsonErrorMsg = messagebox.showerror("Error", str(settingsError))
+        raise
+    if "userXnames" in refreshed:
+        xnameIndex.rebuild(userXnames)
+
+## marks a setting as edited, restarting the wait before it's written
+def settingsChanged(name):
+    global settingsWriteID
+    settings.changed(name)
+    if settingsWriteID is not None:
+        root.after_cancel(settingsWriteID)
+    settingsWriteID = root.after(SETTINGS_WRITE_MS, writeSettings)
+
+def writeSettings():
+    global settingsWriteID
+    settingsWriteID = None
+    settings.flush()
+
+## hands a file write to the background writer; callback(result) or errback(error) later runs on the Tk thread, in the
+## order the writes were submitted
+def submitWrite(task, *args, callback=None, errback=None):
+    global writesPollID
+    ioWriter.submit(task, *args, callback=callback, errback=errback or writeFailed)
+    writesLabelUpdate()
+    if writesPollID is None:
+        writesPollID = root.after(WRITES_POLL_MS, pollWrites)
+
+def pollWrites():
+    global writesPollID
+    writesPollID = None
+    if ioWriter.poll():
+        writesPollID = root.after(WRITES_POLL_MS, pollWrites)
+    writesLabelUpdate()
+
+## waits for the queued writes, e.g. before exiting or reading files they may be writing
+def flushWrites():
+    if settingsWriteID is not None:
+        root.after_cancel(settingsWriteID)
+        writeSettings()
+    if ioWriter.pending:
+        root.config(cursor='watch')
+        root.update_idletasks()
+        ioWriter.flush()
+        root.config(cursor='')
+    writesLabelUpdate()
+
+def writeFailed(writeError):
+    writeErrorMsg = messagebox.showerror("Error", f"Couldn't write a file.\n{writeError}")
+
+## shows how many writes are still queued next to the status bar
+def writesLabelUpdate():
+    if ioWriter.pending:
+        writesStr.set(f'Writing ({ioWriter.pending})...')
     else:
-        pass
+        writesStr.set('')
+
+## settings files and history lines are written by the writer too; when one fails the store keeps it to retry with its
+## next write, and the user is told like for any other write
+def storeWrite(task, *args, callback=None, errback=None):
+    def storeWriteFailed(writeError):
+        errback(writeError)
+        writeFailed(writeError)
+    submitWrite(task, *args, callback=callback, errback=storeWriteFailed)
+
+settings.submitWrite = storeWrite
+presetHistory.submitWrite = storeWrite
     
 ## generates MD5 hash of imported preset/slot customization data and checks against slotPresetNames; if hash does not exist, it will be added alongside the preset/slot file name to it.
 def slotPresetNameHash(presetData, presetName = '', filePath = ''):
-    global slotPresetNames
+    recordPresets([presetRecord(presetData, presetName, filePath)])
+
+## the history record of a preset/slot file: (MD5 hash, name, path, date)
+def presetRecord(presetData, presetName = '', filePath = ''):
     presetDataHash = hashlib.md5(presetData).hexdigest()
     if filePath != '' and presetName == '':
         presetName = os.path.splitext(os.path.split(filePath)[1])[0]
@@ -347,24 +352,16 @@ def slotPresetNameHash(presetData, presetName = '', filePath = ''):
     if filePath !='':
         fileTime = os.path.getmtime(filePath)
         fileDate = datetime.datetime.fromtimestamp(fileTime)  
-    
-    slotsPresetNames[presetDataHash] = {"presetName":presetName, "lastPath":filePath, "lastDate":str(fileDate)}
-
-    saveSlotPresetNames()
-
-## writes MD5 hash of preset to a file
-def saveSlotPresetNames():
-    global slotsPresetNames
-    
-    with open ("MemphisRider_presetHistory.json", 'w') as slotPresetNamesFile:
-        slotsPresetNamesSorted = dict(sorted(slotsPresetNames.items(), key=lambda item: item[1]["presetName"]))
-        slotPresetNamesFile.write(json.dumps(slotsPresetNamesSorted, indent=4))
-        slotPresetNamesFile.close
-
-    loadSlotPresetNames()
+    return (presetDataHash, presetName, filePath, str(fileDate))
 
-loadUserXnames()
-loadUserDirPaths()
+## adds records to the history with a single appended write instead of rewriting it
+def recordPresets(records):
+    presetHistory.recordMany(records)
+    ## the rows showing these presets get their names
+    if profile is not None:
+        presetHashes = {record[0] for record in records}
+        slotsChanged((garage, index) for garage, slotCount in ((MY_CARS, memphisrider.MY_CARS_COUNT), (CAREER, memphisrider.CAREER_COUNT))
+                     for index in range(slotCount) if profile.slotFingerprint(garage, index) in presetHashes)
 
 ## functions to validate characters inputted in text boxes
 def inputCallback(string, newString):
@@ -395,15 +392,6 @@ def inputCallbackHex(string, newString):
         else:
             return True
 
-## gets window width to character width ratio depending on OS
-def getWindowTextRatio():
-    if os.name == 'posix':
-        windowTextRatio = 7.29
-    else:
-        windowTextRatio = 6.25
-        
-    return windowTextRatio
-
 ## splits filepath for strings in narrower windows
 def splitPath(sourcePath):
     path = sourcePath
@@ -423,99 +411,151 @@ def splitPath(sourcePath):
 
     return (shortPath0, shortPath1, shortPath2)
     
+## a message's variants: the full path, then shorter ones from splitPath
+def pathVariants(prefix, path, suffix=''):
+    return (f'{prefix}{os.path.normpath(path)}{suffix}',) + tuple(f'{prefix}{shortPath}{suffix}' for shortPath in splitPath(path))
+
+## pixel width of text in the status bar's font, measured once per text
+def statusTextWidth(text):
+    global statusFont
+    textWidth = statusTextWidths.get(text)
+    if textWidth is None:
+        if statusFont is None:
+            statusFont = tkinter.font.Font(font=ttk.Style().lookup('TLabel', 'font') or 'TkDefaultFont')
+        if len(statusTextWidths) > 4096:
+            statusTextWidths.clear()
+        textWidth = statusTextWidths[text] = statusFont.measure(text)
+    return textWidth
+
+## shows the longest variant of the current message that fits fileLabel; widths are rounded down to STATUS_WIDTH_BUCKET pixels
+## so dragging the window edge mostly hits statusFits
+def fitStatus():
+    global statusFitID
+    statusFitID = None
+    widthBucket = fileLabel.winfo_width() // STATUS_WIDTH_BUCKET
+    fitText = statusFits.get((statusVariants, widthBucket))
+    if fitText is None:
+        ## a few pixels are left for the label's padding
+        fitWidth = widthBucket * STATUS_WIDTH_BUCKET - 4
+        fitText = next((variant for variant in statusVariants if statusTextWidth(variant) <= fitWidth), statusVariants[-1])
+        if len(statusFits) > 4096:
+            statusFits.clear()
+        statusFits[(statusVariants, widthBucket)] = fitText
+    if filePathStr.get() != fitText:
+        filePathStr.set(fitText)
+
+## shows a message for good, refitting it on every resize
+def setStatus(variants):
+    global statusVariants
+    statusVariants = tuple(variants)
+    fitStatus()
+
+## cancels the pending status messages, leaving the current one shown
+def cancelStatus():
+    for afterID in fileLabelAfterIDs:
+        fileLabel.after_cancel(afterID)
+    fileLabelAfterIDs.clear()
+
+## shows each (variants, milliseconds) message in turn, then the active file again
+def showStatus(*messages):
+    cancelStatus()
+    variants, duration = messages[0]
+    setStatus(variants)
+    laterMessages = messages[1:]
+    fileLabelAfterIDs.append(fileLabel.after(duration, lambda: showStatus(*laterMessages) if laterMessages else openFileLabel()))
+
 ## sets fileLabel to active file
 def openFileLabel():
-    fileLabel['textvariable'] = filePathStr
     if openProfilePath == '':
-        filePathStr.set('')
-        return
-    initialWindowWidth = root.winfo_width()
-    shortPath = splitPath(openProfilePath)
-    while initialWindowWidth / len(f'File: {os.path.normpath(openProfilePath)}'):
-        if initialWindowWidth / len(f'File: {os.path.normpath(openProfilePath)}') >= getWindowTextRatio():
-            filePathStr.set(f'File: {os.path.normpath(openProfilePath)}')
-            break
-        elif initialWindowWidth / len(f'File: {shortPath[0]}') >= getWindowTextRatio():
-           filePathStr.set(f'File: {shortPath[0]}')
-           break
-        elif initialWindowWidth / len(f'File: {shortPath[1]}') >= getWindowTextRatio():
-            filePathStr.set(f'File: {shortPath[1]}')
-            break
-        else:
-            filePathStr.set(f'File: {shortPath[2]}')
-            break
-        
-## refreshes fileLabel on resize
-def fileLabelResizeCheck(event):
-    widthCurrent = root.winfo_width()
+        setStatus(('',))
+    else:
+        setStatus(pathVariants('File: ', openProfilePath))
 
-    if getattr(root, "_last_width", None) != widthCurrent:
-        root._last_width = widthCurrent
+## back to the active file if a preset's details are shown
+def clearPresetDetails():
+    if "last modified" in filePathStr.get() or "last path:" in filePathStr.get():
+        cancelStatus()
         openFileLabel()
 
-## checks XNAME hashes passed through it against the built-in XNAME list and the user XNAME list, then returns the result
-def checkSlotXname(slot):
-    slotXnameHashTmp = binascii.hexlify(slot)
-    slotXnameCheck = str('0x' + slotXnameHashTmp.decode().upper())
-    if slotXnameCheck in xnames.values() or slotXnameCheck in userXnames.values():
-        for key, value in xnames.items():
-            if value == slotXnameCheck:
-                return key
-            else:
-                for key, value in userXnames.items():
-                    if value == slotXnameCheck:
-                        return key                    
-    else:
-        return slotXnameCheck
+## shows when the slot's preset was last imported or exported, then where from/to
+def showPresetDetails(slotPresetName):
+    presetDetails = presetHistory[slotPresetName]
+    showStatus(((f"Preset {presetDetails['presetName']} last modified {presetDetails['lastDate']}", f"Preset last modified {presetDetails['lastDate']}"), 3500),
+               (pathVariants('Preset last path: ', presetDetails['lastPath']), 3500))
+
+## refits fileLabel once per burst of resize events
+def fileLabelResizeCheck(event):
+    global statusFitID
+    if statusFitID is None:
+        statusFitID = fileLabel.after_idle(fitStatus)
 
 ## sets active tab to determine operations on My Cars or Career slots
 def activeTab(*args):
     global activeList
-    global fileLabelAfterIDs
     activeList = mainNotebook.index(mainNotebook.select()) + 1
-    for afterID in fileLabelAfterIDs:
-        fileLabel.after_cancel(afterID)
-    fileLabelAfterIDs.clear()
-    if "saved" in filePathStr.get() or "slot" in filePathStr.get():
-        return
+    cancelStatus()
     
+## list text of a slot: its XNAME, and the preset's name when it's in the history
+def slotRowText(garage, index):
+    slotNames = myCarsSlotNames if garage == MY_CARS else careerSlotNames
+    slotNames[index] = profile.slotXname(garage, index, xnameIndex)
+    slotPresetName = profile.slotFingerprint(garage, index)
+    if slotPresetName in presetHistory:
+        return f"{slotNames[index]} ({presetHistory[slotPresetName]['presetName']})"
+    return f"{slotNames[index]}"
+
 ## populates car lists from profile
 def myCarsListboxPopulate():
     myCarsSlotsList.clear()
-    for i in range(20):
-        if openProfilePath:
-            myCarsSlots[i][0] = checkSlotXname(myCarsSlots[i][1])
-            slotPresetName = hashlib.md5(myCarsSlots[i][2][28:776]).hexdigest()
-        if slotPresetName in slotsPresetNames.keys():
-            myCarsSlotsList.append(f"{myCarsSlots[i][0]} ({slotsPresetNames[slotPresetName]['presetName']})")
-        else:
-            myCarsSlotsList.append(f"{myCarsSlots[i][0]}")
+    if profile is not None:
+        for i in range(20):
+            myCarsSlotsList.append(slotRowText(MY_CARS, i))
     myCarsSlotsListVar.set(myCarsSlotsList)
 
 def careerListboxPopulate():
     careerSlotsList.clear()
-    for i in range(5):
-        if openProfilePath:
-            careerSlots[i][0] = checkSlotXname(careerSlots[i][1])
-            slotPresetName = hashlib.md5(careerSlots[i][2][28:776]).hexdigest()
-        if slotPresetName in slotsPresetNames.keys():
-            careerSlotsList.append(f"{careerSlots[i][0]} ({slotsPresetNames[slotPresetName]['presetName']})")
-        else:
-            careerSlotsList.append(f"{careerSlots[i][0]}")
+    if profile is not None:
+        for i in range(5):
+            careerSlotsList.append(slotRowText(CAREER, i))
     careerSlotsListVar.set(careerSlotsList)
 
+## after an operation: the given rows, and those of the slots the profile reports as changed, are redrawn once the event
+## loop is idle, together with the button states; operations repeated in one tick (e.g. a held move key) share the redraw
+def slotsChanged(rows=()):
+    global rowsRefreshID
+    pendingRows.update(rows)
+    if rowsRefreshID is None:
+        rowsRefreshID = root.after_idle(refreshRows)
+
+def refreshRows():
+    global rowsRefreshID
+    rowsRefreshID = None
+    ## the profile was closed (or failed to open) since the refresh was scheduled
+    if profile is None:
+        pendingRows.clear()
+        return
+    pendingRows.update(profile.takeChangedSlots())
+    for garage, index in sorted(pendingRows):
+        slotsListbox = myCarsListbox if garage == MY_CARS else careerListbox
+        rowText = slotRowText(garage, index)
+        if slotsListbox.get(index) != rowText:
+            rowSelected = slotsListbox.selection_includes(index)
+            slotsListbox.delete(index)
+            slotsListbox.insert(index, rowText)
+            if rowSelected:
+                slotsListbox.selection_set(index)
+    pendingRows.clear()
+    slotButtonsUpdate()
+
 ## sets loaded slot index, also enables or disables UI elements depending of slot
-def loadSlots(*args):
+def slotButtonsUpdate():
     global selectedMyCarsSlot
     global selectedCareerSlot
-    global fileLabelAfterID
-    global dontLoadPresetDetails
-    careerSlotCount = 0
     if activeList == 1:
         selectedMyCarsSlotInput = myCarsListbox.curselection()
         if len(selectedMyCarsSlotInput)==1:
            selectedMyCarsSlot = int(selectedMyCarsSlotInput[0])
-        if myCarsSlots[selectedMyCarsSlot][0] == "(empty)":
+        if myCarsSlotNames[selectedMyCarsSlot] == "(empty)":
             clearMyCarsSlotBtn.state(['disabled'])
             exportMyCarsPsetBtn.state(['disabled'])
             exportMyCarsSlotBtn.state(['disabled'])
@@ -528,67 +568,22 @@ def loadSlots(*args):
             myCarsMoveSlotUpBtn.state(['!disabled'])
             myCarsMoveSlotDownBtn.state(['!disabled'])
 
-        if selectedMyCarsSlot == 0 and myCarsSlots[selectedMyCarsSlot][0] != '(empty)':
+        if selectedMyCarsSlot == 0 and myCarsSlotNames[selectedMyCarsSlot] != '(empty)':
             myCarsMoveSlotUpBtn.state(['disabled'])
             myCarsMoveSlotDownBtn.state(['!disabled'])
-        if selectedMyCarsSlot == 19 and myCarsSlots[selectedMyCarsSlot][0] != '(empty)':
+        if selectedMyCarsSlot == 19 and myCarsSlotNames[selectedMyCarsSlot] != '(empty)':
             myCarsMoveSlotUpBtn.state(['!disabled'])
             myCarsMoveSlotDownBtn.state(['disabled'])            
-        if selectedMyCarsSlot != 0 and selectedMyCarsSlot != 19 and myCarsSlots[selectedMyCarsSlot][0] != '(empty)':
+        if selectedMyCarsSlot != 0 and selectedMyCarsSlot != 19 and myCarsSlotNames[selectedMyCarsSlot] != '(empty)':
             myCarsMoveSlotUpBtn.state(['!disabled'])
             myCarsMoveSlotDownBtn.state(['!disabled'])
 
-        if dontLoadPresetDetails == True:
-            dontLoadPresetDetails = False
-            return
-        if "last modified" in filePathStr.get() or "last path:" in filePathStr.get():
-            for afterID in fileLabelAfterIDs:
-                fileLabel.after_cancel(afterID)
-            fileLabelAfterIDs.clear()
-            openFileLabel()
-        if myCarsSlots[selectedMyCarsSlot][0] == "(empty)":
-            for afterID in fileLabelAfterIDs:
-                fileLabel.after_cancel(afterID)
-            openFileLabel()
-            fileLabelAfterIDs.clear()
-        slotPresetName = hashlib.md5(myCarsSlots[selectedMyCarsSlot][2][28:776]).hexdigest()
-        if slotPresetName in slotsPresetNames.keys():
-            windowTextRatio = getWindowTextRatio()
-            initialWindowWidth = root.winfo_width()
-            shortPath = splitPath(slotsPresetNames[slotPresetName]['lastPath'])
-            while initialWindowWidth / len(f"Preset {slotsPresetNames[slotPresetName]['presetName']} last modified {slotsPresetNames[slotPresetName]['lastDate']}"):
-                if initialWindowWidth / len(f"Preset last path: {os.path.normpath(slotsPresetNames[slotPresetName]['lastPath'])}") >= windowTextRatio:
-                    presetLastPathStr = f"Preset last path: {os.path.normpath(slotsPresetNames[slotPresetName]['lastPath'])}"
-                elif initialWindowWidth / len(f'Preset last path: {shortPath[0]}') >= windowTextRatio:
-                    presetLastPathStr = f'Preset last path: {shortPath[0]}'
-                elif initialWindowWidth / len(f'Preset last path: {shortPath[1]}') >= windowTextRatio:
-                    presetLastPathStr = f'Preset last path: {shortPath[1]}'
-                else:
-                    presetLastPathStr = f'Preset last path: {shortPath[2]}'
-                    
-                if initialWindowWidth / len(f"Preset {slotsPresetNames[slotPresetName]['presetName']} last modified {slotsPresetNames[slotPresetName]['lastDate']}") >= windowTextRatio:
-                    filePathStr.set(f"Preset {slotsPresetNames[slotPresetName]['presetName']} last modified {slotsPresetNames[slotPresetName]['lastDate']}")
-                    fileLabelAfterIDs.append(fileLabel.after(3500, lambda: filePathStr.set(presetLastPathStr)))
-                    fileLabelAfterIDs.append(fileLabel.after(7000, openFileLabel))
-                    break
-                else:
-                    filePathStr.set(f"Preset last modified {slotsPresetNames[slotPresetName]['lastDate']}")
-                    fileLabelAfterIDs.append(fileLabel.after(3500, lambda: filePathStr.set(presetLastPathStr)))
-                    fileLabelAfterIDs.append(fileLabel.after(7000, openFileLabel))
-                    break
-        else:
-            pass
-            
     if activeList == 2:
         selectedCareerSlotInput = careerListbox.curselection()
         if len(selectedCareerSlotInput)==1:
            selectedCareerSlot = int(selectedCareerSlotInput[0])
-        for i in range(5):
-            if careerSlots[i][2][1069:1070] == b'\x00':
-                pass
-            else:
-                careerSlotCount = careerSlotCount+1
-        if careerSlots[selectedCareerSlot][0] == "(empty)":
+        careerSlotCount = profile.careerSlotCount()
+        if careerSlotNames[selectedCareerSlot] == "(empty)":
             clearCareerSlotBtn.state(['disabled'])
             exportCareerPsetBtn.state(['disabled'])
             exportCareerSlotBtn.state(['disabled'])
@@ -601,119 +596,113 @@ def loadSlots(*args):
         if careerSlotCount == 1:
             clearCareerSlotBtn.state(['disabled'])
 
-        if selectedCareerSlot == 0 and careerSlots[selectedCareerSlot][0] != '(empty)':
+        if selectedCareerSlot == 0 and careerSlotNames[selectedCareerSlot] != '(empty)':
             careerMoveSlotUpBtn.state(['disabled'])
             careerMoveSlotDownBtn.state(['disabled'])
             clearCareerSlotBtn.state(['disabled'])
-        if selectedCareerSlot == 4 and careerSlots[selectedCareerSlot][0] != '(empty)':
+        if selectedCareerSlot == 4 and careerSlotNames[selectedCareerSlot] != '(empty)':
             careerMoveSlotUpBtn.state(['!disabled'])
             careerMoveSlotDownBtn.state(['disabled'])
-        if selectedCareerSlot != 0 and selectedCareerSlot != 4 and careerSlots[selectedCareerSlot][0] != '(empty)':
+        if selectedCareerSlot != 0 and selectedCareerSlot != 4 and careerSlotNames[selectedCareerSlot] != '(empty)':
             careerMoveSlotUpBtn.state(['!disabled'])
             careerMoveSlotDownBtn.state(['!disabled'])
 
-        if dontLoadPresetDetails == True:
-            dontLoadPresetDetails = False
-            return
-        if "last modified" in filePathStr.get() or "last path:" in filePathStr.get():
-            for afterID in fileLabelAfterIDs:
-                fileLabel.after_cancel(afterID)
-            fileLabelAfterIDs.clear()
-            openFileLabel()
-        slotPresetName = hashlib.md5(careerSlots[selectedCareerSlot][2][28:776]).hexdigest()
-        if slotPresetName in slotsPresetNames.keys():
-            windowTextRatio = getWindowTextRatio()
-            initialWindowWidth = root.winfo_width()
-            shortPath = splitPath(slotsPresetNames[slotPresetName]['lastPath'])
-            while initialWindowWidth / len(f"Preset {slotsPresetNames[slotPresetName]['presetName']} last modified {slotsPresetNames[slotPresetName]['lastDate']}"):
-                if initialWindowWidth / len(f"Preset last path: {os.path.normpath(slotsPresetNames[slotPresetName]['lastPath'])}") >= windowTextRatio:
-                    presetLastPathStr = f"Preset last path: {os.path.normpath(slotsPresetNames[slotPresetName]['lastPath'])}"
-                elif initialWindowWidth / len(f'Preset last path: {shortPath[0]}') >= windowTextRatio:
-                    presetLastPathStr = f'Preset last path: {shortPath[0]}'
-                elif initialWindowWidth / len(f'Preset last path: {shortPath[1]}') >= windowTextRatio:
-                    presetLastPathStr = f'Preset last path: {shortPath[1]}'
-                else:
-                    presetLastPathStr = f'Preset last path: {shortPath[2]}'
-                    
-                if initialWindowWidth / len(f"Preset {slotsPresetNames[slotPresetName]['presetName']} last modified {slotsPresetNames[slotPresetName]['lastDate']}") >= windowTextRatio:
-                    filePathStr.set(f"Preset {slotsPresetNames[slotPresetName]['presetName']} last modified {slotsPresetNames[slotPresetName]['lastDate']}")
-                    fileLabelAfterIDs.append(fileLabel.after(3500, lambda: filePathStr.set(presetLastPathStr)))
-                    fileLabelAfterIDs.append(fileLabel.after(7000, openFileLabel))
-                    break
-                else:
-                    filePathStr.set(f"Preset last modified {slotsPresetNames[slotPresetName]['lastDate']}")
-                    fileLabelAfterIDs.append(fileLabel.after(3500, lambda: filePathStr.set(presetLastPathStr)))
-                    fileLabelAfterIDs.append(fileLabel.after(7000, openFileLabel))
-                    break
+    ## with several slots selected, clearing and exporting slots work on all of them, moving and preset export don't
+    slots = selectedSlots()
+    if len(slots) > 1:
+        slotNames = myCarsSlotNames if activeList == 1 else careerSlotNames
+        anyCar = any(slotNames[selSlot] != '(empty)' for selSlot in slots)
+        if activeList == 1:
+            anyClearable = anyCar
+            clearBtn, exportBtn = clearMyCarsSlotBtn, exportMyCarsSlotBtn
+            singleButtons = (myCarsMoveSlotUpBtn, myCarsMoveSlotDownBtn, exportMyCarsPsetBtn)
         else:
-            pass
+            anyClearable = any(slotNames[selSlot] != '(empty)' for selSlot in slots if selSlot != 0)
+            clearBtn, exportBtn = clearCareerSlotBtn, exportCareerSlotBtn
+            singleButtons = (careerMoveSlotUpBtn, careerMoveSlotDownBtn, exportCareerPsetBtn)
+        clearBtn.state(['!disabled' if anyClearable else 'disabled'])
+        exportBtn.state(['!disabled' if anyCar else 'disabled'])
+        for singleButton in singleButtons:
+            singleButton.state(['disabled'])
+
+## on selecting a slot: updates the buttons and shows the details of the slot's preset
+def loadSlots(*args):
+    slotButtonsUpdate()
+    if activeList == 1:
+        clearPresetDetails()
+        if myCarsSlotNames[selectedMyCarsSlot] == "(empty)":
+            cancelStatus()
+            openFileLabel()
+        slotPresetName = profile.slotFingerprint(MY_CARS, selectedMyCarsSlot)
+        if slotPresetName in presetHistory:
+            showPresetDetails(slotPresetName)
+    if activeList == 2:
+        clearPresetDetails()
+        slotPresetName = profile.slotFingerprint(CAREER, selectedCareerSlot)
+        if slotPresetName in presetHistory:
+            showPresetDetails(slotPresetName)
 
 ## opens profile file, then loads slot data and enables UI elements
 def openProfile(*args):
+    global profile
     global dirtyFlag
     global openProfilePath
     global openProfilePathPrev
     global openProfileDir
 
-    loadSlotPresetNames()
+    ## the files read below may still have writes queued
+    flushWrites()
+    refreshSettings()
 
     if dirtyFlag == 1:
         confirmChanges = messagebox.askyesnocancel("Confirm changes", "You have unsaved changes, do you want to save?")
         if confirmChanges is None:
             return
         elif confirmChanges:
+            ## the save is only queued, it has to be on disk before (re)opening the file
             saveProfile()
+            flushWrites()
+            ## the save failed and said so, keep the profile open
+            if dirtyFlag == 1:
+                return
     if openProfilePath != "":
         openProfilePathPrev = openProfilePath
-        loadUserXnames()
     if reloadFlag == False:
         openProfilePath = filedialog.askopenfilename(title="Open your NFSU2 save file", initialdir=userDirPaths["openProfileDir"])
     if openProfilePath == "":
         openProfilePath = openProfilePathPrev
         return
-    with open (openProfilePath, 'rb') as profile:
-        clearCarSlots()
-        if len(profile.read()) != 54966:
-            badFile=messagebox.showerror(title="Error", message="Invalid profile file, please select another file")
-            return
-        profile.seek(1196)
-        saveProfileBtn.state(['!disabled'])
-        saveAsProfileBtn.state(['!disabled'])
-        reloadProfileBtn.state(['!disabled'])
-        myCarsListbox['state'] = tk.NORMAL
-        exportMyCarsSlotBtn.state(['!disabled'])
-        importMyCarsSlotBtn.state(['!disabled'])
-        clearMyCarsSlotBtn.state(['!disabled'])
-        myCarsMoveSlotUpBtn.state(['!disabled'])
-        myCarsMoveSlotDownBtn.state(['!disabled'])
-        exportMyCarsPsetBtn.state(['!disabled'])
-        importMyCarsPsetBtn.state(['!disabled'])
-        careerListbox['state'] = tk.NORMAL
-        exportCareerSlotBtn.state(['!disabled'])
-        importCareerSlotBtn.state(['!disabled'])
-        clearCareerSlotBtn.state(['!disabled'])
-        careerMoveSlotUpBtn.state(['!disabled'])
-        careerMoveSlotDownBtn.state(['!disabled'])
-        exportCareerPsetBtn.state(['!disabled'])
-        importCareerPsetBtn.state(['!disabled'])
-        for i in range (20):
-            myCarsSlots[i][2] = profile.read(1072)
-            myCarsSlots[i][1] = myCarsSlots[i][2][24:28]
-            if struct.unpack('B', myCarsSlots[i][2][8:9])[0] == 1:
-                myCarsSlots[i][0] = checkSlotXname(myCarsSlots[i][1])
-            else:
-                myCarsSlots[i][0] = '(empty)'
-        for i in range (5):
-            careerSlots[i][2] = profile.read(1072)
-            careerSlots[i][3] = profile.read(962)
-            careerSlots[i][1] = careerSlots[i][2][24:28]
-            if struct.unpack('B', careerSlots[i][2][1069:1070])[0] == 1:
-                careerSlots[i][0] = checkSlotXname(careerSlots[i][1])
-            else:
-                careerSlots[i][0] = '(empty)'
+    try:
+        openedProfile = memphisrider.Profile.open(openProfilePath)
+    except memphisrider.ProfileError as profileError:
+        badFile=messagebox.showerror(title="Error", message=str(profileError))
+        openProfilePath = openProfilePathPrev
+        return
+    ## releases the previous profile's buffer (and its map, if mapped)
+    if profile is not None:
         profile.close()
-        userDirPaths["openProfileDir"] = os.path.split(openProfilePath)[0]
-        saveUserDirPaths()
+    profile = openedProfile
+    saveProfileBtn.state(['!disabled'])
+    saveAsProfileBtn.state(['!disabled'])
+    reloadProfileBtn.state(['!disabled'])
+    myCarsListbox['state'] = tk.NORMAL
+    exportMyCarsSlotBtn.state(['!disabled'])
+    importMyCarsSlotBtn.state(['!disabled'])
+    clearMyCarsSlotBtn.state(['!disabled'])
+    myCarsMoveSlotUpBtn.state(['!disabled'])
+    myCarsMoveSlotDownBtn.state(['!disabled'])
+    exportMyCarsPsetBtn.state(['!disabled'])
+    importMyCarsPsetBtn.state(['!disabled'])
+    careerListbox['state'] = tk.NORMAL
+    exportCareerSlotBtn.state(['!disabled'])
+    importCareerSlotBtn.state(['!disabled'])
+    clearCareerSlotBtn.state(['!disabled'])
+    careerMoveSlotUpBtn.state(['!disabled'])
+    careerMoveSlotDownBtn.state(['!disabled'])
+    exportCareerPsetBtn.state(['!disabled'])
+    importCareerPsetBtn.state(['!disabled'])
+    userDirPaths["openProfileDir"] = os.path.split(openProfilePath)[0]
+    settingsChanged("userDirPaths")
         
     openFileLabel()
     dirtyFlag = 0        
@@ -724,133 +713,50 @@ def openProfile(*args):
 def saveProfile(*args):
     global dirtyFlag
     if openProfilePath:
-        with open (openProfilePath, 'r+b') as profile:
-            profile.seek(1196)
-            for i in range (20):
-                profile.write(myCarsSlots[i][2])
-            for i in range (5):
-                profile.write(careerSlots[i][2])
-                profile.write(careerSlots[i][3])
-            profile.seek(50639)
-            for i in range(20):
-                if myCarsSlots[i][2][0:4] == b'\x00\x00\x00\x00':
-                    pass
-                else:
-                    firstFoundMyCarsID = myCarsSlots[i][2][0:4]
-                    profile.write(firstFoundMyCarsID)
-                    break
-            if firstFoundMyCarsID == 0:
-                profile.write(struct.pack('>I', b'\x16\x1e\x9b\x95'))
-            profile.seek(44415)
-            for i in range(5):
-                if careerSlots[i][2][0:4] == b'\x00\x00\x00\x00':
-                    pass
-                else:
-                    firstFoundCareerID = careerSlots[i][2][0:4]
-                    profile.write(firstFoundCareerID)
-                    break
-            profile.close()  
+        ## the profile is replaced atomically, and what the save overwrites is kept as a delta backup next to it; the backups are
+        ## compressed once a dictionary has been trained (MemphisRider.py compress train)
+        try:
+            compressor = memphisrider.defaultCompressor()
+            savedRegions, writeProfile = profile.prepareSave(backup=True, compressor=compressor if compressor.dictionary else None)
+        except (memphisrider.ProfileError, memphisrider.CompressError, OSError) as saveError:
+            saveErrorMsg = messagebox.showerror("Error", f"Couldn't save the profile, it was left as it was.\n{saveError}")
+            return
+        savedProfile = profile
+        savedPath = openProfilePath
+
+        ## the write runs in the background; if it fails the regions are dirty again, so the next save retries them
+        def saveFailed(saveError):
+            global dirtyFlag
+            savedProfile.dirtyRegions.update(savedRegions)
+            if savedProfile is profile:
+                dirtyFlag = 1
+            saveErrorMsg = messagebox.showerror("Error", f"Couldn't save the profile, it was left as it was.\n{saveError}")
+
+        submitWrite(writeProfile, callback=lambda result: showStatus((pathVariants('File saved to: ', savedPath), 5000)), errback=saveFailed)
         dirtyFlag = 0
 
-        if "last modified" in filePathStr.get() or "last path:" in filePathStr.get():
-            for afterID in fileLabelAfterIDs:
-                fileLabel.after_cancel(afterID)
-            fileLabelAfterIDs.clear()
-        initialWindowWidth = root.winfo_width()
-        windowTextRatio = getWindowTextRatio()
-        shortPath = splitPath(openProfilePath)
-        while initialWindowWidth / len(f'File saved to: {os.path.normpath(openProfilePath)}'):
-            if initialWindowWidth / len(f'File saved to: {os.path.normpath(openProfilePath)}') >= windowTextRatio:
-                filePathStr.set(f'File saved to: {os.path.normpath(openProfilePath)}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            elif initialWindowWidth / len(f'File saved to: {shortPath[0]}') >= windowTextRatio:
-                filePathStr.set(f'File saved to: {shortPath[0]}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            elif initialWindowWidth / len(f'File saved to: {shortPath[1]}') >= windowTextRatio:
-                filePathStr.set(f'File saved to: {shortPath[1]}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            else:
-                filePathStr.set(f'File saved to: {shortPath[2]}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-
 ## saves profile file as another file
 def saveProfileAs(*args):
     global dirtyFlag
     global openProfilePath
     global openProfilePathPrev
     global openProfileDir
-    global fileLabelAfterID
     openProfilePathPrev = openProfilePath
     if openProfilePath:
-        with open (openProfilePath, 'rb') as profile:
-            openProfile = profile.read()
-            profile.seek(0)
-            saveProfilePath = filedialog.asksaveasfilename(title="Save NFSU2 profile as...", filetypes=[("NFSU2 profile", "*.*")])
-            if saveProfilePath == "":
-                openProfilePath = openProfilePathPrev
-                return
-            with open (saveProfilePath, 'wb') as profileWrite:
-                profileWrite.write(openProfile)
-                profileWrite.seek(1196)
-                for i in range (20):
-                    profileWrite.write(myCarsSlots[i][2])
-                for i in range (5):
-                    profileWrite.write(careerSlots[i][2])
-                    profileWrite.write(careerSlots[i][3])
-                profileWrite.seek(50639)
-                for i in range(20):
-                    if myCarsSlots[i][2][0:4] == b'\x00\x00\x00\x00':
-                        pass
-                    else:
-                        firstFoundMyCarsID = myCarsSlots[i][2][0:4]
-                        profileWrite.write(firstFoundMyCarsID)
-                        break
-                if firstFoundMyCarsID == 0:
-                    profileWrite.write(struct.pack('>I', b'\x16\x1e\x9b\x95'))
-                profileWrite.seek(44415)
-                for i in range(5):
-                    if careerSlots[i][2][0:4] == b'\x00\x00\x00\x00':
-                        pass
-                    else:
-                        firstFoundCareerID = careerSlots[i][2][0:4]
-                        profileWrite.write(firstFoundCareerID)
-                profileWrite.seek(53797)
-                profileWrite.write(b'\x00\x00\x00\x00\x00\x00\x00')
-                profileWrite.seek(53797)
-                profileWrite.write(os.path.split(saveProfilePath)[1][0:7].encode('ascii'))
-                profileWrite.close()
-                userDirPaths["openProfileDir"] = os.path.split(openProfilePath)[0]
-                saveUserDirPaths()
-            dirtyFlag = 0
-            
-            if "last modified" in filePathStr.get() or "last path:" in filePathStr.get():
-                for afterID in fileLabelAfterIDs:
-                    fileLabel.after_cancel(afterID)
-                fileLabelAfterIDs.clear()            
-            initialWindowWidth = root.winfo_width()
-            windowTextRatio = getWindowTextRatio()
-            shortPath = splitPath(saveProfilePath)
-            while initialWindowWidth / len(f'File saved to: {os.path.normpath(saveProfilePath)}'):
-                if initialWindowWidth / len(f'File saved to: {os.path.normpath(saveProfilePath)}') >= windowTextRatio:
-                    filePathStr.set(f'File saved to: {os.path.normpath(saveProfilePath)}')
-                    fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                    break
-                elif initialWindowWidth / len(f'File saved to: {shortPath[0]}') >= windowTextRatio:
-                    filePathStr.set(f'File saved to: {shortPath[0]}')
-                    fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                    break
-                elif initialWindowWidth / len(f'File saved to: {shortPath[1]}') >= windowTextRatio:
-                    filePathStr.set(f'File saved to: {shortPath[1]}')
-                    fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                    break
-                else:
-                    filePathStr.set(f'File saved to: {shortPath[2]}')
-                    fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                    break
+        saveProfilePath = filedialog.asksaveasfilename(title="Save NFSU2 profile as...", filetypes=[("NFSU2 profile", "*.*")])
+        if saveProfilePath == "":
+            openProfilePath = openProfilePathPrev
+            return
+        def saveAsFailed(saveError):
+            global dirtyFlag
+            dirtyFlag = 1
+            saveErrorMsg = messagebox.showerror("Error", f"Couldn't save the profile.\n{saveError}")
+
+        submitWrite(profile.prepareSaveAs(saveProfilePath), callback=lambda result: showStatus((pathVariants('File saved to: ', saveProfilePath), 5000)),
+                    errback=saveAsFailed)
+        userDirPaths["openProfileDir"] = os.path.split(openProfilePath)[0]
+        settingsChanged("userDirPaths")
+        dirtyFlag = 0
 
 ## reloads profile
 def reloadProfile(*args):
@@ -861,302 +767,472 @@ def reloadProfile(*args):
     
 ## exports selected slot to a .u2cc file, if it's a career mode slot it will also export part inventory data to a .u2ci file
 def exportSlot(*args):
-    global myCarsSlots
-    global careerSlots
     global exportSlotDir
-    global fileLabelAfterID
+    if openProfilePath and len(selectedSlots()) > 1:
+        exportSlots(selectedSlots())
+        return
     if openProfilePath:
         slotSave = filedialog.asksaveasfilename(title="Export car slot", filetypes=[("MemphisRider custom car slot", "*.u2cc")], defaultextension=[".u2cc"], initialdir=userDirPaths["exportSlotDir"])
         if slotSave == "":
             return
         
         if activeList == 1:
-            exportSlots = myCarsSlots
             selSlot = selectedMyCarsSlot
         if activeList == 2:
-            exportSlots = careerSlots
             selSlot = selectedCareerSlot
+        slotData, slotInvData = profile.exportSlot(activeList, selSlot)
         
         with open (slotSave, 'wb') as slotSaveWrite:
-            slotSaveWrite.write(exportSlots[selSlot][2])
+            slotSaveWrite.write(slotData)
             slotSaveWrite.close()
-            slotPresetNameHash(exportSlots[selSlot][2][28:776], '', slotSave)
+            slotPresetNameHash(profile.slotVisualData(activeList, selSlot), '', slotSave)
         if activeList == 2:
             slotSaveInv = slotSave.replace(".u2cc", ".u2ci")
             with open (slotSaveInv, 'wb') as slotSaveInvWrite:
-                slotSaveInvWrite.write(exportSlots[selSlot][3])
+                slotSaveInvWrite.write(slotInvData)
             slotSaveInvWrite.close()
 
         userDirPaths["exportSlotDir"] = os.path.split(slotSave)[0]
-        saveUserDirPaths()
-        myCarsListboxPopulate()
-        careerListboxPopulate()
-        loadSlots()
-
-        if "last modified" in filePathStr.get() or "last path:" in filePathStr.get():
-                for afterID in fileLabelAfterIDs:
-                    fileLabel.after_cancel(afterID)
-                fileLabelAfterIDs.clear()            
-        initialWindowWidth = root.winfo_width()
-        windowTextRatio = getWindowTextRatio()
-        shortPath = splitPath(slotSave)
-        while initialWindowWidth / len(f'Slot {selSlot+1} exported to: {os.path.normpath(slotSave)}'):
-            if initialWindowWidth / len(f'Slot {selSlot+1} exported to: {os.path.normpath(slotSave)}') >= windowTextRatio:
-                filePathStr.set(f'Slot {selSlot+1} exported to: {os.path.normpath(slotSave)}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            elif initialWindowWidth / len(f'Slot {selSlot+1} exported to: {shortPath[0]}') >= windowTextRatio:
-                filePathStr.set(f'Slot {selSlot+1} exported to: {shortPath[0]}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            elif initialWindowWidth / len(f'Slot {selSlot+1} exported to: {shortPath[1]}') >= windowTextRatio:
-                filePathStr.set(f'Slot {selSlot+1} exported to: {shortPath[1]}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            else:
-                filePathStr.set(f'Slot {selSlot+1} exported to: {shortPath[2]}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
+        settingsChanged("userDirPaths")
+        slotsChanged()
+
+        showStatus((pathVariants(f'Slot {selSlot+1} exported to: ', slotSave), 5000))
 
 ## imports car in .u2cc file to selected slot, if it's a career mode slot it will also attempt to import part inventory in .u2ci file;
 ## if not found it will notify user it will use the part inventory from the slot
 def importSlot(*args):
     global dirtyFlag
-    global myCarsSlots
-    global careerSlots
     global importSlotDir
-    global fileLabelAfterID
+    if openProfilePath and len(selectedSlots()) > 1:
+        importSlots(selectedSlots())
+        return
     if openProfilePath:
         slotOpen = filedialog.askopenfilename(title="Import slot to My Cars", filetypes=[("MemphisRider custom car slot", "*.u2cc")], initialdir=userDirPaths["importSlotDir"])
         if slotOpen == "":
             return
         
         if activeList == 1:
-            importSlots = myCarsSlots
             selSlot = selectedMyCarsSlot
         if activeList == 2:
-            importSlots = careerSlots
             selSlot = selectedCareerSlot
             
         with open (slotOpen, 'rb') as slotOpenRead:
-            importSlots[selSlot][2] = slotOpenRead.read()
+            slotData = slotOpenRead.read()
             slotOpenRead.close()
-            importSlots[selSlot][1] = importSlots[selSlot][2][24:28]
-            importSlots[selSlot][0] = checkSlotXname(importSlots[selSlot][1])
-            importSlots[selSlot][2] = bytearray(importSlots[selSlot][2])
-            slotPresetNameHash(importSlots[selSlot][2][28:776], '',slotOpen)
-            if activeList == 1:
-                if selSlot < 9:
-                    importSlots[selSlot][2][0:4] = f"0{selSlot+1}MC".encode('ascii')
-                    importSlots[selSlot][2][4:8] = f"MC0{selSlot+1}".encode('ascii')
-                else:
-                    importSlots[selSlot][2][0:4] = f"{selSlot+1}MC".encode('ascii')
-                    importSlots[selSlot][2][4:8] = f"MC{selSlot+1}".encode('ascii')
-                importSlots[selSlot][2][8:9] = struct.pack('>B',1)
-                importSlots[selSlot][2][12:13] = struct.pack('>B',2)
-            if activeList == 2:
-                importSlots[selSlot][2][0:4] = f"0{selSlot+1}CR".encode('ascii')
-                importSlots[selSlot][2][4:8] = f"CR0{selSlot+1}".encode('ascii')
-                importSlots[selSlot][2][8:9] = struct.pack('>B',1)
-                importSlots[selSlot][2][12:13] = struct.pack('>B',4)
-                importSlots[selSlot][2][1069:1070] = struct.pack('>B',1)
-                slotOpenInv = slotOpen.replace(".u2cc",".u2ci")
-                if os.path.isfile(slotOpenInv) == True:
-                    with open (slotOpenInv, 'rb') as slotOpenInvRead:
-                        importSlots[selSlot][3] = slotOpenInvRead.read()
-                        slotOpenInvRead.close()
-                else:
-                    tk.messagebox.showinfo(title="Attention", message="No part inventory file (*.u2ci) found for this slot. \nImported slot will inherit the inventory from the save file slot.")
-            userDirPaths["importSlotDir"] = os.path.split(slotOpen)[0]
-            saveUserDirPaths()
+        slotInvData = None
+        if activeList == 2:
+            slotOpenInv = slotOpen.replace(".u2cc",".u2ci")
+            if os.path.isfile(slotOpenInv) == True:
+                with open (slotOpenInv, 'rb') as slotOpenInvRead:
+                    slotInvData = slotOpenInvRead.read()
+                    slotOpenInvRead.close()
+            else:
+                tk.messagebox.showinfo(title="Attention", message="No part inventory file (*.u2ci) found for this slot. \nImported slot will inherit the inventory from the save file slot.")
+        try:
+            ## slot files compressed with MemphisRider.py compress pack are decompressed on the way in
+            slotData = memphisrider.unpackData(slotData)
+            slotInvData = memphisrider.unpackData(slotInvData) if slotInvData is not None else None
+            with profile.change(f"import of {os.path.basename(slotOpen)} to slot {selSlot+1}"):
+                profile.importSlot(activeList, selSlot, slotData, slotInvData)
+        except (memphisrider.ProfileError, memphisrider.CompressError) as slotError:
+            badFile=messagebox.showerror(title="Error", message=str(slotError))
+            return
+        slotPresetNameHash(profile.slotVisualData(activeList, selSlot), '',slotOpen)
+        userDirPaths["importSlotDir"] = os.path.split(slotOpen)[0]
+        settingsChanged("userDirPaths")
             
-        importSlots[selSlot][2] = bytes(importSlots[selSlot][2])
-        myCarsListboxPopulate()
-        careerListboxPopulate()
-        loadSlots()
+        slotsChanged()
         dirtyFlag = 1
 
-        if "last modified" in filePathStr.get() or "last path:" in filePathStr.get():
-            for afterID in fileLabelAfterIDs:
-                fileLabel.after_cancel(afterID)
-            fileLabelAfterIDs.clear()            
-        initialWindowWidth = root.winfo_width()
-        windowTextRatio = getWindowTextRatio()
-        shortPath = splitPath(slotOpen)
-        while initialWindowWidth / len(f'Imported {os.path.normpath(slotOpen)} to slot {selSlot+1}'):
-            if initialWindowWidth / len(f'Imported {os.path.normpath(slotOpen)} to slot {selSlot+1}') >= windowTextRatio:
-                filePathStr.set(f'Imported {os.path.normpath(slotOpen)} to slot {selSlot+1}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            elif initialWindowWidth / len(f'Imported {shortPath[0]} to slot {selSlot+1}') >= windowTextRatio:
-                filePathStr.set(f'Imported {shortPath[0]} to slot {selSlot+1}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            elif initialWindowWidth / len(f'Imported {shortPath[1]} to slot {selSlot+1}') >= windowTextRatio:
-                filePathStr.set(f'Imported {shortPath[1]} to slot {selSlot+1}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            else:
-                filePathStr.set(f'Imported {shortPath[2]}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
+        showStatus((pathVariants('Imported ', slotOpen, f' to slot {selSlot+1}'), 5000))
 
 ## clears slot data, setting up default data to make slot usable again
 def clearSlot(*args):
     global dirtyFlag
     if openProfilePath:
+        slots = selectedSlots()
+        if len(slots) > 1:
+            ## the first career slot stays, the game needs a purchased one
+            if activeList == 2:
+                slots = [selSlot for selSlot in slots if selSlot != 0]
+            if not slots:
+                return
+            with profile.change(f"clearing of {len(slots)} slots"):
+                for selSlot in slots:
+                    profile.clearSlot(activeList, selSlot)
+            slotsChanged()
+            dirtyFlag = 1
+            return
         if activeList == 1:
-            carSlots = myCarsSlots
             selSlot = selectedMyCarsSlot
         if activeList == 2:
-            carSlots = careerSlots
             selSlot = selectedCareerSlot
         
-        carSlots[selSlot][2] = bytearray(b'\x00'*1072)
-        carSlots[selSlot][2][8:9] = struct.pack('>B',1)
-        carSlots[selSlot][2][856:1061] = bytearray(b'\x64'*205)
-        carSlots[selSlot][1] = carSlots[selSlot][2][24:28]
-        carSlots[selSlot][0] = '(empty)'
-        if activeList == 1:
-            carSlots[selSlot][2][12:13] = struct.pack('>B',2)
-        if activeList == 2:
-            carSlots[selSlot][2][12:13] = struct.pack('>B',4)    
-        carSlots[selSlot][2] = bytes(carSlots[selSlot][2])    
-        myCarsListboxPopulate()
-        careerListboxPopulate()
-        loadSlots()
+        with profile.change(f"clearing of slot {selSlot+1}"):
+            profile.clearSlot(activeList, selSlot)
+        slotsChanged()
         dirtyFlag = 1
 
+## the selected slots of the active garage, in list order
+def selectedSlots():
+    if activeList not in (1, 2):
+        return []
+    slotsListbox = myCarsListbox if activeList == 1 else careerListbox
+    return [int(index) for index in slotsListbox.curselection()]
+
+## exports every selected slot that has a car to a folder, one .u2cc (and .u2ci for career) per slot named like batch
+## exportSlots does; the history and recent folders are updated once for all of them
+def exportSlots(slots):
+    exportDir = filedialog.askdirectory(title=f"Export {len(slots)} car slots to folder", initialdir=userDirPaths["exportSlotDir"])
+    if exportDir == "":
+        return
+    garagePrefix = "myCars" if activeList == 1 else "career"
+    profileName = os.path.basename(openProfilePath)
+    historyRecords = []
+    try:
+        for selSlot in slots:
+            if profile.isSlotEmpty(activeList, selSlot):
+                continue
+            slotSave = os.path.join(exportDir, f"{profileName}_{garagePrefix}{selSlot+1:02d}.u2cc")
+            slotData, slotInvData = profile.exportSlot(activeList, selSlot)
+            with open (slotSave, 'wb') as slotSaveWrite:
+                slotSaveWrite.write(slotData)
+            if slotInvData is not None:
+                with open (slotSave.replace(".u2cc", ".u2ci"), 'wb') as slotSaveInvWrite:
+                    slotSaveInvWrite.write(slotInvData)
+            historyRecords.append(presetRecord(profile.slotVisualData(activeList, selSlot), '', slotSave))
+    except OSError as exportError:
+        exportErrorMsg = messagebox.showerror("Error", f"Couldn't export every slot, {len(historyRecords)} were written.\n{exportError}")
+    recordPresets(historyRecords)
+    userDirPaths["exportSlotDir"] = exportDir
+    settingsChanged("userDirPaths")
+    slotsChanged()
+    showStatus((pathVariants(f'{len(historyRecords)} slots exported to: ', exportDir), 5000))
+
+## imports the .u2cc slots and .bin presets of a folder, in file name order, onto the selected slots that are empty, as one undo
+## step; career slots take the .u2ci next to a .u2cc, presets keep their own performance level. files that can't be imported
+## are listed at the end
+def importSlots(slots):
+    global dirtyFlag
+    emptySlots = [selSlot for selSlot in slots if profile.isSlotEmpty(activeList, selSlot)]
+    if not emptySlots:
+        noEmptyMsg = messagebox.showinfo(title="Attention", message="None of the selected slots is empty.\nClear the slots to import to first.")
+        return
+    importDir = filedialog.askdirectory(title=f"Import slots and presets to {len(emptySlots)} empty slots", initialdir=userDirPaths["importSlotDir"])
+    if importDir == "":
+        return
+    importPaths = sorted(dirEntry.path for dirEntry in os.scandir(importDir)
+                         if dirEntry.is_file() and os.path.splitext(dirEntry.name)[1].lower() in (".u2cc", ".bin"))
+    historyRecords = []
+    skippedFiles = []
+    with profile.change(f"import of {os.path.basename(importDir)} to {len(emptySlots)} slots"):
+        for importPath in importPaths:
+            if len(historyRecords) == len(emptySlots):
+                break
+            selSlot = emptySlots[len(historyRecords)]
+            try:
+                importData = memphisrider.readFile(importPath)
+                if importPath.lower().endswith(".u2cc"):
+                    slotInvPath = os.path.splitext(importPath)[0] + ".u2ci"
+                    slotInvData = memphisrider.readFile(slotInvPath) if activeList == 2 and os.path.isfile(slotInvPath) else None
+                    profile.importSlot(activeList, selSlot, importData, slotInvData)
+                    historyRecords.append(presetRecord(profile.slotVisualData(activeList, selSlot), '', importPath))
+                else:
+                    preset = memphisrider.readPreset(importData)
+                    presetXnameHash = userXnames.get(preset["xname"], xnames.get(preset["xname"]))
+                    if presetXnameHash is None:
+                        skippedFiles.append(f'{os.path.basename(importPath)}: unknown XNAME {preset["xname"]}')
+                        continue
+                    profile.importPreset(activeList, selSlot, presetXnameHash, preset["data"], preset["perfLevel"])
+                    historyRecords.append(presetRecord(preset["data"], preset["presetName"], importPath))
+            except (memphisrider.ProfileError, memphisrider.CompressError, OSError) as importError:
+                skippedFiles.append(f'{os.path.basename(importPath)}: {importError}')
+    recordPresets(historyRecords)
+    userDirPaths["importSlotDir"] = importDir
+    settingsChanged("userDirPaths")
+    slotsChanged()
+    ## the profile knows about every touched slot, even one whose import failed halfway
+    if profile.isDirty():
+        dirtyFlag = 1
+    showStatus((pathVariants(f'Imported {len(historyRecords)} files from ', importDir), 5000))
+    if skippedFiles:
+        skippedMsg = messagebox.showwarning("Attention", "These files weren't imported:\n" + "\n".join(skippedFiles[:20]))
+
 ## moves slot up
 def moveSlotUp(*args):
-    global myCarsSlots
-    global careerSlots
     global dirtyFlag
-    global dontLoadPresetDetails
+    global selectedMyCarsSlot
+    global selectedCareerSlot
 
-    dontLoadPresetDetails = True
-    
-    if openProfilePath:
+    if openProfilePath and len(selectedSlots()) <= 1:
         if activeList == 1:
-            carSlots = myCarsSlots
             selSlot = selectedMyCarsSlot
         if activeList == 2:
-            carSlots = careerSlots
             selSlot = selectedCareerSlot
 
         if selSlot <= 0:
             return
             
-        slotMove = carSlots.pop(selSlot)
         slotNewPos = selSlot - 1
-        carSlots.insert(slotNewPos, slotMove)
+        with profile.change(f"move of slot {selSlot+1} up"):
+            profile.moveSlot(activeList, selSlot, slotNewPos)
+        ## the selection moves with the slot right away, so a held key keeps moving the same car before the lists are redrawn
         if activeList == 1:
-            for i in range(20):
-                if carSlots[i][2][0:4] == b'\x00\x00\x00\x00':
-                    i = i+1
-                else:
-                    carSlots[i][2] = bytearray(carSlots[i][2])
-                    if i < 9:
-                        carSlots[i][2][0:4] = f"0{i+1}MC".encode('ascii')
-                        carSlots[i][2][4:8] = f"MC0{i+1}".encode('ascii')
-                    else:
-                        carSlots[i][2][0:4] = f"{i+1}MC".encode('ascii')
-                        carSlots[i][2][4:8] = f"MC{i+1}".encode('ascii')
-                    carSlots[i][2] = bytes(carSlots[i][2])
             myCarsListbox.selection_clear(selSlot)
             myCarsListbox.selection_set(slotNewPos)
+            selectedMyCarsSlot = slotNewPos
         if activeList == 2:
-            for i in range(5):
-                if carSlots[i][2][0:4] == b'\x00\x00\x00\x00':
-                    i = i+1
-                else:
-                    carSlots[i][2] = bytearray(carSlots[i][2])
-                    carSlots[i][2][0:4] = f"0{i+1}CR".encode('ascii')
-                    carSlots[i][2][4:8] = f"CR0{i+1}".encode('ascii')
-                    carSlots[i][2] = bytes(carSlots[i][2])
             careerListbox.selection_clear(selSlot)
             careerListbox.selection_set(slotNewPos)
-        myCarsListboxPopulate()
-        careerListboxPopulate()
-        loadSlots()
+            selectedCareerSlot = slotNewPos
+        slotsChanged()
         
         dirtyFlag = 1
 
 ## moves slot down
 def moveSlotDown(*args):
-    global myCarsSlots
-    global careerSlots
     global dirtyFlag
-    global dontLoadPresetDetails
+    global selectedMyCarsSlot
+    global selectedCareerSlot
 
-    dontLoadPresetDetails = True
-    
-    if openProfilePath:
+    if openProfilePath and len(selectedSlots()) <= 1:
         if activeList == 1:
-            carSlots = myCarsSlots
             selSlot = selectedMyCarsSlot
             if selSlot == 19:
                 return
         if activeList == 2:
-            carSlots = careerSlots
             selSlot = selectedCareerSlot
             if selSlot == 4:
                 return
             
-        slotMove = carSlots.pop(selSlot)
         slotNewPos = selSlot + 1
-        carSlots.insert(slotNewPos, slotMove)
-        
+        with profile.change(f"move of slot {selSlot+1} down"):
+            profile.moveSlot(activeList, selSlot, slotNewPos)
+        ## the selection moves with the slot right away, so a held key keeps moving the same car before the lists are redrawn
         if activeList == 1:
-            for i in range(20):
-                if carSlots[i][2][0:4] == b'\x00\x00\x00\x00':
-                    i = i+1
-                else:
-                    carSlots[i][2] = bytearray(carSlots[i][2])
-                    if i < 9:
-                        carSlots[i][2][0:4] = f"0{i+1}MC".encode('ascii')
-                        carSlots[i][2][4:8] = f"MC0{i+1}".encode('ascii')
-                    else:
-                        carSlots[i][2][0:4] = f"{i+1}MC".encode('ascii')
-                        carSlots[i][2][4:8] = f"MC{i+1}".encode('ascii')
-                    carSlots[i][2] = bytes(carSlots[i][2])
             myCarsListbox.selection_clear(selSlot)
             myCarsListbox.selection_set(slotNewPos)
+            selectedMyCarsSlot = slotNewPos
         if activeList == 2:
-            if selSlot == 4:
-                return
-            for i in range(5):
-                if carSlots[i][2][0:4] == b'\x00\x00\x00\x00':
-                    i = i+1
-                else:
-                    carSlots[i][2] = bytearray(carSlots[i][2])
-                    carSlots[i][2][0:4] = f"0{i+1}CR".encode('ascii')
-                    carSlots[i][2][4:8] = f"CR0{i+1}".encode('ascii')
-                    carSlots[i][2] = bytes(carSlots[i][2])
             careerListbox.selection_clear(selSlot)
             careerListbox.selection_set(slotNewPos)
-        myCarsListboxPopulate()
-        careerListboxPopulate()
-        loadSlots()
+            selectedCareerSlot = slotNewPos
+        slotsChanged()
         
         dirtyFlag = 1
 
+## undoes the last slot import, clear, move or preset import; changes are kept as per-slot diffs by the profile
+def undoChange(*args):
+    if openProfilePath:
+        undoneChange = profile.undo()
+        if undoneChange is not None:
+            refreshAfterUndo(f"Undid {undoneChange}")
+
+def redoChange(*args):
+    if openProfilePath:
+        redoneChange = profile.redo()
+        if redoneChange is not None:
+            refreshAfterUndo(f"Redid {redoneChange}")
+
+def refreshAfterUndo(undoStr):
+    global dirtyFlag
+    slotsChanged()
+    dirtyFlag = 1
+    showStatus(((undoStr,), 5000))
+
+## sorts the active garage in one go, by car, preset name or the order listed in a text file
+def sortGarageDlg(*args):
+    if not openProfilePath or activeList not in (1, 2):
+        return
+    sortKey = tk.StringVar(value="xname")
+    sortEmptyLast = tk.BooleanVar(value=True)
+
+    def sortGarageOk(*args):
+        global dirtyFlag
+        customOrder = []
+        if sortKey.get() == "custom":
+            orderOpen = filedialog.askopenfilename(title="Open sort order (one XNAME or preset name per line)", filetypes=[("Text file", "*.txt"), ("All files", "*.*")], parent=sortGarageTop)
+            if orderOpen == "":
+                return
+            customOrder = memphisrider.loadCustomOrder(orderOpen)
+        garageName = "My Cars" if activeList == 1 else "Career"
+        with profile.change(f"sorting of {garageName}"):
+            garageSorted = memphisrider.sortGarage(profile, activeList, sortKey.get(), sortEmptyLast.get(), xnameIndex, presetHistory, customOrder)
+        sortGarageTop.destroy()
+        if garageSorted:
+            slotsChanged()
+            dirtyFlag = 1
+
+    def sortGarageCancel(*args):
+        sortGarageTop.destroy()
+
+    sortGarageTop = tk.Toplevel(padx='5', pady='5')
+    sortGarageTop.focus_force()
+    sortGarageTop.grab_set()
+    sortGarageTop.title("Sort garage")
+    sortGarageTop.resizable(False,False)
+    if os.name == "nt":
+        sortGarageTop.attributes('-toolwindow',1)
+
+    sortGarageLbl = ttk.Label(sortGarageTop, text=f"Sort {'My Cars' if activeList == 1 else 'Career'} slots by")
+    sortGarageLbl.grid(row = 0, column = 0, sticky="W")
+    sortXnameRd = ttk.Radiobutton(sortGarageTop, text="Car (XNAME)", variable=sortKey, value="xname")
+    sortXnameRd.grid(row = 1, column = 0, sticky="WE")
+    sortPresetNameRd = ttk.Radiobutton(sortGarageTop, text="Preset name", variable=sortKey, value="presetName")
+    sortPresetNameRd.grid(row = 2, column = 0, sticky="WE")
+    sortCustomRd = ttk.Radiobutton(sortGarageTop, text="Order from file...", variable=sortKey, value="custom")
+    sortCustomRd.grid(row = 3, column = 0, sticky="WE")
+    sortNoneRd = ttk.Radiobutton(sortGarageTop, text="Keep order", variable=sortKey, value="none")
+    sortNoneRd.grid(row = 4, column = 0, sticky="WE")
+    sortEmptyLastChk = ttk.Checkbutton(sortGarageTop, text="Empty slots last", variable=sortEmptyLast)
+    sortEmptyLastChk.grid(row = 5, column = 0, sticky="WE")
+
+    sortGarageOkBtn = ttk.Button(sortGarageTop, text="OK", command=sortGarageOk)
+    sortGarageOkBtn.grid(row = 1, column = 1, sticky="WE")
+    sortGarageCancelBtn = ttk.Button(sortGarageTop, text="Cancel", command=sortGarageCancel)
+    sortGarageCancelBtn.grid(row = 2, column = 1, sticky="WE")
+
+    sortGarageTop.bind('<Return>', sortGarageOk)
+    sortGarageTop.bind('<Escape>', sortGarageCancel)
+
+    root.wait_window(sortGarageTop)
+
+## imports a preset or slot from a MemphisRider archive (.mra) into the selected slot; career slots bring the inventory packed with them
+def importArchiveDlg(*args):
+    global dirtyFlag
+    if not openProfilePath or activeList not in (1, 2):
+        return
+    selSlot = selectedMyCarsSlot if activeList == 1 else selectedCareerSlot
+    archiveOpen = filedialog.askopenfilename(title="Open MemphisRider archive", filetypes=[("MemphisRider archive", "*.mra")], initialdir=userDirPaths.get("importArchiveDir", ""))
+    if archiveOpen == "":
+        return
+    try:
+        archive = memphisrider.Archive(archiveOpen)
+    except (memphisrider.ArchiveError, OSError) as archiveError:
+        messagebox.showerror("Error", str(archiveError))
+        return
+    userDirPaths["importArchiveDir"] = os.path.split(archiveOpen)[0]
+    settingsChanged("userDirPaths")
+    archiveFilter = tk.StringVar()
+    shownEntries = []
+
+    ## lists the preset and slot entries whose name contains the filter, up to 1000 of them
+    def archiveFilterList(*args):
+        filterStr = archiveFilter.get().upper()
+        shownEntries.clear()
+        archiveListbox.delete(0, tk.END)
+        for entry in archive:
+            if entry.kind != memphisrider.archive.KIND_INVENTORY and filterStr in entry.name.upper():
+                shownEntries.append(entry)
+                archiveListbox.insert(tk.END, f"{xnameIndex.lookup(entry.xnameHash.to_bytes(4, 'big')):<16}{entry.name}")
+                if len(shownEntries) == 1000:
+                    break
+
+    def importArchiveOk(*args):
+        global dirtyFlag
+        if not archiveListbox.curselection():
+            return
+        entry = shownEntries[archiveListbox.curselection()[0]]
+        try:
+            with profile.change(f"import of {entry.name} to slot {selSlot+1}"):
+                memphisrider.importEntry(profile, activeList, selSlot, archive, entry)
+        except memphisrider.ProfileError as slotError:
+            messagebox.showerror(title="Error", message=str(slotError), parent=importArchiveTop)
+            return
+        slotPresetNameHash(profile.slotVisualData(activeList, selSlot), os.path.splitext(entry.name.split('/')[-1])[0], archiveOpen)
+        importArchiveCancel()
+        slotsChanged()
+        dirtyFlag = 1
+        showStatus(((f'Imported {entry.name} to slot {selSlot+1}',), 5000))
+
+    def importArchiveCancel(*args):
+        importArchiveTop.destroy()
+        archive.close()
+
+    importArchiveTop = tk.Toplevel(padx='5', pady='5')
+    importArchiveTop.focus_force()
+    importArchiveTop.grab_set()
+    importArchiveTop.title(f"Import from {os.path.basename(archiveOpen)} to slot {selSlot+1}")
+    importArchiveTop.protocol('WM_DELETE_WINDOW', importArchiveCancel)
+    importArchiveTop.columnconfigure(0, weight=1)
+    importArchiveTop.rowconfigure(1, weight=1)
+    archiveFilterEntry = ttk.Entry(importArchiveTop, textvariable=archiveFilter)
+    archiveFilterEntry.grid(row = 0, column = 0, columnspan = 2, sticky="WE")
+    archiveListbox = tk.Listbox(importArchiveTop, width=80, height=20, exportselection=False)
+    archiveListbox.grid(row = 1, column = 0, sticky="NSEW")
+    archiveScroll = ttk.Scrollbar(importArchiveTop, orient=tk.VERTICAL, command=archiveListbox.yview)
+    archiveScroll.grid(row = 1, column = 1, sticky="NS")
+    archiveListbox.configure(yscrollcommand = archiveScroll.set)
+    importArchiveOkBtn = ttk.Button(importArchiveTop, text="Import", command=importArchiveOk)
+    importArchiveOkBtn.grid(row = 2, column = 0, sticky="E")
+    importArchiveCancelBtn = ttk.Button(importArchiveTop, text="Cancel", command=importArchiveCancel)
+    importArchiveCancelBtn.grid(row = 2, column = 1, sticky="E")
+    archiveFilter.trace_add('write', archiveFilterList)
+    archiveListbox.bind('<Double-Button-1>', importArchiveOk)
+    importArchiveTop.bind('<Return>', importArchiveOk)
+    importArchiveTop.bind('<Escape>', importArchiveCancel)
+    archiveFilterList()
+    archiveFilterEntry.focus_set()
+
+    root.wait_window(importArchiveTop)
+
+## lists the presets and slot files in the library index whose customization nearly matches the selected slot's
+def findSimilarDlg(*args):
+    global similarityIndex
+    if not openProfilePath or activeList not in (1, 2):
+        return
+    selSlot = selectedMyCarsSlot if activeList == 1 else selectedCareerSlot
+    if profile.isSlotEmpty(activeList, selSlot):
+        return
+    try:
+        from memphisrider import similar
+        libraryIndex = memphisrider.LibraryIndex().load()
+        if not libraryIndex.files:
+            messagebox.showinfo("Find similar presets", "The preset library index is empty. Index your preset folders first with:\n\nMemphisRider.py index folders...")
+            return
+        if similarityIndex is None:
+            similarityIndex = similar.SimilarityIndex().load()
+        if similarityIndex.update(libraryIndex) or not os.path.isfile(similarityIndex.path):
+            similarityIndex.save()
+        matches = similarityIndex.search(profile.slotVisualData(activeList, selSlot), maxDistance=16, limit=50)
+    except (memphisrider.LibraryError, similar.SimilarityError, OSError) as similarError:
+        messagebox.showerror("Error", str(similarError))
+        return
+
+    similarTop = tk.Toplevel(padx='5', pady='5')
+    similarTop.focus_force()
+    similarTop.title(f"Presets similar to slot {selSlot+1}")
+    similarTop.columnconfigure(0, weight=1)
+    similarTop.rowconfigure(1, weight=1)
+    similarLbl = ttk.Label(similarTop, text=f"{len(matches)} presets/slots found among {len(similarityIndex)} (differing part fields, path)")
+    similarLbl.grid(row = 0, column = 0, columnspan = 2, sticky="W")
+    similarListbox = tk.Listbox(similarTop, width=100, height=15)
+    similarListbox.grid(row = 1, column = 0, sticky="NSEW")
+    similarScroll = ttk.Scrollbar(similarTop, orient=tk.VERTICAL, command=similarListbox.yview)
+    similarScroll.grid(row = 1, column = 1, sticky="NS")
+    similarListbox.configure(yscrollcommand = similarScroll.set)
+    for path, distance in matches:
+        similarListbox.insert(tk.END, f"{distance:>4}   {os.path.normpath(path)}")
+    similarCloseBtn = ttk.Button(similarTop, text="Close", command=similarTop.destroy)
+    similarCloseBtn.grid(row = 2, column = 0, columnspan = 2, sticky="E")
+    similarTop.bind('<Escape>', lambda *args: similarTop.destroy())
+
 ## exports slot data to a Binary-compatible preset file (.bin)
 def exportPreset(*args):
-    global myCarsSlots
-    global careerSlots
     global exportPresetDir
-    global fileLabelAfterID
+    ## presets need a name each, so they're exported one at a time
+    if len(selectedSlots()) > 1:
+        return
     if openProfilePath:
         sponsorFlag = tk.IntVar(value=0)
         spPerfFlag = tk.IntVar(value=0)
         presetName = tk.StringVar(value='')
         
         if activeList == 1:
-            exportSlots = myCarsSlots
+            exportSlotNames = myCarsSlotNames
             selSlot = selectedMyCarsSlot
         if activeList == 2:
-            exportSlots = careerSlots
+            exportSlotNames = careerSlotNames
             selSlot = selectedCareerSlot
 
     ##  dialog to set up parameters like sponsor car flag and performance level
@@ -1171,54 +1247,16 @@ def exportPreset(*args):
                 
         def exportOk(*args):
             with open (presetSave, 'wb') as presetWrite:
-                presetWrite.write(b'\x00'*76)
-                if sponsorFlag.get() != 0:
-                    presetWrite.seek(0)
-                    presetWrite.write(b'\x40\x14\x43')
-                else:
-                    pass
-                presetWrite.seek(8)
-                presetWrite.write(exportSlots[selSlot][0].encode('ascii'))
-                presetWrite.seek(40)
-                presetWrite.write(presetName.get().upper().encode('ascii'))
-                presetWrite.seek(72)
-                presetWrite.write(struct.pack('B', spPerfFlag.get()))
-                presetWrite.seek(76)
-                presetWrite.write(exportSlots[selSlot][2][28:776])
-                slotPresetNameHash(exportSlots[selSlot][2][28:776], presetName.get().upper(), presetSave)
+                presetWrite.write(memphisrider.buildPreset(exportSlotNames[selSlot], presetName.get(), profile.slotVisualData(activeList, selSlot), spPerfFlag.get(), sponsorFlag.get() != 0))
+                slotPresetNameHash(profile.slotVisualData(activeList, selSlot), presetName.get().upper(), presetSave)
             presetWrite.close()
             exportPresetTop.destroy()
             
             userDirPaths["exportPresetDir"] = os.path.split(presetSave)[0]
-            myCarsListboxPopulate()
-            careerListboxPopulate()
-            loadSlots()
-            saveUserDirPaths()
+            slotsChanged()
+            settingsChanged("userDirPaths")
             
-            if "last modified" in filePathStr.get() or "last path:" in filePathStr.get():
-                for afterID in fileLabelAfterIDs:
-                    fileLabel.after_cancel(afterID)
-                fileLabelAfterIDs.clear()            
-            initialWindowWidth = root.winfo_width()
-            windowTextRatio = getWindowTextRatio()
-            shortPath = splitPath(presetSave)
-            while initialWindowWidth / len(f'Slot {selSlot+1} exported to: {os.path.normpath(presetSave)}'):
-                if initialWindowWidth / len(f'Slot {selSlot+1} exported to: {os.path.normpath(presetSave)}') >= 7.29:
-                    filePathStr.set(f'Slot {selSlot+1} exported to: {os.path.normpath(presetSave)}')
-                    fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                    break
-                elif initialWindowWidth / len(f'Slot {selSlot+1} exported to: {shortPath[0]}') >= windowTextRatio:
-                    filePathStr.set(f'Slot {selSlot+1} exported to: {shortPath[0]}')
-                    fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                    break
-                elif initialWindowWidth / len(f'Slot {selSlot+1} exported to: {shortPath[1]}') >= windowTextRatio:
-                    filePathStr.set(f'Slot {selSlot+1} exported to: {shortPath[1]}')
-                    fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                    break
-                else:
-                    filePathStr.set(f'Slot {selSlot+1} exported to: {shortPath[2]}')
-                    fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                    break
+            showStatus((pathVariants(f'Slot {selSlot+1} exported to: ', presetSave), 5000))
 
         def exportCancel(*args):
             exportPresetTop.destroy()
@@ -1264,7 +1302,7 @@ def exportPreset(*args):
     presetSave = filedialog.asksaveasfilename(title="Export preset", filetypes=[("NFSU2 Binary Preset", "*.bin *.BIN")], defaultextension=[".bin"], initialdir=userDirPaths["exportPresetDir"])
     if presetSave == "":
         return
-    if not exportSlots[selSlot][0] in xnames.keys() and not exportSlots[selSlot][0] in userXnames.keys():
+    if not exportSlotNames[selSlot] in xnames.keys() and not exportSlotNames[selSlot] in userXnames.keys():
         addXnameDlg()
     exportPresetSettings()
 
@@ -1273,46 +1311,29 @@ def importPreset(*args):
     global dirtyFlag
     global newXname
     global newXnameHash
-    global myCarsSlots
-    global careerSlots
     global presetImportFlag
     global importPresetDir
     global fileLabelAfterIDs
 
+    if openProfilePath and len(selectedSlots()) > 1:
+        importSlots(selectedSlots())
+        return
+
     importPerfLevel = 0
     
-    perfLevels = [bytearray(b'\x00'*68),
-                  bytearray(b'\x01\x01\x00\x00\x00\x00\x01\x01\x01\x00\x00\x00\x01\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x00\x00\x00\x01\x00\x00\x01\x01\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x00\x00\x00\x00\x01\x00\x00\x01\x01\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x00\x00\x00'),
-                  bytearray(b'\x01\x01\x01\x01\x00\x00\x01\x01\x00\x01\x01\x00\x00\x01\x00\x00\x01\x01\x01\x01\x01\x01\x00\x00\x00\x00\x00\x01\x00\x00\x01\x01\x01\x00\x00\x00\x01\x00\x00\x01\x00\x01\x01\x00\x00\x01\x01\x01\x01\x01\x01\x00\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00'),
-                  bytearray(b'\x01\x01\x01\x01\x01\x01\x01\x01\x00\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00\x01\x01\x01\x01\x01\x01\x01\x00\x00\x01\x00\x01\x00\x00\x00\x00\x01\x01\x01\x00\x01\x00\x00\x01\x01\x01\x01\x00\x01\x01\x01\x01\x01\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01')]
-
     ## dialog to set performance level of imported preset
     def importPresetPerfLv(*args):
         spPerfFlag = tk.IntVar(value=0)
         
         def importPresetPerfLvOk(*args):
             global importPerfLvCnc
-            importSlots[selSlot][2] = bytearray(importSlots[selSlot][2])
-            if spPerfFlag.get() == 0:
-                importSlots[selSlot][2][788:856] = perfLevels[0]
-            elif spPerfFlag.get() == 1:
-                importSlots[selSlot][2][788:856] = perfLevels[1]
-            elif spPerfFlag.get() == 2:
-                importSlots[selSlot][2][788:856] = perfLevels[2]
-            elif spPerfFlag.get() == 3:
-                importSlots[selSlot][2][788:856] = perfLevels[3]
-            elif spPerfFlag.get() == -2:
-                pass
+            global importPerfLvSel
+            if spPerfFlag.get() == -2:
+                importPerfLvSel = None
+            elif spPerfFlag.get() in range(4):
+                importPerfLvSel = spPerfFlag.get()
             else:
-                if importPerfLevel == 0:
-                    importSlots[selSlot][2][788:856] = perfLevels[0]
-                elif importPerfLevel == 1:
-                    importSlots[selSlot][2][788:856] = perfLevels[1]
-                elif importPerfLevel == 2:
-                    importSlots[selSlot][2][788:856] = perfLevels[2]
-                else:
-                    importSlots[selSlot][2][788:856] = perfLevels[3]
-            importSlots[selSlot][2] = bytes(importSlots[selSlot][2])
+                importPerfLvSel = importPerfLevel
             importPerfLvCnc = 0
             importPresetPerfLvTop.destroy()
 
@@ -1366,116 +1387,55 @@ def importPreset(*args):
     
     if openProfilePath:
         if activeList == 1:
-            importSlots = myCarsSlots
             selSlot = selectedMyCarsSlot
         if activeList == 2:
-            importSlots = careerSlots
             selSlot = selectedCareerSlot
         
         presetOpen = filedialog.askopenfilename(title="Import preset", filetypes=[("NFSU2 Binary Preset", "*.bin *.BIN")], initialdir=userDirPaths["importPresetDir"])
         if presetOpen == "":
             return
         with open (presetOpen, 'rb') as presetRead:
-            if 824 < len(presetRead.read()) > 825 :
-                badFile=messagebox.showerror(title="Error", message="Invalid preset file, please select a valid unserialized preset file.")
-                return
-            presetRead.seek(8)
-            presetXname=''
-            for c in presetRead.read(32).decode('ascii'):
-                if c.isalnum() or c == "_":
-                    presetXname += c
-                    
-            if not presetXname in xnames.keys() and not presetXname in userXnames.keys():
-                newXname.set(presetXname)
-                presetImportFlag = 1
-                addXnameDlg()
-                presetXnameHash = newXnameHash.get()
-                if presetXnameHash == '':
-                    return
-            else:
-                if presetXname in xnames.keys():
-                    presetXnameHash = xnames[presetXname]
-                if presetXname in userXnames.keys():
-                    presetXnameHash = userXnames[presetXname]
-
-            presetRead.seek(40)
-            presetName = ''
-            for c in presetRead.read(32).decode('ascii'):
-                if c.isalnum() or c == "_":
-                    presetName += c
-                    
-            presetRead.seek(76)
-            presetData = presetRead.read(748)
-            presetRead.seek(72)
-            importPerfLevel = struct.unpack('>B',presetRead.read(1))[0]
-            importPresetPerfLv()
-            if importPerfLvCnc == 1:
+            try:
+                preset = memphisrider.readPreset(memphisrider.unpackData(presetRead.read()))
+            except (memphisrider.ProfileError, memphisrider.CompressError) as presetError:
+                badFile=messagebox.showerror(title="Error", message=str(presetError))
                 return
             presetRead.close()
-            userDirPaths["importPresetDir"] = os.path.split(presetOpen)[0]
-            saveUserDirPaths()
+        presetXname = preset["xname"]
+                
+        if not presetXname in xnames.keys() and not presetXname in userXnames.keys():
+            newXname.set(presetXname)
+            presetImportFlag = 1
+            addXnameDlg()
+            presetXnameHash = newXnameHash.get()
+            if presetXnameHash == '':
+                return
+        else:
+            if presetXname in xnames.keys():
+                presetXnameHash = xnames[presetXname]
+            if presetXname in userXnames.keys():
+                presetXnameHash = userXnames[presetXname]
+
+        presetName = preset["presetName"]
+        presetData = preset["data"]
+        importPerfLevel = preset["perfLevel"]
+        importPresetPerfLv()
+        if importPerfLvCnc == 1:
+            return
+        userDirPaths["importPresetDir"] = os.path.split(presetOpen)[0]
+        settingsChanged("userDirPaths")
             
         newXname.set(presetXnameHash)
-        importSlots[selSlot][0] = presetXname
-        importSlots[selSlot][1] = struct.pack('>I',int(presetXnameHash,16))
-        importSlots[selSlot][2] = bytearray(importSlots[selSlot][2])
-        importSlots[selSlot][2][29:776] = presetData
-        importSlots[selSlot][2][25:29] = importSlots[selSlot][1]
+        with profile.change(f"import of preset {presetName} to slot {selSlot+1}"):
+            profile.importPreset(activeList, selSlot, presetXnameHash, presetData, importPerfLvSel)
         slotPresetNameHash(presetData, presetName, presetOpen)
-        if activeList == 1:
-            if selSlot < 9:
-                importSlots[selSlot][2][0:4] = f"0{selSlot+1}MC".encode('ascii')
-                importSlots[selSlot][2][4:9] = f"MC0{selSlot+1}".encode('ascii')
-            else:
-                importSlots[selSlot][2][0:4] = f"{selSlot+1}MC".encode('ascii')
-                importSlots[selSlot][2][4:9] = f"MC{selSlot+1}".encode('ascii')
-            importSlots[selSlot][2][8:9] = struct.pack('>B',1)
-            importSlots[selSlot][2][12:13] = struct.pack('>B',2)
-            importSlots[selSlot][2] = bytes(myCarsSlots[selectedMyCarsSlot][2])
-        if activeList == 2:
-            if selSlot < 9:
-                importSlots[selSlot][2][0:4] = f"0{selSlot+1}CR".encode('ascii')
-                importSlots[selSlot][2][4:9] = f"CR0{selSlot+1}".encode('ascii')
-            else:
-                importSlots[selSlot][2][0:4] = f"{selSlot+1}CR".encode('ascii')
-                importSlots[selSlot][2][4:9] = f"CR{selSlot+1}".encode('ascii')
-            importSlots[selSlot][2][8:9] = struct.pack('>B',1)
-            importSlots[selSlot][2][12:13] = struct.pack('>B',4)
-            importSlots[selSlot][2][1069:1070] = struct.pack('>B',1)
-            importSlots[selSlot][2] = bytes(importSlots[selSlot][2])
 
         dirtyFlag = 1
         newXname.set('')
         newXnameHash.set('')          
-        myCarsListboxPopulate()
-        careerListboxPopulate()            
-        loadSlots()
+        slotsChanged()
         
-        if "last modified" in filePathStr.get() or "last path:" in filePathStr.get():
-            for afterID in fileLabelAfterIDs:
-                fileLabel.after_cancel(afterID)
-            fileLabelAfterIDs.clear()
-            
-        initialWindowWidth = root.winfo_width()
-        windowTextRatio = getWindowTextRatio()
-        shortPath = splitPath(presetOpen)
-        while initialWindowWidth / len(f'Imported {os.path.normpath(presetOpen)} to slot {selSlot+1}'):
-            if initialWindowWidth / len(f'Imported {os.path.normpath(presetOpen)} to slot {selSlot+1}') >= windowTextRatio:
-                filePathStr.set(f'Imported {os.path.normpath(presetOpen)} to slot {selSlot+1}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            elif initialWindowWidth / len(f'Imported {shortPath[0]} to slot {selSlot+1}') >= windowTextRatio:
-                filePathStr.set(f'Imported {shortPath[0]} to slot {selSlot+1}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            elif initialWindowWidth / len(f'Imported {shortPath[1]} to slot {selSlot+1}') >= windowTextRatio:
-                filePathStr.set(f'Imported {shortPath[1]} to slot {selSlot+1}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
-            else:
-                filePathStr.set(f'Imported {shortPath[2]} to slot {selSlot+1}')
-                fileLabelAfterID = fileLabel.after(5000, openFileLabel)
-                break
+        showStatus((pathVariants('Imported ', presetOpen, f' to slot {selSlot+1}'), 5000))
 
 ## opens Add XNAME dialog on button command
 def addXnameSolo(*args):
@@ -1488,9 +1448,6 @@ def addXnameSolo(*args):
 
 ## opens Add XNAME dialog when called, also auto fills XNAME or hash when found
 def addXnameDlg():
-    global myCarsSlots
-    global careerSlots
-    global userXnames
     global newXname
     global newXnameHash
     global presetImportFlag
@@ -1500,34 +1457,16 @@ def addXnameDlg():
         newXnameHash.set('')
         
     if activeList == 1:
-        carSlots = myCarsSlots
+        carSlotNames = myCarsSlotNames
         selSlot = selectedMyCarsSlot
     if activeList == 2:
-        carSlots = careerSlots
+        carSlotNames = careerSlotNames
         selSlot = selectedCareerSlot
 
-    ## gets hash from a string, thanks to TerminatorVasya for lending me his code
-    def hashString(string):
-        if string is None:
-            return 0
-        
-        result = -1
-
-        for char in string:
-            result = result * 0x21 + ord(char)
-        # Mask the result to keep only the last 4 bytes
-        result &= 0xFFFFFFFF
-
-        # Convert to bytes in little-endian order (reverse byte order)
-        reversed_bytes = result.to_bytes(4, byteorder='big')[::-1]
-
-        # Convert back to hexadecimal string
-        return ''.join(f"{byte:02X}" for byte in reversed_bytes)
-
     ## callback function for XNAME entry field, calls hashString and fills hash entry field on each key release 
     def generateHashString(*args):
         if newXname.get() != '':
-            newXnameHashRaw = hashString(newXname.get())
+            newXnameHashRaw = memphisrider.hashString(newXname.get())
             newXnameHashSet = f"{int(newXnameHashRaw,16):#0{10}x}"
             newXnameHash.set(newXnameHashSet.upper().replace("0X","0x"))
             return newXnameHashSet
@@ -1545,17 +1484,16 @@ def addXnameDlg():
     def addXnameOk(*args):
         global presetImportFlag
         
-        with open ("MemphisRider_userXnames.json", 'w') as userXnamesFile:
-            newXnameHashWrite = f"{int(newXnameHash.get(),16):#0{10}x}"
-            userXnames[newXname.get().upper()] = str(newXnameHashWrite).upper().replace("0X","0x")
-            userXnamesSorted = dict(sorted(userXnames.items(), key=lambda item: item[0]))
-            userXnamesFile.write(json.dumps(userXnamesSorted, indent=4))
-            userXnamesFile.close
-        loadUserXnames()
+        userXnames[newXname.get().upper()] = memphisrider.formatXnameHash(newXnameHash.get())
+        settingsChanged("userXnames")
+        xnameCollision = xnameIndex.add(newXname.get().upper(), userXnames[newXname.get().upper()])
+        if xnameCollision is not None:
+            collisionMsg = messagebox.showwarning("Attention", f"{newXname.get().upper()} has the same hash as {xnameCollision}.\nSlots with this hash will keep showing up as {xnameCollision}.")
+        ## only the rows of cars with this hash show a new name
         if openProfilePath:
-            carSlots[selSlot][0] = newXname.get().upper()
-            myCarsListboxPopulate()
-            careerListboxPopulate()
+            addedHash = int(userXnames[newXname.get().upper()], 16)
+            slotsChanged((garage, index) for garage, slotCount in ((MY_CARS, memphisrider.MY_CARS_COUNT), (CAREER, memphisrider.CAREER_COUNT))
+                         for index in range(slotCount) if int.from_bytes(profile.slotXnameHash(garage, index), 'big') == addedHash)
         if presetImportFlag == 0:
             newXname.set('')
             newXnameHash.set('')
@@ -1584,9 +1522,9 @@ def addXnameDlg():
         addXnameMsgLbl = ttk.Label(addXnameTop, text="Please enter the XNAME and hash to add.\n")
     elif newXname.get() != '' and not newXname.get() in xnames.keys() and not newXname.get() in userXnames.keys() and activeList != 0:
         addXnameMsgLbl = ttk.Label(addXnameTop, text="Car XNAME does not exist in current lists, please add them.\nEnter the XNAME and hash to add.\n")
-    elif not carSlots[selSlot][0] in xnames.keys() and not carSlots[selSlot][0] in userXnames.keys() and activeList != 0:
+    elif not carSlotNames[selSlot] in xnames.keys() and not carSlotNames[selSlot] in userXnames.keys() and activeList != 0:
         addXnameMsgLbl = ttk.Label(addXnameTop, text="Car XNAME does not exist in current lists, please add them.\nEnter the XNAME and hash to add.\n")
-        newXnameHash.set(carSlots[selSlot][0])
+        newXnameHash.set(carSlotNames[selSlot])
     addXnameMsgLbl.grid(row=0, column=0, columnspan=3, sticky='NSEW')
     addXnameLabel = ttk.Label(addXnameTop, text="XNAME")
     addXnameLabel.grid(row=1, column=0, columnspan=3, sticky='NSEW')
@@ -1622,7 +1560,6 @@ def addXnameDlg():
 ## opens up serialized preset file to change its XNAME
 def changeSerPresetXname(*args):
     global xnames
-    global userXnames
     global newXname
 
     openSerPresetFile = filedialog.askopenfilename(title="Open your serialized preset", filetypes=[("NFSU2 Binary preset", "*.bin *.BIN")])
@@ -1630,25 +1567,15 @@ def changeSerPresetXname(*args):
             return
     
     with open (openSerPresetFile, "rb") as preset:
-        if preset.read(3) != b'gMp':
-            badFile = messagebox.showerror(title="Error", message="Not a serialized Binary preset .bin file")
-            return
-        openSerPreset=preset.read()
-        preset.seek(28)
-        filesizeData=struct.unpack('h',preset.read(2))[0]
-        xnamesKeys = list(xnames.keys())
-        userXnamesKeys = list(userXnames.keys())
-        for i in range(len(xnamesKeys)):
-            if str(openSerPreset).find(f"{xnamesKeys[i]}_BASE") != -1:
-                 xname = f"{xnamesKeys[i]}".encode('ascii')
-            elif len(xnamesKeys)-i >= 0:
-                pass
-            elif len(xnamesKeys)-i <= 0:
-                if str(openSerPreset).find(f"{userXnamesKeys[i]}_BASE") != -1:
-                    xname = f"{userXnamesKeys[i]}".encode('ascii')
-            else:
-                addXnameDlg()
-                xname = newXname.get()
+        openSerPreset = preset.read()
+    if not memphisrider.isSerializedPreset(openSerPreset):
+        badFile = messagebox.showerror(title="Error", message="Not a serialized Binary preset .bin file")
+        return
+    ## one pass over the preset for every known XNAME at once
+    xname, xnameKnown = memphisrider.xnameMatcher(userXnames).find(openSerPreset)
+    if xname is None:
+        badFile = messagebox.showerror(title="Error", message="Couldn't find the XNAME of this serialized preset")
+        return
 
     def chgSerPreXnameOkToggle(*args):
         if not newXname.get():
@@ -1659,24 +1586,15 @@ def changeSerPresetXname(*args):
             chgSerPreXnameTop.bind('<Return>', chgSerPreXnameOk)
             
     def chgSerPreXnameOk(*args):
-        with open (openSerPresetFile, "rb") as preset:
-            openSerPreset=preset.read()
-            preset.seek(0)
-            openSerPreset=openSerPreset.replace(xname, newXname.get().encode('ascii'))
-            savePreset = filedialog.asksaveasfilename(title="Save NFSU2 serialized preset as...", filetypes=[("NFSU2 Binary preset", "*.bin*")], defaultextension=[".bin"])
-            
-            if savePreset == "":
-                pass
-            with open (savePreset, 'wb') as presetWrite:
-                presetWrite.write(openSerPreset)
-                if len(xname) < len(newXname.get()):
-                    preset.seek(28)
-                    filesizeDataNew=struct.pack('h',filesizeData+200)
-                    presetWrite.seek(28)
-                    presetWrite.write(filesizeDataNew)
-
-            presetWrite.close()                
-            chgSerPreXnameTop.destroy()
+        savePreset = filedialog.asksaveasfilename(title="Save NFSU2 serialized preset as...", filetypes=[("NFSU2 Binary preset", "*.bin*")], defaultextension=[".bin"])
+        if savePreset == "":
+            return
+        try:
+            memphisrider.renameXnameFile(openSerPresetFile, newXname.get().upper(), savePreset, oldXname=xname)
+        except memphisrider.ProfileError as renameError:
+            renameErrorMsg = messagebox.showerror("Error", str(renameError))
+            return
+        chgSerPreXnameTop.destroy()
 
     def chgSerPreXnameCancel(*args):
         newXname.set('')
@@ -1691,7 +1609,7 @@ def changeSerPresetXname(*args):
     chgSerPreXnameTop.minsize(300,100)
     chgSerPreXnameTop.focus_force()
     chgSerPreXnameTop.grab_set()
-    chgSerPreXnameCurLabel = ttk.Label(chgSerPreXnameTop, text=f'Current XNAME: {xname.decode("ascii")}')
+    chgSerPreXnameCurLabel = ttk.Label(chgSerPreXnameTop, text=f'Current XNAME: {xname}' if xnameKnown else f'Current XNAME: {xname} (unknown)')
     chgSerPreXnameCurLabel.grid(row=0, column=0, columnspan=3, sticky='NSEW')
     chgSerPreXnameSpacerLbl = ttk.Label(chgSerPreXnameTop, text="")
     chgSerPreXnameSpacerLbl.grid(row=1, column=0, sticky="NSEW", pady='5')
@@ -1723,36 +1641,65 @@ def toolsMenuKbind(event):
     
 
 ## defines window widgets
-openProfileBtn = ttk.Button(topFrame, image=openBtnIcon, text='Open', style='TopButton.TButton', command=openProfile)
+openProfileBtn = ttk.Button(topFrame, text='Open', style='TopButton.TButton', command=openProfile)
 openProfileBtn.grid(row = 0, column=0, sticky='W')
-openTip = Hovertip(openProfileBtn, 'Open profile (Ctrl+O)')
-saveProfileBtn = ttk.Button(topFrame, image=saveBtnIcon, text='Save', state='disabled', command=saveProfile)
+lazyIcon(openProfileBtn, openBtnIconData)
+lazyTooltip(openProfileBtn, 'Open profile (Ctrl+O)')
+saveProfileBtn = ttk.Button(topFrame, text='Save', state='disabled', command=saveProfile)
 saveProfileBtn.grid(row = 0, column=1, sticky='W')
-saveTip = Hovertip(saveProfileBtn, 'Save profile (Ctrl+S)')
-saveAsProfileBtn = ttk.Button(topFrame, image=saveAsBtnIcon, text='Save As...', state='disabled', command=saveProfileAs)
+lazyIcon(saveProfileBtn, saveBtnIconData)
+lazyTooltip(saveProfileBtn, 'Save profile (Ctrl+S)')
+saveAsProfileBtn = ttk.Button(topFrame, text='Save As...', state='disabled', command=saveProfileAs)
 saveAsProfileBtn.grid(row = 0, column=2, sticky='W')
-saveAsTip = Hovertip(saveAsProfileBtn, 'Save profile as... (Ctrl+Shift+S)')
-reloadProfileBtn = ttk.Button(topFrame, image=reloadBtnIcon, text='Reload Profile', state='disabled', command=reloadProfile)
+lazyIcon(saveAsProfileBtn, saveAsBtnIconData)
+lazyTooltip(saveAsProfileBtn, 'Save profile as... (Ctrl+Shift+S)')
+reloadProfileBtn = ttk.Button(topFrame, text='Reload Profile', state='disabled', command=reloadProfile)
 reloadProfileBtn.grid(row = 0, column=3, sticky='W')
-reloadTip = Hovertip(reloadProfileBtn, 'Reload profile (Ctrl+R)')
+lazyIcon(reloadProfileBtn, reloadBtnIconData)
+lazyTooltip(reloadProfileBtn, 'Reload profile (Ctrl+R)')
 topSpacerLbl = ttk.Label(topFrame, text='')
 topSpacerLbl.grid(row = 0, column = 3, sticky = 'NSEW', padx=100)
-toolsMenuBtn = ttk.Menubutton(topFrame, image=toolsBtnIcon, text='Tools...', takefocus=True)
+toolsMenuBtn = ttk.Menubutton(topFrame, text='Tools...', takefocus=True)
 toolsMenuBtn.grid(row = 0, column=4, sticky="E")
-toolsMenuBtnTip = Hovertip(toolsMenuBtn, 'Tools (Alt+T)')
+lazyIcon(toolsMenuBtn, toolsBtnIconData)
+lazyTooltip(toolsMenuBtn, 'Tools (Alt+T)')
 toolsMenuBtn.menu = tk.Menu(toolsMenuBtn, tearoff=0)
 toolsMenuBtn["menu"] = toolsMenuBtn.menu
+toolsMenuBtn.menu.add_command(
+    label="Undo",
+    accelerator="Ctrl-Z",
+    command=undoChange
+    )
+toolsMenuBtn.menu.add_command(
+    label="Redo",
+    accelerator="Ctrl-Y",
+    command=redoChange
+    )
+toolsMenuBtn.menu.add_command(
+    label="Sort garage...",
+    accelerator="Ctrl-Shift-O",
+    command=sortGarageDlg
+    )
+toolsMenuBtn.menu.add_command(
+    label="Import from archive...",
+    accelerator="Ctrl-Shift-A",
+    command=importArchiveDlg
+    )
+toolsMenuBtn.menu.add_command(
+    label="Find similar presets...",
+    accelerator="Ctrl-Shift-F",
+    command=findSimilarDlg
+    )
+toolsMenuBtn.menu.add_separator()
 toolsMenuBtn.menu.add_command(
     label="Add XNAME...",
     accelerator="Ctrl-A",
-    image=addXnameBtnIcon,
     compound=tk.LEFT,
     command=addXnameSolo
     )
 toolsMenuBtn.menu.add_command(
     label="Change XNAME in serialized preset file...",
     accelerator="Ctrl-Shift-C",
-    image=chgXnameBtnIcon,
     compound=tk.LEFT,
     command=changeSerPresetXname
     )
@@ -1760,12 +1707,14 @@ toolsMenuBtn.menu.add_separator()
 toolsMenuBtn.menu.add_command(
     label="About...",
     accelerator="F1",
-    image=aboutBtnIcon,
     compound=tk.LEFT,
     command=aboutDlg
     )
+lazyIcon(toolsMenuBtn.menu, addXnameBtnIconData, "Add XNAME...")
+lazyIcon(toolsMenuBtn.menu, chgXnameBtnIconData, "Change XNAME in serialized preset file...")
+lazyIcon(toolsMenuBtn.menu, aboutBtnIconData, "About...")
 
-myCarsListbox = tk.Listbox(myCarsTabLeft, listvariable=myCarsSlotsListVar, exportselection=False, state='disabled')
+myCarsListbox = tk.Listbox(myCarsTabLeft, listvariable=myCarsSlotsListVar, exportselection=False, selectmode='extended', state='disabled')
 myCarsListbox.grid(row=0, column=0, columnspan=2, rowspan=15, sticky="NSEW")
 myCarsListbox.bind('<<ListboxSelect>>', loadSlots)
 myCarsLbScroll = ttk.Scrollbar(myCarsTabLeft, orient=tk.VERTICAL, command=myCarsListbox.yview)
@@ -1774,33 +1723,40 @@ myCarsListbox.configure(yscrollcommand = myCarsLbScroll.set)
 myCarsLbHScroll = ttk.Scrollbar(myCarsTabLeft, orient=tk.HORIZONTAL, command=myCarsListbox.xview)
 myCarsLbHScroll.grid(row=1, column=0, sticky="NSEW")
 myCarsListbox.configure(xscrollcommand = myCarsLbHScroll.set)
-exportMyCarsSlotBtn = ttk.Button(myCarsTabRight, text="Export slot", image=slotExportIcon, compound='left', command=exportSlot, state='disabled', style='TabButton.TButton')
+exportMyCarsSlotBtn = ttk.Button(myCarsTabRight, text="Export slot", compound='left', command=exportSlot, state='disabled', style='TabButton.TButton')
 exportMyCarsSlotBtn.grid(row=0, column=0, sticky="NSEW")
-exportMyCarsTip = Hovertip(exportMyCarsSlotBtn, 'Export slot (Ctrl+E)')
-importMyCarsSlotBtn = ttk.Button(myCarsTabRight, text="Import slot", image=slotImportIcon, compound='left', command=importSlot, state='disabled', style='TabButton.TButton')
+lazyIcon(exportMyCarsSlotBtn, slotExportIconData)
+lazyTooltip(exportMyCarsSlotBtn, 'Export slot (Ctrl+E)')
+importMyCarsSlotBtn = ttk.Button(myCarsTabRight, text="Import slot", compound='left', command=importSlot, state='disabled', style='TabButton.TButton')
 importMyCarsSlotBtn.grid(row=1, column=0, sticky="NSEW")
-importMyCarsSlotTip = Hovertip(importMyCarsSlotBtn, 'Import slot (Ctrl+I)')
-clearMyCarsSlotBtn = ttk.Button(myCarsTabRight, text="Clear slot", image=slotClearIcon, compound='left', command=clearSlot, state='disabled', style='TabButton.TButton')
+lazyIcon(importMyCarsSlotBtn, slotImportIconData)
+lazyTooltip(importMyCarsSlotBtn, 'Import slot (Ctrl+I)')
+clearMyCarsSlotBtn = ttk.Button(myCarsTabRight, text="Clear slot", compound='left', command=clearSlot, state='disabled', style='TabButton.TButton')
 clearMyCarsSlotBtn.grid(row=2, column=0, sticky="NSEW")
-clearMyCarsSlotTip = Hovertip(clearMyCarsSlotBtn, 'Clear slot (Ctrl+Delete)')
+lazyIcon(clearMyCarsSlotBtn, slotClearIconData)
+lazyTooltip(clearMyCarsSlotBtn, 'Clear slot (Ctrl+Delete)')
 myCarsSpacerLbl = ttk.Label(myCarsTabRight, text="")
 myCarsSpacerLbl.grid(row=3, column=0, sticky="NSEW", pady='5')
-myCarsMoveSlotUpBtn = ttk.Button(myCarsTabRight, text="Move slot up", image=moveSlotUpIcon, compound='left', command=moveSlotUp, state='disabled', style='TabButton.TButton')
+myCarsMoveSlotUpBtn = ttk.Button(myCarsTabRight, text="Move slot up", compound='left', command=moveSlotUp, state='disabled', style='TabButton.TButton')
 myCarsMoveSlotUpBtn.grid(row=4, column=0, sticky="NSEW")
-myCarsMoveSlotUpTip = Hovertip(myCarsMoveSlotUpBtn, 'Move slot up (Ctrl+Page Up)')
-myCarsMoveSlotDownBtn = ttk.Button(myCarsTabRight, text="Move slot down", image=moveSlotDownIcon, compound='left', command=moveSlotDown, state='disabled', style='TabButton.TButton')
+lazyIcon(myCarsMoveSlotUpBtn, moveSlotUpIconData)
+lazyTooltip(myCarsMoveSlotUpBtn, 'Move slot up (Ctrl+Page Up)')
+myCarsMoveSlotDownBtn = ttk.Button(myCarsTabRight, text="Move slot down", compound='left', command=moveSlotDown, state='disabled', style='TabButton.TButton')
 myCarsMoveSlotDownBtn.grid(row=5, column=0, sticky="NSEW")
-myCarsMoveSlotDownTip = Hovertip(myCarsMoveSlotDownBtn, 'Move slot down (Ctrl+Page Down)')
+lazyIcon(myCarsMoveSlotDownBtn, moveSlotDownIconData)
+lazyTooltip(myCarsMoveSlotDownBtn, 'Move slot down (Ctrl+Page Down)')
 myCarsSpacerLbl2 = ttk.Label(myCarsTabRight, text="")
 myCarsSpacerLbl2.grid(row=6, column=0, sticky="NSEW", pady='5')
-exportMyCarsPsetBtn = ttk.Button(myCarsTabRight, text="Export as preset", image=exportPresetIcon, compound='left', command=exportPreset, state='disabled', style='TabButton.TButton')
+exportMyCarsPsetBtn = ttk.Button(myCarsTabRight, text="Export as preset", compound='left', command=exportPreset, state='disabled', style='TabButton.TButton')
 exportMyCarsPsetBtn.grid(row=7, column=0, sticky="NSEW")
-exportMyCarsPsetTip = Hovertip(exportMyCarsPsetBtn, 'Export as preset (Ctrl+Shift+E)')
-importMyCarsPsetBtn = ttk.Button(myCarsTabRight, text="Import preset", image=importPresetIcon, compound='left', command=importPreset, state='disabled', style='TabButton.TButton')
+lazyIcon(exportMyCarsPsetBtn, exportPresetIconData)
+lazyTooltip(exportMyCarsPsetBtn, 'Export as preset (Ctrl+Shift+E)')
+importMyCarsPsetBtn = ttk.Button(myCarsTabRight, text="Import preset", compound='left', command=importPreset, state='disabled', style='TabButton.TButton')
 importMyCarsPsetBtn.grid(row=8, column=0, sticky="NSEW")
-importMyCarsPsetTip = Hovertip(importMyCarsPsetBtn, 'Import preset (Ctrl+Shift+I)')
+lazyIcon(importMyCarsPsetBtn, importPresetIconData)
+lazyTooltip(importMyCarsPsetBtn, 'Import preset (Ctrl+Shift+I)')
 
-careerListbox = tk.Listbox(careerTabLeft, listvariable=careerSlotsListVar, exportselection=False, state='disabled')
+careerListbox = tk.Listbox(careerTabLeft, listvariable=careerSlotsListVar, exportselection=False, selectmode='extended', state='disabled')
 careerListbox.grid(row=0, column=0, columnspan=2, rowspan=15, sticky="NSEW")
 careerListbox.bind('<<ListboxSelect>>', loadSlots)
 careerLbScroll = ttk.Scrollbar(careerTabLeft, orient=tk.VERTICAL, command=careerListbox.yview)
@@ -1809,36 +1765,45 @@ careerListbox.configure(yscrollcommand = careerLbScroll.set)
 careerLbHScroll = ttk.Scrollbar(careerTabLeft, orient=tk.HORIZONTAL, command=careerListbox.xview)
 careerLbHScroll.grid(row=1, column=0, sticky="NSEW")
 careerListbox.configure(xscrollcommand = careerLbHScroll.set)
-exportCareerSlotBtn = ttk.Button(careerTabRight, text="Export slot", image=slotExportIcon, compound='left', command=exportSlot, state='disabled', style='TabButton.TButton')
+exportCareerSlotBtn = ttk.Button(careerTabRight, text="Export slot", compound='left', command=exportSlot, state='disabled', style='TabButton.TButton')
 exportCareerSlotBtn.grid(row=0, column=0, sticky="NSEW")
-exportCareerSlotTip = Hovertip(exportCareerSlotBtn, 'Export slot (Ctrl+E)')
-importCareerSlotBtn = ttk.Button(careerTabRight, text="Import slot", image=slotImportIcon, compound='left', command=importSlot, state='disabled', style='TabButton.TButton')
+lazyIcon(exportCareerSlotBtn, slotExportIconData)
+lazyTooltip(exportCareerSlotBtn, 'Export slot (Ctrl+E)')
+importCareerSlotBtn = ttk.Button(careerTabRight, text="Import slot", compound='left', command=importSlot, state='disabled', style='TabButton.TButton')
 importCareerSlotBtn.grid(row=1, column=0, sticky="NSEW")
-importCareerSlotTip = Hovertip(importCareerSlotBtn, 'Import slot (Ctrl+I)')
-clearCareerSlotBtn = ttk.Button(careerTabRight, text="Clear slot", image=slotClearIcon, compound='left', command=clearSlot, state='disabled', style='TabButton.TButton')
+lazyIcon(importCareerSlotBtn, slotImportIconData)
+lazyTooltip(importCareerSlotBtn, 'Import slot (Ctrl+I)')
+clearCareerSlotBtn = ttk.Button(careerTabRight, text="Clear slot", compound='left', command=clearSlot, state='disabled', style='TabButton.TButton')
 clearCareerSlotBtn.grid(row=2, column=0, sticky="NSEW")
-clearCareerSlotTip = Hovertip(clearCareerSlotBtn, 'Clear slot (Ctrl+Delete)')
+lazyIcon(clearCareerSlotBtn, slotClearIconData)
+lazyTooltip(clearCareerSlotBtn, 'Clear slot (Ctrl+Delete)')
 careerSpacerLbl = ttk.Label(careerTabRight, text="")
 careerSpacerLbl.grid(row=3, column=0, sticky="NSEW", pady='5')
-careerMoveSlotUpBtn = ttk.Button(careerTabRight, text="Move slot up", image=moveSlotUpIcon, compound='left', command=moveSlotUp, state='disabled', style='TabButton.TButton')
+careerMoveSlotUpBtn = ttk.Button(careerTabRight, text="Move slot up", compound='left', command=moveSlotUp, state='disabled', style='TabButton.TButton')
 careerMoveSlotUpBtn.grid(row=4, column=0, sticky="NSEW")
-careerMoveSlotUpTip = Hovertip(careerMoveSlotUpBtn, 'Move slot up (Ctrl+Page Up)')
-careerMoveSlotDownBtn = ttk.Button(careerTabRight, text="Move slot down", image=moveSlotDownIcon, compound='left', command=moveSlotDown, state='disabled', style='TabButton.TButton')
+lazyIcon(careerMoveSlotUpBtn, moveSlotUpIconData)
+lazyTooltip(careerMoveSlotUpBtn, 'Move slot up (Ctrl+Page Up)')
+careerMoveSlotDownBtn = ttk.Button(careerTabRight, text="Move slot down", compound='left', command=moveSlotDown, state='disabled', style='TabButton.TButton')
 careerMoveSlotDownBtn.grid(row=5, column=0, sticky="NSEW")
-careerMoveSlotDownTip = Hovertip(careerMoveSlotDownBtn, 'Move slot down (Ctrl+Page Down)')
+lazyIcon(careerMoveSlotDownBtn, moveSlotDownIconData)
+lazyTooltip(careerMoveSlotDownBtn, 'Move slot down (Ctrl+Page Down)')
 careerSpacerLbl2 = ttk.Label(careerTabRight, text="")
 careerSpacerLbl2.grid(row=6, column=0, sticky="NSEW", pady='5')
-exportCareerPsetBtn = ttk.Button(careerTabRight, text="Export as preset", image=exportPresetIcon, compound='left', command=exportPreset, state='disabled', style='TabButton.TButton')
+exportCareerPsetBtn = ttk.Button(careerTabRight, text="Export as preset", compound='left', command=exportPreset, state='disabled', style='TabButton.TButton')
 exportCareerPsetBtn.grid(row=7, column=0, sticky="NSEW")
-exportCareerPsetTip = Hovertip(exportCareerPsetBtn, 'Export as preset (Ctrl+Shift+E)')
-importCareerPsetBtn = ttk.Button(careerTabRight, text="Import preset", image=importPresetIcon, compound='left', command=importPreset, state='disabled', style='TabButton.TButton')
+lazyIcon(exportCareerPsetBtn, exportPresetIconData)
+lazyTooltip(exportCareerPsetBtn, 'Export as preset (Ctrl+Shift+E)')
+importCareerPsetBtn = ttk.Button(careerTabRight, text="Import preset", compound='left', command=importPreset, state='disabled', style='TabButton.TButton')
 importCareerPsetBtn.grid(row=8, column=0, sticky="NSEW")
-importCareerPsetTip = Hovertip(importCareerPsetBtn, 'Import preset (Ctrl+Shift+I)')
+lazyIcon(importCareerPsetBtn, importPresetIconData)
+lazyTooltip(importCareerPsetBtn, 'Import preset (Ctrl+Shift+I)')
 
 footSeparator = ttk.Separator(bottomFrame, orient="horizontal")
-footSeparator.grid(row = 0, column = 0, sticky="EW")
+footSeparator.grid(row = 0, column = 0, columnspan = 2, sticky="EW")
 fileLabel = ttk.Label(bottomFrame, textvariable=filePathStr, width = 10)
 fileLabel.grid(row = 1, column = 0, padx=2, pady=2, sticky='EW')
+writesLabel = ttk.Label(bottomFrame, textvariable=writesStr)
+writesLabel.grid(row = 1, column = 1, padx=2, pady=2, sticky='E')
 
 ## sets active tab on tab change
 mainNotebook.bind("<<NotebookTabChanged>>", activeTab)
@@ -1850,6 +1815,16 @@ root.bind('<Control-s>', saveProfile)
 root.bind('<Control-S>', saveProfile)
 root.bind('<Control-Shift-s>', saveProfileAs)
 root.bind('<Control-Shift-S>', saveProfileAs)
+root.bind('<Control-z>', undoChange)
+root.bind('<Control-Z>', undoChange)
+root.bind('<Control-y>', redoChange)
+root.bind('<Control-Y>', redoChange)
+root.bind('<Control-Shift-o>', sortGarageDlg)
+root.bind('<Control-Shift-O>', sortGarageDlg)
+root.bind('<Control-Shift-a>', importArchiveDlg)
+root.bind('<Control-Shift-A>', importArchiveDlg)
+root.bind('<Control-Shift-f>', findSimilarDlg)
+root.bind('<Control-Shift-F>', findSimilarDlg)
 root.bind('<Control-r>', reloadProfile)
 root.bind('<Control-R>', reloadProfile)
 root.bind('<Alt-t>', toolsMenuKbind)
@@ -1871,6 +1846,28 @@ root.bind('<Control-Shift-e>', exportPreset)
 root.bind('<Control-Shift-E>', exportPreset)
 root.bind('<Control-Shift-i>', importPreset)
 root.bind('<Control-Shift-I>', importPreset)
-root.bind('<Configure>', fileLabelResizeCheck)
+fileLabel.bind('<Configure>', fileLabelResizeCheck)
 
+## the rest of the startup runs once the window has been drawn, one step per idle event so the window stays responsive:
+## icons first since they're visible, then the user XNAMEs and recent folders, then the tooltips
+def finishStartup(steps):
+    if not steps:
+        startupProfile.report()
+        return
+    phase, step = steps[0]
+    ## a failing step (e.g. a corrupted settings file, already reported) mustn't keep the later ones from running
+    try:
+        step()
+    finally:
+        startupProfile.mark(phase)
+        root.after_idle(finishStartup, steps[1:])
+
+def firstPaint():
+    startupProfile.markFirstPaint("first paint")
+    finishStartup([("decode icons", loadIcons),
+                   ("load user XNAMEs, folders and history", lambda: refreshSettings(force=True)),
+                   ("tooltips (idlelib)", loadTooltips)])
+
+startupProfile.mark("build window")
+root.after_idle(firstPaint)
 root.mainloop()
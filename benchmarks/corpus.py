@@ -0,0 +1,90 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## synthetic corpus for the benchmarks (and the tests): profiles with valid slot headers, .bin presets and .u2cc/.u2ci slot pairs.
+## everything is generated from a seed so runs on different versions time the same data
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import memphisrider
+from memphisrider import MY_CARS, CAREER
+
+## random bytes from the seeded generator (Random.randbytes needs Python 3.9)
+def randomBytes(rng, size):
+    return rng.getrandbits(size*8).to_bytes(size, 'little')
+
+carXnames = [name for name in memphisrider.xnames if name != "(empty)"]
+
+## a profile with random visual data in a share of the slots, everything else as the game leaves empty slots
+def makeProfile(rng, fillRatio=0.8):
+    profile = memphisrider.Profile(bytes(memphisrider.PROFILE_SIZE))
+    for garage in (MY_CARS, CAREER):
+        for i in range(profile.slotCount(garage)):
+            if rng.random() < fillRatio:
+                xname = rng.choice(carXnames)
+                profile.importPreset(garage, i, memphisrider.xnames[xname], randomBytes(rng, 748), rng.randrange(4))
+            else:
+                profile.clearSlot(garage, i)
+    profile.updateIds()
+    return profile
+
+def makePreset(rng, index):
+    return memphisrider.buildPreset(rng.choice(carXnames), f"BENCH{index}", randomBytes(rng, 748), rng.randrange(4), rng.random() < 0.1)
+
+## a .u2cc slot and its .u2ci career inventory
+def makeSlotPair(rng):
+    profile = makeProfile(rng, 1.0)
+    return profile.exportSlot(CAREER, rng.randrange(memphisrider.CAREER_COUNT))
+
+## writes profiles, presets and slot pairs to folder; returns the lists of written paths
+def generateCorpus(folder, profiles=20, presets=500, slotPairs=200, seed=2004):
+    rng = random.Random(seed)
+    corpus = {"profiles":[], "presets":[], "slots":[]}
+    for subFolder in corpus:
+        os.makedirs(os.path.join(folder, subFolder), exist_ok=True)
+    for i in range(profiles):
+        path = os.path.join(folder, "profiles", f"BENCH{i:02d}")
+        makeProfile(rng).saveAs(path)
+        corpus["profiles"].append(path)
+    for i in range(presets):
+        path = os.path.join(folder, "presets", f"BENCH{i:04d}.bin")
+        with open (path, 'wb') as presetFile:
+            presetFile.write(makePreset(rng, i))
+        corpus["presets"].append(path)
+    for i in range(slotPairs):
+        path = os.path.join(folder, "slots", f"BENCH{i:04d}.u2cc")
+        slotData, slotInvData = makeSlotPair(rng)
+        with open (path, 'wb') as slotFile:
+            slotFile.write(slotData)
+        with open (path.replace(".u2cc", ".u2ci"), 'wb') as slotInvFile:
+            slotInvFile.write(slotInvData)
+        corpus["slots"].append(path)
+    return corpus
+
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else "benchCorpus"
+    corpus = generateCorpus(folder)
+    print(f'{len(corpus["profiles"])} profiles, {len(corpus["presets"])} presets and {len(corpus["slots"])} slot pairs written to {folder}')
@@ -0,0 +1,279 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## times the headless core paths on a synthetic corpus and writes the results to JSON; with --baseline the results are compared
+## to an earlier run and the exit code is 1 if any benchmark got slower than the threshold allows. e.g.
+##
+##     python benchmarks/run.py -o before.json
+##     (change things)
+##     python benchmarks/run.py -o after.json --baseline before.json --threshold 0.2
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import memphisrider
+from memphisrider import MY_CARS, CAREER
+
+from corpus import generateCorpus, randomBytes
+
+## setup functions take the corpus and a scratch folder and return the callable that gets timed
+benchmarks = {}
+
+def benchmark(function):
+    benchmarks[function.__name__] = function
+    return function
+
+## what openProfile does: read and validate every profile
+@benchmark
+def parseProfiles(corpus, scratch):
+    def run():
+        for path in corpus["profiles"]:
+            memphisrider.Profile.open(path)
+    return run
+
+## what the listbox populate functions do for every slot: XNAME, fingerprint and preset history lookup, on freshly opened profiles
+@benchmark
+def populateLists(corpus, scratch):
+    profiles = [memphisrider.Profile.open(path) for path in corpus["profiles"]]
+    xnameIndex = memphisrider.XnameIndex()
+    presetHistory = {}
+    def run():
+        for profile in profiles:
+            profile.clearSlotCaches()
+            for garage in (MY_CARS, CAREER):
+                slotsList = []
+                for i in range(profile.slotCount(garage)):
+                    slotName = profile.slotXname(garage, i, xnameIndex)
+                    fingerprint = profile.slotFingerprint(garage, i)
+                    if fingerprint in presetHistory:
+                        slotsList.append(f"{slotName} ({presetHistory[fingerprint]['presetName']})")
+                    else:
+                        slotsList.append(slotName)
+    return run
+
+## the same with XNAMEs and fingerprints already cached, as when the lists are refreshed after an edit
+@benchmark
+def repopulateLists(corpus, scratch):
+    profiles = [memphisrider.Profile.open(path) for path in corpus["profiles"]]
+    xnameIndex = memphisrider.XnameIndex()
+    def run():
+        for profile in profiles:
+            for garage in (MY_CARS, CAREER):
+                [(profile.slotXname(garage, i, xnameIndex), profile.slotFingerprint(garage, i)) for i in range(profile.slotCount(garage))]
+    return run
+
+## a held move key: each step redraws only the rows of the slots the move changed
+@benchmark
+def refreshChangedRows(corpus, scratch):
+    profiles = [memphisrider.Profile.open(path) for path in corpus["profiles"]]
+    xnameIndex = memphisrider.XnameIndex()
+    presetHistory = {}
+    def run():
+        for profile in profiles:
+            for i in range(profile.slotCount(MY_CARS) - 1):
+                with profile.change("move"):
+                    profile.moveSlot(MY_CARS, i, i + 1)
+                for garage, index in profile.takeChangedSlots():
+                    slotName = profile.slotXname(garage, index, xnameIndex)
+                    fingerprint = profile.slotFingerprint(garage, index)
+                    if fingerprint in presetHistory:
+                        slotName = f"{slotName} ({presetHistory[fingerprint]['presetName']})"
+    return run
+
+@benchmark
+def fingerprintSlots(corpus, scratch):
+    profiles = [memphisrider.Profile.open(path) for path in corpus["profiles"]]
+    def run():
+        for profile in profiles:
+            profile.clearSlotCaches()
+            for garage in (MY_CARS, CAREER):
+                for i in range(profile.slotCount(garage)):
+                    profile.slotFingerprint(garage, i)
+    return run
+
+## XNAME resolution against the built-in list plus a big user list
+@benchmark
+def resolveXnames(corpus, scratch):
+    rng = random.Random(1)
+    userXnames = {f"ADDON{i}":memphisrider.formatXnameHash(memphisrider.hashString(f"ADDON{i}")) for i in range(5000)}
+    profiles = [memphisrider.Profile.open(path) for path in corpus["profiles"]]
+    slotHashes = [bytes(profile.slotXnameHash(garage, i)) for profile in profiles for garage in (MY_CARS, CAREER) for i in range(profile.slotCount(garage))]
+    slotHashes += [randomBytes(rng, 4) for i in range(len(slotHashes))]
+    def run():
+        xnameIndex = memphisrider.XnameIndex(userXnames)
+        for slotHash in slotHashes:
+            xnameIndex.lookup(slotHash)
+    return run
+
+## slot import (with career inventory), clear and move over every slot of a profile
+@benchmark
+def slotOperations(corpus, scratch):
+    profile = memphisrider.Profile.open(corpus["profiles"][0])
+    slotPairs = []
+    for path in corpus["slots"][:memphisrider.CAREER_COUNT]:
+        with open (path, 'rb') as slotFile, open (path.replace(".u2cc", ".u2ci"), 'rb') as slotInvFile:
+            slotPairs.append((slotFile.read(), slotInvFile.read()))
+    def run():
+        for garage in (MY_CARS, CAREER):
+            for i in range(profile.slotCount(garage)):
+                slotData, slotInvData = slotPairs[i % len(slotPairs)]
+                profile.importSlot(garage, i, slotData, slotInvData)
+            profile.moveSlot(garage, 0, profile.slotCount(garage) - 1)
+            profile.moveSlot(garage, profile.slotCount(garage) - 1, 0)
+            for i in range(profile.slotCount(garage)):
+                profile.clearSlot(garage, i)
+    return run
+
+@benchmark
+def importPresets(corpus, scratch):
+    profile = memphisrider.Profile.open(corpus["profiles"][0])
+    presets = []
+    for path in corpus["presets"]:
+        with open (path, 'rb') as presetFile:
+            presets.append(presetFile.read())
+    def run():
+        for number, presetData in enumerate(presets):
+            preset = memphisrider.readPreset(presetData)
+            profile.importPreset(MY_CARS, number % memphisrider.MY_CARS_COUNT, memphisrider.xnames[preset["xname"]], preset["data"], preset["perfLevel"])
+    return run
+
+## edit a few slots and save, both the dirty range write back and a full save as
+@benchmark
+def saveProfiles(corpus, scratch):
+    paths = []
+    for path in corpus["profiles"]:
+        paths.append(shutil.copy(path, scratch))
+    rng = random.Random(2)
+    def run():
+        for path in paths:
+            profile = memphisrider.Profile.open(path)
+            profile.importPreset(MY_CARS, rng.randrange(memphisrider.MY_CARS_COUNT), "0x13E5B272", randomBytes(rng, 748))
+            profile.clearSlot(CAREER, rng.randrange(memphisrider.CAREER_COUNT))
+            profile.save()
+            profile.saveAs(path + "_COPY")
+    return run
+
+## recording imports in a preset history that already holds 40000 entries
+@benchmark
+def recordHistory(corpus, scratch):
+    historyPath = os.path.join(scratch, "presetHistory.jsonl")
+    presetHistory = memphisrider.PresetHistory(historyPath, ())
+    presetHistory.recordMany((f"{i:032x}", f"PRESET{i}", "n/a", "n/a") for i in range(40000))
+    presetHistory.compact()
+    counter = [0]
+    def run():
+        for i in range(200):
+            counter[0] += 1
+            presetHistory.record(f"{counter[0]:032x}", f"RENAMED{counter[0]}", corpus["presets"][0], "2004-11-09 00:00:00")
+    return run
+
+@benchmark
+def loadHistory(corpus, scratch):
+    historyPath = os.path.join(scratch, "presetHistory.jsonl")
+    memphisrider.PresetHistory(historyPath, ()).recordMany((f"{i:032x}", f"PRESET{i}", "n/a", "n/a") for i in range(40000))
+    def run():
+        memphisrider.PresetHistory(historyPath, ()).load()
+    return run
+
+## re-scan of an unchanged preset/slot library
+@benchmark
+def rescanLibrary(corpus, scratch):
+    libraryIndex = memphisrider.LibraryIndex(os.path.join(scratch, "libraryIndex.json"))
+    folders = [os.path.dirname(corpus["presets"][0]), os.path.dirname(corpus["slots"][0])]
+    libraryIndex.scan(folders)
+    def run():
+        libraryIndex.scan(folders)
+    return run
+
+def runBenchmarks(names, corpus, repeat):
+    results = {}
+    for name in names:
+        with tempfile.TemporaryDirectory() as scratch:
+            run = benchmarks[name](corpus, scratch)
+            run()
+            timings = []
+            for i in range(repeat):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+        results[name] = {"median":statistics.median(timings), "min":min(timings), "runs":repeat}
+        print(f"{name:<20} {results[name]['median']*1000:10.3f} ms (min {results[name]['min']*1000:.3f} ms)")
+    return results
+
+## benchmarks slower than the baseline by more than threshold (0.2 = 20%), compared by median
+def findRegressions(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        baseResult = baseline.get("results", {}).get(name)
+        if baseResult and result["median"] > baseResult["median"] * (1 + threshold):
+            regressions.append((name, baseResult["median"], result["median"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MemphisRider core benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(benchmarks)})")
+    parser.add_argument("-o", "--output", default="benchmarkResults.json", help="JSON file to write the results to (default: %(default)s)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="timed runs per benchmark, the median is reported (default: %(default)s)")
+    parser.add_argument("--corpus", help="folder to generate the corpus in and keep, instead of a temporary one")
+    parser.add_argument("--profiles", type=int, default=20, help="number of synthetic profiles (default: %(default)s)")
+    parser.add_argument("--presets", type=int, default=500, help="number of synthetic presets (default: %(default)s)")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown against the baseline (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    names = args.names or list(benchmarks)
+    for name in names:
+        if name not in benchmarks:
+            parser.error(f'unknown benchmark "{name}"')
+
+    with tempfile.TemporaryDirectory() as corpusFolder:
+        corpus = generateCorpus(args.corpus or corpusFolder, args.profiles, args.presets)
+        results = runBenchmarks(names, corpus, args.repeat)
+
+    with open (args.output, 'w') as resultsFile:
+        json.dump({"python":platform.python_version(), "platform":platform.platform(), "date":time.strftime("%Y-%m-%d %H:%M:%S"),
+                   "corpus":{"profiles":args.profiles, "presets":args.presets}, "results":results}, resultsFile, indent=4)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open (args.baseline, 'r') as baselineFile:
+            baseline = json.load(baselineFile)
+        regressions = findRegressions(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION  {name}: {before*1000:.3f} ms -> {after*1000:.3f} ms (+{(after/before - 1)*100:.0f}%)")
+        if regressions:
+            return 1
+        print(f"No regressions above {args.threshold*100:.0f}% against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+## MemphisRider core library, usable without Tk for scripting and batch jobs
+
+from memphisrider.core import (PROFILE_SIZE, MY_CARS, CAREER,
+                               MY_CARS_OFFSET, MY_CARS_SLOT_SIZE, MY_CARS_COUNT,
+                               CAREER_OFFSET, CAREER_SLOT_SIZE, CAREER_INV_SIZE, CAREER_STRIDE, CAREER_COUNT,
+                               CAREER_ID_OFFSET, MY_CARS_ID_OFFSET, PROFILE_NAME_OFFSET, PROFILE_NAME_SIZE,
+                               PRESET_HEADER_SIZE, PRESET_SIZE,
+                               xnames, perfLevels, ProfileError, Profile, Garage, CarSlot, XnameIndex,
+                               hashString, formatXnameHash, checkSlotXname, slotId,
+                               slotRegion, writePlan, readPreset, buildPreset)
+from memphisrider.history import HistoryError, PresetHistory
+from memphisrider.settings import SettingsError, SettingsStore
+from memphisrider.library import LibraryError, LibraryIndex
+from memphisrider.serialized import XnameMatcher, xnameMatcher, isSerializedPreset, renameXname, renameXnameFile
+from memphisrider.backup import readDeltas, restoreDeltas
+from memphisrider.undo import UndoHistory
+from memphisrider.sorting import sortKeys, loadCustomOrder, sortOrder, sortGarage
+from memphisrider.diff import diffSlot, diffProfiles, mergeProfiles
+from memphisrider.archive import ArchiveError, Archive, packArchive, importEntry
+from memphisrider.compress import CompressError, Compressor, defaultCompressor, unpackData, readFile, trainDictionary
+from memphisrider.writer import BackgroundWriter
@@ -0,0 +1,210 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+## command line entry point for the headless tools, run as "python -m memphisrider <command>" or "MemphisRider.py <command>"
+
+import argparse
+import multiprocessing
+import sys
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="MemphisRider", description="Headless NFSU2 profile garage tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batchParser = commands.add_parser("batch", help="run a JSON manifest of garage operations over many profiles")
+    batchParser.add_argument("manifest", help="JSON manifest with the operations to run")
+    batchParser.add_argument("profiles", nargs="*", help="profile files or folders, overrides the manifest's profile list")
+    batchParser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    batchParser.add_argument("-n", "--dry-run", action="store_true", help="run the operations without writing anything")
+    batchParser.add_argument("--mmap", action="store_true", help="edit profiles in place through a memory map, only flushing the changed ranges")
+    batchParser.add_argument("--backup", action="store_true", help="keep delta backups of the profiles so the batch can be undone with the restore command")
+    batchParser.add_argument("--compress-backups", action="store_true", help="compress the delta backups (with the app's dictionary, if there is one)")
+    batchParser.add_argument("-v", "--verbose", action="store_true", help="also list successfully processed profiles")
+
+    crackParser = commands.add_parser("crack", help="guess XNAMEs of unknown car hashes from word lists and name patterns")
+    crackParser.add_argument("paths", nargs="*", help="profiles, .u2cc slot files, .bin presets or folders to collect unknown car hashes from")
+    crackParser.add_argument("-w", "--wordlist", action="append", help="file with one candidate XNAME per line (can be given more than once)")
+    crackParser.add_argument("-p", "--pattern", action="append", help='candidate pattern like "[MAZDA|@brands.txt][|_][RX{1-9}][|_BASE]" (can be given more than once)')
+    crackParser.add_argument("--hash", action="append", help="extra unknown hash as shown in the app, e.g. 0x13E5B272")
+    crackParser.add_argument("--user-xnames", help="user XNAME list to check against and add matches to (default: the app's)")
+    crackParser.add_argument("-n", "--dry-run", action="store_true", help="only print matches, don't add them to the user XNAME list")
+
+    indexParser = commands.add_parser("index", help="index the presets and slot files in folders, only reading files that changed")
+    indexParser.add_argument("folders", nargs="+", help="folders with .bin presets and .u2cc/.u2ci slot files")
+    indexParser.add_argument("--index", default="MemphisRider_libraryIndex.json", help="index file to update (default: %(default)s)")
+    indexParser.add_argument("-j", "--workers", type=int, default=None, help="number of reader threads")
+
+    serializedParser = commands.add_parser("serialized-xname", help="change the car (XNAME) of serialized Binary presets")
+    serializedParser.add_argument("paths", nargs="+", help="serialized .bin presets or folders of them")
+    serializedParser.add_argument("-x", "--xname", required=True, help="new XNAME")
+    serializedParser.add_argument("--only", help="only change presets of this XNAME")
+    serializedParser.add_argument("-o", "--output", help="folder to write the changed presets to")
+    serializedParser.add_argument("--in-place", action="store_true", help="overwrite the presets instead")
+
+    restoreParser = commands.add_parser("restore", help="undo saves of a profile from its delta backups")
+    restoreParser.add_argument("profile", help="profile file")
+    restoreParser.add_argument("-n", "--steps", type=int, default=1, help="number of saves to undo (default: %(default)s)")
+    restoreParser.add_argument("-l", "--list", action="store_true", help="list the saves that can be undone instead")
+    restoreParser.add_argument("-f", "--force", action="store_true", help="undo even if the profile was changed after the save")
+    restoreParser.add_argument("-d", "--dictionary", help="compression dictionary the backups were saved with (default: the app's)")
+
+    compressParser = commands.add_parser("compress", help="compress presets and slot files with a trained dictionary, or train one")
+    compressActions = compressParser.add_subparsers(dest="action", required=True)
+    compressTrainParser = compressActions.add_parser("train", help="build a compression dictionary from a library of presets and slots")
+    compressTrainParser.add_argument("output", help="dictionary file to write, e.g. MemphisRider_dictionary.zdict")
+    compressTrainParser.add_argument("paths", nargs="+", help="preset and slot files or folders to learn from")
+    for action, actionHelp in (("pack", "compress preset and slot files in place"), ("unpack", "decompress preset and slot files in place")):
+        compressActionParser = compressActions.add_parser(action, help=actionHelp)
+        compressActionParser.add_argument("paths", nargs="+", help="preset and slot files or folders of them")
+        compressActionParser.add_argument("-d", "--dictionary", help="dictionary to use (default: the app's MemphisRider_dictionary.zdict, or none)")
+
+    diffParser = commands.add_parser("diff", help="list the slots and fields that differ between two profiles")
+    diffParser.add_argument("a", help="profile file, or folder of profiles paired with B's by file name")
+    diffParser.add_argument("b", help="profile file or folder")
+    diffParser.add_argument("--json", action="store_true", help="print the differences as JSON")
+
+    mergeParser = commands.add_parser("merge", help="three-way merge of two copies of a profile changed since a common backup")
+    mergeParser.add_argument("base", help="the common ancestor, e.g. the backup both copies were made from")
+    mergeParser.add_argument("ours", help="our copy, the merge is applied on top of it")
+    mergeParser.add_argument("theirs", help="their copy")
+    mergeParser.add_argument("-o", "--output", help="profile file to write the result to (default: overwrite ours, keeping a delta backup)")
+    mergeParser.add_argument("--prefer", choices=("ours", "theirs"), help="side to keep when both copies changed the same field")
+
+    fleetParser = commands.add_parser("fleet", help="car and slot statistics over many profiles at once (needs NumPy)")
+    fleetParser.add_argument("paths", nargs="*", help="profiles or folders of profiles")
+    fleetParser.add_argument("--open", help="use a fleet file written by --pack instead of reading the profiles")
+    fleetParser.add_argument("--pack", help="also write the profiles to one fleet file that --open can memory map later")
+    fleetParser.add_argument("--top", type=int, default=20, help="number of most used cars to list (default: %(default)s)")
+    fleetParser.add_argument("--json", action="store_true", help="print the statistics as JSON")
+
+    similarParser = commands.add_parser("similar", help="find presets and slots in the library index with nearly the same customization (needs NumPy)")
+    similarParser.add_argument("query", help="preset (.bin), slot file (.u2cc) or, with --slot, a profile")
+    similarParser.add_argument("--slot", type=int, help="slot of the profile to search for, counted from 1")
+    similarParser.add_argument("--garage", choices=("mycars", "career"), default="mycars", help="garage of --slot (default: %(default)s)")
+    similarParser.add_argument("-d", "--max-distance", type=int, default=8, help="most differing part fields (or bits with --bits) to list (default: %(default)s)")
+    similarParser.add_argument("-l", "--limit", type=int, default=20, help="most matches to list (default: %(default)s)")
+    similarParser.add_argument("--exact", action="store_true", help="compare against the whole library instead of the similarity buckets")
+    similarParser.add_argument("--bits", action="store_true", help="count differing bits instead of differing fields")
+    similarParser.add_argument("--index", default="MemphisRider_libraryIndex.json", help="library index to search (default: %(default)s)")
+    similarParser.add_argument("--similarity-index", default="MemphisRider_similarityIndex.npz", help="similarity index to update and use (default: %(default)s)")
+
+    archiveParser = commands.add_parser("archive", help="pack presets and slots into one indexed archive file, list, unpack or import from it")
+    archiveActions = archiveParser.add_subparsers(dest="action", required=True)
+    archivePackParser = archiveActions.add_parser("pack", help="pack .bin presets, .u2cc slots and .u2ci inventories into an archive")
+    archivePackParser.add_argument("archive", help="archive file to write (.mra)")
+    archivePackParser.add_argument("paths", nargs="+", help="files or folders to pack; files in folders keep their relative paths as names")
+    archiveUnpackParser = archiveActions.add_parser("unpack", help="write an archive's entries back out as files")
+    archiveUnpackParser.add_argument("archive", help="archive file")
+    archiveUnpackParser.add_argument("names", nargs="*", help="entries to unpack (default: all of them)")
+    archiveUnpackParser.add_argument("-o", "--output", default=".", help="folder to unpack to (default: the current folder)")
+    archiveListParser = archiveActions.add_parser("list", help="list an archive's entries, or look them up")
+    archiveListParser.add_argument("archive", help="archive file")
+    archiveListParser.add_argument("--name", help="only the entry with this name")
+    archiveListParser.add_argument("--fingerprint", help="only entries with this visual data fingerprint")
+    archiveListParser.add_argument("--xname", help="only entries for this car (XNAME or 0x... hash)")
+    archiveImportParser = archiveActions.add_parser("import", help="import an archive entry into a profile slot")
+    archiveImportParser.add_argument("archive", help="archive file")
+    archiveImportParser.add_argument("name", help="entry to import, e.g. presets/SUPRA_LEAGUE.bin")
+    archiveImportParser.add_argument("profile", help="profile file, saved with a delta backup")
+    archiveImportParser.add_argument("--slot", type=int, required=True, help="slot to import to, counted from 1")
+    archiveImportParser.add_argument("--garage", choices=("mycars", "career"), default="mycars", help="garage of the slot (default: %(default)s)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "batch":
+        from memphisrider import batch
+        try:
+            return batch.main(args)
+        except (batch.ManifestError, OSError) as batchError:
+            print(f"Error: {batchError}", file=sys.stderr)
+            return 2
+    if args.command == "index":
+        from memphisrider import library
+        try:
+            return library.main(args)
+        except (library.LibraryError, OSError) as libraryError:
+            print(f"Error: {libraryError}", file=sys.stderr)
+            return 2
+    if args.command == "serialized-xname":
+        from memphisrider import serialized
+        from memphisrider.batch import ManifestError
+        try:
+            return serialized.main(args)
+        except (serialized.ProfileError, ManifestError, OSError) as serializedError:
+            print(f"Error: {serializedError}", file=sys.stderr)
+            return 2
+    if args.command == "restore":
+        from memphisrider import backup
+        try:
+            return backup.main(args)
+        except (backup.ProfileError, OSError) as restoreError:
+            print(f"Error: {restoreError}", file=sys.stderr)
+            return 2
+    if args.command == "crack":
+        from memphisrider import crack
+        from memphisrider.batch import ManifestError
+        try:
+            return crack.main(args)
+        except (crack.CrackError, ManifestError, OSError) as crackError:
+            print(f"Error: {crackError}", file=sys.stderr)
+            return 2
+    if args.command in ("diff", "merge"):
+        from memphisrider import diff
+        try:
+            return diff.mainDiff(args) if args.command == "diff" else diff.mainMerge(args)
+        except (diff.ProfileError, OSError) as diffError:
+            print(f"Error: {diffError}", file=sys.stderr)
+            return 2
+    if args.command == "fleet":
+        from memphisrider import fleet
+        try:
+            return fleet.main(args)
+        except (fleet.FleetError, ValueError, OSError) as fleetError:
+            print(f"Error: {fleetError}", file=sys.stderr)
+            return 2
+    if args.command == "similar":
+        from memphisrider import similar
+        from memphisrider.library import LibraryError
+        try:
+            return similar.main(args)
+        except (similar.SimilarityError, similar.ProfileError, LibraryError, OSError) as similarError:
+            print(f"Error: {similarError}", file=sys.stderr)
+            return 2
+    if args.command == "archive":
+        from memphisrider import archive
+        try:
+            return archive.main(args)
+        except (archive.ArchiveError, archive.ProfileError, OSError) as archiveError:
+            print(f"Error: {archiveError}", file=sys.stderr)
+            return 2
+    if args.command == "compress":
+        from memphisrider import compress
+        try:
+            return compress.main(args)
+        except (compress.CompressError, OSError) as compressError:
+            print(f"Error: {compressError}", file=sys.stderr)
+            return 2
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,337 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## MemphisRider archives (.mra): many presets, slots and career inventories packed into one file, read through a memory map.
+##
+##     header      64 bytes, see archiveHeader
+##     records     the files' data, each starting on a 4 byte boundary
+##     index       one 48 byte entry per file (see indexEntry), sorted by name
+##     orders      entry numbers (uint32) sorted by fingerprint, then entry numbers sorted by XNAME hash
+##     names       the names the index entries point into, UTF-8, relative paths with / separators
+##
+## opening an archive only reads the header; entries are found by binary search over the mapped index and their data is
+## returned as memoryviews of the map, so nothing is copied. a slot entry links to its career inventory entry (a .u2ci next to
+## the .u2cc when packing), so importing one never has to look for a second file
+
+import hashlib
+import mmap
+import os
+import struct
+
+from memphisrider.core import (MY_CARS_SLOT_SIZE, CAREER, CAREER_INV_SIZE, PRESET_SIZE, SLOT_XNAME, SLOT_VISUAL,
+                               ProfileError, hashString, readPreset, syncFolder)
+from memphisrider.compress import CompressError, unpackData
+
+ARCHIVE_MAGIC = b'MRAR'
+ARCHIVE_VERSION = 1
+
+## magic, version, flags, entry count, index, fingerprint order, XNAME order and name table offsets, name table size
+archiveHeader = struct.Struct('<4sHHIQQQQQ12x')
+## fingerprint (MD5 digest), data offset, data size, name offset and length, kind, reserved, XNAME hash, inventory entry
+indexEntry = struct.Struct('<16sQIIHBBII4x')
+entryNumber = struct.Struct('<I')
+
+KIND_PRESET = 1
+KIND_SLOT = 2
+KIND_INVENTORY = 3
+kindNames = {KIND_PRESET:"preset", KIND_SLOT:"slot", KIND_INVENTORY:"inventory"}
+
+NO_INVENTORY = 0xFFFFFFFF
+
+## raised when an archive can't be written or read
+class ArchiveError(Exception):
+    pass
+
+class ArchiveEntry:
+    __slots__ = ('number', 'name', 'kind', 'fingerprint', 'xnameHash', 'offset', 'size', 'inventory')
+
+    def __init__(self, number, name, kind, fingerprint, xnameHash, offset, size, inventory):
+        self.number = number
+        self.name = name
+        self.kind = kind
+        self.fingerprint = fingerprint
+        self.xnameHash = xnameHash
+        self.offset = offset
+        self.size = size
+        self.inventory = inventory
+
+    ## the XNAME hash as stored in the XNAME lists, e.g. 0x13E5B272
+    def xnameHashStr(self):
+        return f"{self.xnameHash:#010x}".upper().replace("0X", "0x")
+
+## kind, fingerprint and XNAME hash of a file's data, None for files that can't go into an archive (e.g. serialized presets)
+def describeFile(name, data):
+    extension = os.path.splitext(name)[1].lower()
+    if extension == ".bin" and len(data) == PRESET_SIZE:
+        preset = readPreset(data)
+        return KIND_PRESET, hashlib.md5(preset["data"]).digest(), int(hashString(preset["xname"]), 16)
+    if extension == ".u2cc" and len(data) == MY_CARS_SLOT_SIZE:
+        return KIND_SLOT, hashlib.md5(data[SLOT_VISUAL]).digest(), int.from_bytes(data[SLOT_XNAME], 'big')
+    if extension == ".u2ci" and len(data) == CAREER_INV_SIZE:
+        return KIND_INVENTORY, hashlib.md5(data).digest(), 0
+    return None
+
+## (archive name, path) of the files to pack: files in folders are named by their path relative to the folder
+def archiveSources(paths):
+    sources = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, fileNames in os.walk(path):
+                for fileName in fileNames:
+                    filePath = os.path.join(root, fileName)
+                    sources.setdefault(os.path.relpath(filePath, path).replace(os.sep, '/'), filePath)
+        else:
+            sources.setdefault(os.path.basename(path), path)
+    return sources
+
+## packs presets (.bin), slots (.u2cc) and inventories (.u2ci) from files and folders into one archive at outPath;
+## returns (packed, skipped) file counts
+def packArchive(outPath, paths):
+    entries = []
+    skipped = 0
+    for name, path in sorted(archiveSources(paths).items(), key=lambda source: source[0].encode('utf-8')):
+        with open (path, 'rb') as sourceFile:
+            data = sourceFile.read(PRESET_SIZE + MY_CARS_SLOT_SIZE)
+        ## compressed presets and slots are stored as they are uncompressed, so they can be read without copies
+        try:
+            data = unpackData(data)
+        except CompressError as compressError:
+            raise ArchiveError(f"{path}: {compressError}")
+        description = describeFile(name, data)
+        if description is None:
+            skipped += 1
+            continue
+        entries.append((name.encode('utf-8'), data) + description)
+
+    numbers = {entry[0]: number for number, entry in enumerate(entries)}
+    records = bytearray()
+    index = bytearray()
+    names = bytearray()
+    dataStart = archiveHeader.size
+    for name, data, kind, fingerprint, xnameHash in entries:
+        inventory = NO_INVENTORY
+        if kind == KIND_SLOT:
+            inventory = numbers.get(os.path.splitext(name)[0] + b'.u2ci', NO_INVENTORY)
+        index += indexEntry.pack(fingerprint, dataStart + len(records), len(data), len(names), len(name), kind, 0, xnameHash, inventory)
+        names += name
+        records += data
+        records += bytes(-len(records) % 4)
+
+    fingerprintOrder = sorted(range(len(entries)), key=lambda number: entries[number][3])
+    xnameOrder = sorted(range(len(entries)), key=lambda number: (entries[number][4], entries[number][0]))
+    indexOffset = dataStart + len(records)
+    fingerprintOffset = indexOffset + len(index)
+    xnameOffset = fingerprintOffset + 4*len(entries)
+    namesOffset = xnameOffset + 4*len(entries)
+    header = archiveHeader.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0, len(entries), indexOffset, fingerprintOffset, xnameOffset,
+                                namesOffset, len(names))
+
+    tempPath = outPath + ".tmp"
+    with open (tempPath, 'wb') as archiveFile:
+        for part in (header, records, index, struct.pack(f'<{len(entries)}I', *fingerprintOrder),
+                     struct.pack(f'<{len(entries)}I', *xnameOrder), names):
+            archiveFile.write(part)
+        archiveFile.flush()
+        os.fsync(archiveFile.fileno())
+    os.replace(tempPath, outPath)
+    syncFolder(outPath)
+    return len(entries), skipped
+
+class Archive:
+    def __init__(self, path):
+        self.path = path
+        with open (path, 'rb') as archiveFile:
+            if os.fstat(archiveFile.fileno()).st_size < archiveHeader.size:
+                raise ArchiveError(f'{path} is not a MemphisRider archive')
+            self.mapped = mmap.mmap(archiveFile.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mapped)
+        (magic, version, flags, self.count, self.indexOffset, self.fingerprintOffset, self.xnameOffset, self.namesOffset,
+         namesSize) = archiveHeader.unpack_from(self.mapped, 0)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            self.close()
+            raise ArchiveError(f'{path} is not a MemphisRider archive (or was made by a newer version)')
+        if (self.indexOffset + self.count*indexEntry.size > self.fingerprintOffset or self.fingerprintOffset + 4*self.count > self.xnameOffset
+                or self.xnameOffset + 4*self.count > self.namesOffset or self.namesOffset + namesSize > len(self.mapped)):
+            self.close()
+            raise ArchiveError(f'{path} is truncated or corrupted')
+
+    def close(self):
+        self.view.release()
+        self.mapped.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for number in range(self.count):
+            yield self.entry(number)
+
+    def entry(self, number):
+        fingerprint, offset, size, nameOffset, nameLength, kind, reserved, xnameHash, inventory = indexEntry.unpack_from(
+            self.mapped, self.indexOffset + number*indexEntry.size)
+        name = self.nameBytes(nameOffset, nameLength).decode('utf-8')
+        return ArchiveEntry(number, name, kind, fingerprint.hex(), xnameHash, offset, size, None if inventory == NO_INVENTORY else inventory)
+
+    def nameBytes(self, nameOffset, nameLength):
+        return bytes(self.view[self.namesOffset + nameOffset:self.namesOffset + nameOffset + nameLength])
+
+    ## name of an entry, without unpacking the rest of it
+    def entryName(self, number):
+        nameOffset, nameLength = struct.unpack_from('<IH', self.mapped, self.indexOffset + number*indexEntry.size + 28)
+        return self.nameBytes(nameOffset, nameLength)
+
+    ## the entry's data as a memoryview of the archive, valid until the archive is closed
+    def data(self, entry):
+        return self.view[entry.offset:entry.offset + entry.size]
+
+    ## number of the first of count entries (in the order stored at orderOffset, or the index order) whose key is >= target
+    def lowerBound(self, key, target, orderOffset=None):
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            number = middle if orderOffset is None else entryNumber.unpack_from(self.mapped, orderOffset + 4*middle)[0]
+            if key(number) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    ## entries from position start of an order while their key equals target
+    def matches(self, key, target, orderOffset):
+        found = []
+        position = self.lowerBound(key, target, orderOffset)
+        while position < self.count:
+            number = entryNumber.unpack_from(self.mapped, orderOffset + 4*position)[0]
+            if key(number) != target:
+                break
+            found.append(self.entry(number))
+            position += 1
+        return found
+
+    ## the entry with this name, or None
+    def find(self, name):
+        target = name.encode('utf-8')
+        number = self.lowerBound(self.entryName, target)
+        if number < self.count and self.entryName(number) == target:
+            return self.entry(number)
+        return None
+
+    ## entries with the given visual data fingerprint (hex MD5, as in the preset history and library index)
+    def findFingerprint(self, fingerprint):
+        fingerprintKey = lambda number: bytes(self.view[self.indexOffset + number*indexEntry.size:][:16])
+        try:
+            target = bytes.fromhex(fingerprint)
+        except ValueError:
+            raise ArchiveError(f'"{fingerprint}" is not a fingerprint')
+        return self.matches(fingerprintKey, target, self.fingerprintOffset)
+
+    ## entries for a car, by XNAME hash as in the XNAME lists (0x...) or by XNAME
+    def findXname(self, xname):
+        target = int(xname, 16) if xname.lower().startswith("0x") else int(hashString(xname), 16)
+        xnameKey = lambda number: struct.unpack_from('<I', self.mapped, self.indexOffset + number*indexEntry.size + 36)[0]
+        return self.matches(xnameKey, target, self.xnameOffset)
+
+    ## writes the entries (all of them, or the given names) back out as files under outFolder; returns the number written
+    def unpack(self, outFolder, names=None):
+        if names is None:
+            entries = list(self)
+        else:
+            entries = []
+            for name in names:
+                entry = self.find(name)
+                if entry is None:
+                    raise ArchiveError(f'{self.path} has no entry {name}')
+                entries.append(entry)
+        written = 0
+        for entry in entries:
+            parts = entry.name.split('/')
+            if entry.name.startswith('/') or '..' in parts or ':' in entry.name:
+                raise ArchiveError(f'Refusing to unpack {entry.name} outside of {outFolder}')
+            outPath = os.path.join(outFolder, *parts)
+            os.makedirs(os.path.dirname(outPath) or '.', exist_ok=True)
+            with open (outPath, 'wb') as outFile:
+                outFile.write(self.data(entry))
+            written += 1
+        return written
+
+## imports an archive entry into a profile slot, the way the app imports a preset or slot file; presets take their XNAME hash
+## and performance level from the entry, career slots bring their linked inventory along (if packed with one)
+def importEntry(profile, garage, index, archive, entry, perfLevel="auto"):
+    data = archive.data(entry)
+    if entry.kind == KIND_PRESET:
+        preset = readPreset(data)
+        level = preset["perfLevel"] if perfLevel == "auto" else None if perfLevel == "keep" else perfLevel
+        profile.importPreset(garage, index, entry.xnameHashStr(), preset["data"], level)
+    elif entry.kind == KIND_SLOT:
+        inventoryData = None
+        if garage == CAREER and entry.inventory is not None:
+            inventoryData = archive.data(archive.entry(entry.inventory))
+        profile.importSlot(garage, index, data, inventoryData)
+    else:
+        raise ProfileError(f'{entry.name} is a part inventory, import its slot (.u2cc) instead')
+
+def printEntries(entries, xnameIndex):
+    for entry in entries:
+        xname = xnameIndex.lookup(entry.xnameHash.to_bytes(4, 'big')) if entry.kind != KIND_INVENTORY else ''
+        print(f"{kindNames[entry.kind]:<10}{xname:<16}{entry.fingerprint}  {entry.name}")
+
+def main(args):
+    from memphisrider.batch import loadUserXnames
+    from memphisrider.core import XnameIndex, Profile, MY_CARS
+    if args.action == "pack":
+        packed, skipped = packArchive(args.archive, args.paths)
+        print(f"Packed {packed} files into {args.archive}" + (f", skipped {skipped} files that aren't unserialized presets, slots or inventories" if skipped else ""))
+        return 0
+    with Archive(args.archive) as archive:
+        if args.action == "unpack":
+            written = archive.unpack(args.output, args.names or None)
+            print(f"Unpacked {written} files to {args.output}")
+        elif args.action == "list":
+            xnameIndex = XnameIndex(loadUserXnames())
+            if args.name:
+                entry = archive.find(args.name)
+                entries = [entry] if entry is not None else []
+            elif args.fingerprint:
+                entries = archive.findFingerprint(args.fingerprint)
+            elif args.xname:
+                entries = archive.findXname(args.xname)
+            else:
+                entries = archive
+            printEntries(entries, xnameIndex)
+        elif args.action == "import":
+            entry = archive.find(args.name)
+            if entry is None:
+                raise ArchiveError(f'{args.archive} has no entry {args.name}')
+            garage = MY_CARS if args.garage == "mycars" else CAREER
+            with Profile.open(args.profile) as profile:
+                if not 1 <= args.slot <= profile.slotCount(garage):
+                    raise ProfileError(f"There is no slot {args.slot} in that garage")
+                importEntry(profile, garage, args.slot - 1, archive, entry)
+                profile.save(backup=True)
+            print(f"Imported {entry.name} to slot {args.slot} of {args.profile}")
+    return 0
@@ -0,0 +1,167 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## delta backups of profiles: instead of copying the whole profile before every save, the bytes a save is about to overwrite
+## are appended to <profile>.mrdelta, so each save can be undone later by writing them back.
+##
+## every record is b'MRDL', the record length, the save time, CRC32s of the whole profile before and after the save and the
+## number of ranges, followed by the ranges as offset, length and the old bytes. a record cut off by a crash is ignored, and
+## only the newest MAX_DELTAS records are kept. records saved with a compressor start with b'MRDZ' and have their ranges
+## compressed (see compress.py)
+
+import os
+import struct
+import time
+import zlib
+
+from memphisrider.core import PROFILE_SIZE, ProfileError, replaceFile, syncFolder
+from memphisrider.compress import CompressError, unpackData
+
+DELTA_MAGIC = b'MRDL'
+DELTA_COMPRESSED_MAGIC = b'MRDZ'
+DELTA_EXTENSION = ".mrdelta"
+MAX_DELTAS = 100
+
+recordHeader = struct.Struct('<4sIdIII')
+rangeHeader = struct.Struct('<II')
+
+def deltaPath(path):
+    return path + DELTA_EXTENSION
+
+def readProfileFile(path):
+    with open (path, 'rb') as profileFile:
+        data = profileFile.read()
+    if len(data) != PROFILE_SIZE:
+        raise ProfileError("Invalid profile file, please select another file")
+    return data
+
+def packRecord(saveTime, crcBefore, crcAfter, ranges, compressor=None):
+    rangeData = b''.join(rangeHeader.pack(offset, len(oldData)) + bytes(oldData) for offset, oldData in ranges)
+    magic = DELTA_MAGIC
+    if compressor is not None:
+        magic = DELTA_COMPRESSED_MAGIC
+        rangeData = compressor.compress(rangeData)
+    return recordHeader.pack(magic, recordHeader.size + len(rangeData), saveTime, crcBefore, crcAfter, len(ranges)) + rangeData
+
+## parses a delta file into a list of {"time", "crcBefore", "crcAfter", "ranges": [(offset, old bytes)], "compressed", "raw"},
+## oldest first; compressed records need the compressor they were saved with (the default one if not given)
+def readDeltas(path, compressor=None):
+    return [dict(record, ranges=recordRanges(path, record, compressor)) for record in parseDeltas(path)[0]]
+
+## the records without their ranges decoded (so no dictionary is needed), and how many bytes of the file are complete records
+def parseDeltas(path):
+    if not os.path.isfile(deltaPath(path)):
+        return [], 0
+    with open (deltaPath(path), 'rb') as deltaFile:
+        data = deltaFile.read()
+    records = []
+    position = 0
+    while position + recordHeader.size <= len(data):
+        magic, recordLength, saveTime, crcBefore, crcAfter, rangeCount = recordHeader.unpack_from(data, position)
+        if magic not in (DELTA_MAGIC, DELTA_COMPRESSED_MAGIC) or position + recordLength > len(data):
+            break
+        records.append({"time":saveTime, "crcBefore":crcBefore, "crcAfter":crcAfter, "ranges":None, "rangeCount":rangeCount,
+                        "compressed":magic == DELTA_COMPRESSED_MAGIC, "raw":data[position:position+recordLength]})
+        position += recordLength
+    return records, position
+
+## the (offset, old bytes) ranges of a record from parseDeltas
+def recordRanges(path, record, compressor=None):
+    rangeData = record["raw"][recordHeader.size:]
+    if record["compressed"]:
+        try:
+            rangeData = unpackData(rangeData, compressor)
+        except CompressError as compressError:
+            raise ProfileError(f"Can't read the delta backups of {path}: {compressError}")
+    ranges = []
+    rangePosition = 0
+    for i in range(record["rangeCount"]):
+        offset, length = rangeHeader.unpack_from(rangeData, rangePosition)
+        rangePosition += rangeHeader.size
+        ranges.append((offset, rangeData[rangePosition:rangePosition+length]))
+        rangePosition += length
+    return ranges
+
+## records keep the bytes they were read with, so compressed ones are written back as they are
+def writeDeltas(path, records):
+    if not records:
+        if os.path.isfile(deltaPath(path)):
+            os.remove(deltaPath(path))
+        return
+    deltaData = b''.join(record.get("raw") or packRecord(record["time"], record["crcBefore"], record["crcAfter"], record["ranges"])
+                         for record in records)
+    replaceFile(deltaPath(path), deltaData, [(0, len(deltaData))])
+
+## records the bytes of the profile at path that the write plan is about to replace with newData; synced before returning,
+## so the delta is on disk before the profile changes. with a compressor the record's ranges are stored compressed
+def addDelta(path, plan, newData, compressor=None):
+    oldData = readProfileFile(path)
+    savedData = bytearray(oldData)
+    ranges = []
+    for offset, length in plan:
+        ranges.append((offset, oldData[offset:offset+length]))
+        savedData[offset:offset+length] = newData[offset:offset+length]
+    record = packRecord(time.time(), zlib.crc32(oldData), zlib.crc32(savedData), ranges, compressor)
+    records, validLength = parseDeltas(path)
+    if os.path.isfile(deltaPath(path)) and os.path.getsize(deltaPath(path)) != validLength:
+        ## drop a record torn by an earlier crash so the new one stays readable
+        writeDeltas(path, records)
+    with open (deltaPath(path), 'ab') as deltaFile:
+        deltaFile.write(record)
+        deltaFile.flush()
+        os.fsync(deltaFile.fileno())
+    syncFolder(deltaPath(path))
+    if len(records) + 1 > MAX_DELTAS:
+        writeDeltas(path, parseDeltas(path)[0][-MAX_DELTAS:])
+
+## undoes the last steps saves of the profile at path by writing the recorded bytes back; refuses when the profile was changed
+## since (by the game, or by hand) unless force is set. returns the save times that were undone, newest first
+def restoreDeltas(path, steps=1, force=False, compressor=None):
+    records = parseDeltas(path)[0]
+    if steps < 1 or steps > len(records):
+        raise ProfileError(f"There are {len(records)} saves to undo for {path}")
+    data = bytearray(readProfileFile(path))
+    plan = []
+    for record in reversed(records[-steps:]):
+        if zlib.crc32(data) != record["crcAfter"] and not force:
+            raise ProfileError(f"{path} was changed after the save of {time.ctime(record['time'])}, use force to undo it anyway")
+        for offset, oldData in recordRanges(path, record, compressor):
+            data[offset:offset+len(oldData)] = oldData
+            plan.append((offset, len(oldData)))
+    replaceFile(path, data, plan, path)
+    writeDeltas(path, records[:-steps])
+    return [record["time"] for record in reversed(records[-steps:])]
+
+def main(args):
+    from memphisrider.compress import Compressor
+    compressor = Compressor.load(args.dictionary) if args.dictionary else None
+    if args.list:
+        records = readDeltas(args.profile, compressor)
+        for number, record in enumerate(reversed(records), 1):
+            changedBytes = sum(len(oldData) for offset, oldData in record["ranges"])
+            print(f"{number:3d}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record['time']))}  {len(record['ranges'])} ranges, {changedBytes} bytes")
+        if not records:
+            print(f"No delta backups for {args.profile}")
+        return 0
+    for saveTime in restoreDeltas(args.profile, args.steps, args.force, compressor):
+        print(f"Undid the save of {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(saveTime))}")
+    return 0
@@ -0,0 +1,357 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## batch garage operations over many profiles, driven by a JSON manifest like:
+##
+## {
+##     "profiles": ["league/profiles"],
+##     "operations": [
+##         {"op": "importPreset", "garage": "myCars", "slot": 3, "file": "presets/SUPRA_LEAGUE.bin", "perfLevel": "auto"},
+##         {"op": "importSlot", "garage": "career", "slot": 2, "file": "slots/rx8.u2cc"},
+##         {"op": "importSlot", "garage": "career", "slot": 3, "archive": "league.mra", "file": "slots/supra.u2cc"},
+##         {"op": "clearSlot", "garage": "myCars", "slot": 20},
+##         {"op": "moveSlot", "garage": "myCars", "slot": 5, "to": 1},
+##         {"op": "exportSlots", "garage": "all", "dir": "exports/{profile}", "compress": false},
+##         {"op": "sortSlots", "garage": "all", "key": "xname", "emptyLast": true}
+##     ]
+## }
+##
+## sortSlots keys are xname, presetName (from the app's preset history), custom (with an "orderFile" listing XNAMEs or preset
+## names, one per line) and none (only moves empty slots last); slots are numbered from 1 like in the app; profiles can be files or folders (every 54966 byte file in it is picked up);
+## each profile is processed in a worker process and only saved if every operation on it succeeded; with --mmap profiles are
+## edited in place through a memory map and only the touched ranges are flushed, but a failing operation can leave the
+## earlier operations on that profile applied
+
+import concurrent.futures
+import json
+import os
+
+from memphisrider.core import (PROFILE_SIZE, MY_CARS, CAREER, MY_CARS_COUNT, CAREER_COUNT,
+                               xnames, ProfileError, Profile, XnameIndex, readPreset)
+from memphisrider.history import HistoryError, PresetHistory
+from memphisrider.sorting import sortKeys, loadCustomOrder, sortGarage
+from memphisrider.archive import KIND_PRESET, KIND_SLOT, ArchiveError, Archive, importEntry
+from memphisrider.compress import CompressError, defaultCompressor, unpackData
+
+garageNames = {"myCars": MY_CARS, "career": CAREER}
+
+operationNames = ("importSlot", "importPreset", "clearSlot", "moveSlot", "exportSlots", "sortSlots")
+
+## defaults to the user XNAME list next to MemphisRider.py, the same one the app writes to
+userXnamesPath = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "MemphisRider_userXnames.json")
+presetHistoryPath = os.path.join(os.path.dirname(userXnamesPath), "MemphisRider_presetHistory.jsonl")
+
+## per worker process state, set up once by initWorker instead of being sent along with every profile
+workerOperations = []
+workerXnames = {}
+workerXnameIndex = None
+workerPresetHistory = None
+workerDryRun = False
+workerMapped = False
+workerBackup = False
+workerCompressor = None
+workerFileCache = {}
+workerArchives = {}
+
+## raised when a manifest can't be used
+class ManifestError(Exception):
+    pass
+
+## loads user XNAMEs in the same formats the app accepts
+def loadUserXnames(path=userXnamesPath):
+    if not os.path.isfile(path):
+        legacyPath = os.path.splitext(path)[0] + ".txt"
+        if not os.path.isfile(legacyPath):
+            return {}
+        path = legacyPath
+    with open (path, 'r') as userXnamesFile:
+        try:
+            return json.load(userXnamesFile)
+        except json.decoder.JSONDecodeError:
+            raise ManifestError(f'{path} is corrupted or misconfigured.')
+
+## checks operations and turns garage names and 1-based slot numbers into what Profile expects
+def parseOperations(operations, baseDir=''):
+    parsedOperations = []
+    for number, operation in enumerate(operations, 1):
+        op = operation.get("op")
+        if op not in operationNames:
+            raise ManifestError(f'Operation {number}: unknown operation "{op}", expected one of {", ".join(operationNames)}')
+        parsed = dict(operation)
+        garage = operation.get("garage", "all" if op in ("exportSlots", "sortSlots") else None)
+        if garage == "all" and op in ("exportSlots", "sortSlots"):
+            parsed["garages"] = [MY_CARS, CAREER]
+        elif garage in garageNames:
+            parsed["garages"] = [garageNames[garage]]
+        else:
+            raise ManifestError(f'Operation {number}: garage must be "myCars" or "career"')
+        slotCount = MY_CARS_COUNT if parsed["garages"] == [MY_CARS] else CAREER_COUNT
+        for key in ("slot", "to"):
+            if key in operation or (key == "slot" and op not in ("exportSlots", "sortSlots")):
+                if not isinstance(operation.get(key), int) or not 1 <= operation[key] <= slotCount:
+                    raise ManifestError(f'Operation {number}: "{key}" must be a slot number from 1 to {slotCount}')
+                parsed[key] = operation[key] - 1
+        if op == "moveSlot" and "to" not in parsed:
+            raise ManifestError(f'Operation {number}: moveSlot needs a "to" slot number')
+        if op in ("importSlot", "importPreset"):
+            if not operation.get("file"):
+                raise ManifestError(f'Operation {number}: {op} needs a "file"')
+            if operation.get("archive"):
+                parsed["archive"] = os.path.join(baseDir, operation["archive"])
+                parsed["file"] = operation["file"]
+            else:
+                parsed["file"] = os.path.join(baseDir, operation["file"])
+        if op == "exportSlots":
+            if not operation.get("dir"):
+                raise ManifestError(f'Operation {number}: exportSlots needs a "dir"')
+            parsed["dir"] = os.path.join(baseDir, operation["dir"])
+            parsed["compress"] = bool(operation.get("compress", False))
+        if op == "importPreset":
+            perfLevel = operation.get("perfLevel", "auto")
+            ## only real ints, true/false and 1.0 would pass as 1/0 and 1
+            if perfLevel not in ("auto", "keep") and (type(perfLevel) is not int or perfLevel not in (0, 1, 2, 3)):
+                raise ManifestError(f'Operation {number}: perfLevel must be "auto", "keep" or 0 to 3')
+            parsed["perfLevel"] = perfLevel
+        if op == "sortSlots":
+            if operation.get("key", "xname") not in sortKeys:
+                raise ManifestError(f'Operation {number}: key must be one of {", ".join(sortKeys)}')
+            parsed["key"] = operation.get("key", "xname")
+            parsed["emptyLast"] = bool(operation.get("emptyLast", True))
+            parsed["customOrder"] = []
+            if parsed["key"] == "custom":
+                if not operation.get("orderFile"):
+                    raise ManifestError(f'Operation {number}: the custom sort key needs an "orderFile"')
+                try:
+                    parsed["customOrder"] = loadCustomOrder(os.path.join(baseDir, operation["orderFile"]))
+                except OSError as orderError:
+                    raise ManifestError(f'Operation {number}: {orderError}')
+        parsedOperations.append(parsed)
+    return parsedOperations
+
+## expands profile files and folders into a sorted list of profile paths
+def findProfiles(paths):
+    profilePaths = []
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.stat().st_size == PROFILE_SIZE:
+                        profilePaths.append(entry.path)
+        else:
+            profilePaths.append(path)
+    return sorted(set(profilePaths))
+
+## reads files shared by many profiles (presets, slots) once per worker, decompressing them if they're compressed
+def readCached(path):
+    if path not in workerFileCache:
+        with open (path, 'rb') as cachedFile:
+            try:
+                workerFileCache[path] = unpackData(cachedFile.read())
+            except CompressError as compressError:
+                raise ProfileError(f"{path}: {compressError}")
+    return workerFileCache[path]
+
+## archives are opened (mapped) once per worker and kept open, entries are read straight from the map
+def openCachedArchive(path):
+    if path not in workerArchives:
+        try:
+            workerArchives[path] = Archive(path)
+        except ArchiveError as archiveError:
+            raise ProfileError(str(archiveError))
+    return workerArchives[path]
+
+def initWorker(operations, userXnames, dryRun, mapped=False, backup=False, compressBackups=False):
+    global workerOperations
+    global workerXnames
+    global workerXnameIndex
+    global workerPresetHistory
+    global workerDryRun
+    global workerMapped
+    global workerBackup
+    global workerCompressor
+    workerOperations = operations
+    workerXnames = dict(xnames)
+    workerXnames.update(userXnames)
+    workerXnameIndex = XnameIndex(userXnames)
+    workerPresetHistory = None
+    workerDryRun = dryRun
+    workerMapped = mapped and not dryRun
+    workerBackup = backup
+    workerCompressor = defaultCompressor() if compressBackups else None
+    workerFileCache.clear()
+    workerArchives.clear()
+
+## the preset history is only needed for sorting by preset name, so it's loaded on first use
+def loadWorkerPresetHistory():
+    global workerPresetHistory
+    if workerPresetHistory is None:
+        try:
+            workerPresetHistory = PresetHistory(presetHistoryPath, ()).load()
+        except HistoryError as historyError:
+            raise ProfileError(str(historyError))
+    return workerPresetHistory
+
+def runOperation(profile, operation, profileName):
+    op = operation["op"]
+    garage = operation["garages"][0]
+    if op in ("importSlot", "importPreset") and "archive" in operation:
+        archive = openCachedArchive(operation["archive"])
+        entry = archive.find(operation["file"])
+        if entry is None or entry.kind != (KIND_SLOT if op == "importSlot" else KIND_PRESET):
+            raise ProfileError(f'{operation["archive"]} has no {"slot" if op == "importSlot" else "preset"} {operation["file"]}')
+        importEntry(profile, garage, operation["slot"], archive, entry, operation.get("perfLevel", "auto"))
+        return f'imported {operation["file"]} from {os.path.basename(operation["archive"])} to slot {operation["slot"]+1}'
+    if op == "importSlot":
+        slotData = readCached(operation["file"])
+        slotInvData = None
+        slotInvPath = os.path.splitext(operation["file"])[0] + ".u2ci"
+        if garage == CAREER and os.path.isfile(slotInvPath):
+            slotInvData = readCached(slotInvPath)
+        profile.importSlot(garage, operation["slot"], slotData, slotInvData)
+        return f'imported {operation["file"]} to slot {operation["slot"]+1}'
+    if op == "importPreset":
+        preset = readPreset(readCached(operation["file"]))
+        if preset["xname"] not in workerXnames:
+            raise ProfileError(f'XNAME {preset["xname"]} of {operation["file"]} is unknown, add it to the user XNAME list first')
+        if operation["perfLevel"] == "auto":
+            perfLevel = preset["perfLevel"]
+        elif operation["perfLevel"] == "keep":
+            perfLevel = None
+        else:
+            perfLevel = operation["perfLevel"]
+        profile.importPreset(garage, operation["slot"], workerXnames[preset["xname"]], preset["data"], perfLevel)
+        return f'imported {operation["file"]} to slot {operation["slot"]+1}'
+    if op == "clearSlot":
+        profile.clearSlot(garage, operation["slot"])
+        return f'cleared slot {operation["slot"]+1}'
+    if op == "moveSlot":
+        profile.moveSlot(garage, operation["slot"], operation["to"])
+        return f'moved slot {operation["slot"]+1} to {operation["to"]+1}'
+    if op == "sortSlots":
+        presetHistory = {}
+        if operation["key"] in ("presetName", "custom"):
+            presetHistory = loadWorkerPresetHistory()
+        moved = []
+        for garage in operation["garages"]:
+            if sortGarage(profile, garage, operation["key"], operation["emptyLast"], workerXnameIndex, presetHistory, operation["customOrder"]):
+                moved.append("My Cars" if garage == MY_CARS else "Career")
+        return f'sorted {" and ".join(moved)} by {operation["key"]}' if moved else f'already sorted by {operation["key"]}'
+    if op == "exportSlots":
+        exportDir = operation["dir"].replace("{profile}", profileName)
+        exported = 0
+        for garage in operation["garages"]:
+            garagePrefix = "myCars" if garage == MY_CARS else "career"
+            slotIndexes = [operation["slot"]] if "slot" in operation else range(profile.slotCount(garage))
+            for i in slotIndexes:
+                if profile.isSlotEmpty(garage, i):
+                    continue
+                if not workerDryRun:
+                    os.makedirs(exportDir, exist_ok=True)
+                    slotSave = os.path.join(exportDir, f"{profileName}_{garagePrefix}{i+1:02d}.u2cc")
+                    slotData, slotInvData = profile.exportSlot(garage, i)
+                    if operation["compress"]:
+                        slotData = defaultCompressor().compress(slotData)
+                        slotInvData = defaultCompressor().compress(slotInvData) if slotInvData is not None else None
+                    with open (slotSave, 'wb') as slotSaveWrite:
+                        slotSaveWrite.write(slotData)
+                    if slotInvData is not None:
+                        with open (slotSave.replace(".u2cc", ".u2ci"), 'wb') as slotSaveInvWrite:
+                            slotSaveInvWrite.write(slotInvData)
+                exported += 1
+        return f'exported {exported} slots to {exportDir}'
+
+## runs every operation on one profile; returns (path, success, messages) so the parent can print the summary
+def processProfile(path):
+    messages = []
+    profileName = os.path.basename(path)
+    try:
+        if workerMapped:
+            profile = Profile.openMapped(path)
+        else:
+            profile = Profile.open(path)
+        with profile:
+            for operation in workerOperations:
+                messages.append(runOperation(profile, operation, profileName))
+            if profile.isDirty() and not workerDryRun:
+                profile.save(workerBackup, workerCompressor)
+    except (ProfileError, OSError) as profileError:
+        messages.append(str(profileError))
+        return path, False, messages
+    ## anything else (a malformed user XNAME hash, a bad archive entry...) fails this profile only, not the whole batch
+    except Exception as profileError:
+        messages.append(f'{type(profileError).__name__}: {profileError}')
+        return path, False, messages
+    return path, True, messages
+
+def loadManifest(manifestPath):
+    with open (manifestPath, 'r') as manifestFile:
+        try:
+            manifest = json.load(manifestFile)
+        except json.decoder.JSONDecodeError:
+            raise ManifestError(f'{manifestPath} is corrupted or misconfigured.')
+    if not isinstance(manifest.get("operations"), list) or not manifest["operations"]:
+        raise ManifestError(f'{manifestPath} has no operations.')
+    return manifest
+
+## user XNAME hashes are parsed by every worker's index as it starts, so a bad one is reported here instead of breaking the pool
+def checkUserXnames(userXnames):
+    for name, hashValue in userXnames.items():
+        try:
+            int(hashValue, 16)
+        except (TypeError, ValueError):
+            raise ManifestError(f'User XNAME {name} has an invalid hash "{hashValue}"')
+
+## runs a manifest over the given profiles with a process pool, yielding (path, success, messages) as profiles finish
+def runBatch(profilePaths, operations, userXnames={}, workers=None, dryRun=False, mapped=False, backup=False, compressBackups=False):
+    checkUserXnames(userXnames)
+    if workers == 1:
+        initWorker(operations, userXnames, dryRun, mapped, backup, compressBackups)
+        for path in profilePaths:
+            yield processProfile(path)
+        return
+    chunkSize = max(1, len(profilePaths) // ((workers or os.cpu_count() or 1) * 8))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=initWorker, initargs=(operations, userXnames, dryRun, mapped, backup, compressBackups)) as executor:
+        yield from executor.map(processProfile, profilePaths, chunksize=chunkSize)
+
+def main(args):
+    ## mapped profiles are edited in place before save, so there's no point where the old bytes could be backed up
+    if args.mmap and (args.backup or args.compress_backups):
+        raise ManifestError("--mmap can't be combined with --backup or --compress-backups.")
+    manifest = loadManifest(args.manifest)
+    manifestDir = os.path.dirname(os.path.abspath(args.manifest))
+    operations = parseOperations(manifest["operations"], manifestDir)
+    profiles = args.profiles or [os.path.join(manifestDir, path) for path in manifest.get("profiles", [])]
+    profilePaths = findProfiles(profiles)
+    if not profilePaths:
+        raise ManifestError("No profiles to process.")
+    userXnames = loadUserXnames(manifest.get("userXnames", userXnamesPath))
+
+    failed = 0
+    for path, success, messages in runBatch(profilePaths, operations, userXnames, args.workers, args.dry_run, args.mmap, args.backup, args.compress_backups):
+        if success:
+            if args.verbose:
+                print(f'OK      {path}: {"; ".join(messages)}')
+        else:
+            failed += 1
+            print(f'FAILED  {path}: {messages[-1]}')
+    print(f'{len(profilePaths) - failed} of {len(profilePaths)} profiles processed successfully, {failed} failed{" (dry run, nothing written)" if args.dry_run else ""}')
+    return 1 if failed else 0
@@ -0,0 +1,184 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## optional compression of exported slots and presets and of delta backups. presets and slots are small and alike (the same
+## part hashes, zero padding, the 0x64 fill cleared slots get), so each one is deflated against a preset dictionary trained
+## on a library of them; without a dictionary lzma is used instead.
+##
+## a compressed file is b'MRZ', the method, the ID of the dictionary it needs (0 for none), the original size and the data.
+## readers call unpackData on whatever they read, which leaves uncompressed data alone
+
+import lzma
+import os
+import struct
+import zlib
+
+COMPRESSED_MAGIC = b'MRZ'
+DICTIONARY_PATH = "MemphisRider_dictionary.zdict"
+DICTIONARY_SIZE = 32768
+SEGMENT_SIZE = 8
+
+METHOD_STORED = 0
+METHOD_ZLIB = 1
+METHOD_LZMA = 2
+
+## magic, method, dictionary ID, original size
+compressedHeader = struct.Struct('<3sBII')
+
+lzmaFilters = [{"id":lzma.FILTER_LZMA2, "preset":9 | lzma.PRESET_EXTREME}]
+
+## raised when data can't be decompressed, e.g. because it needs another dictionary
+class CompressError(Exception):
+    pass
+
+def isCompressed(data):
+    return bytes(data[:3]) == COMPRESSED_MAGIC
+
+class Compressor:
+    def __init__(self, dictionary=None):
+        self.dictionary = bytes(dictionary) if dictionary else None
+        self.dictionaryId = zlib.adler32(self.dictionary) if self.dictionary else 0
+
+    @classmethod
+    def load(cls, path=DICTIONARY_PATH):
+        with open (path, 'rb') as dictionaryFile:
+            return cls(dictionaryFile.read())
+
+    def compress(self, data):
+        if self.dictionary:
+            deflater = zlib.compressobj(9, zlib.DEFLATED, -15, 9, zdict=self.dictionary)
+            method, packed = METHOD_ZLIB, deflater.compress(data) + deflater.flush()
+        else:
+            method, packed = METHOD_LZMA, lzma.compress(data, format=lzma.FORMAT_RAW, filters=lzmaFilters)
+        if len(packed) >= len(data):
+            method, packed = METHOD_STORED, bytes(data)
+        return compressedHeader.pack(COMPRESSED_MAGIC, method, self.dictionaryId if method == METHOD_ZLIB else 0, len(data)) + packed
+
+    def decompress(self, data):
+        if len(data) < compressedHeader.size or not isCompressed(data):
+            raise CompressError("Data is not compressed by MemphisRider")
+        magic, method, dictionaryId, size = compressedHeader.unpack_from(data, 0)
+        packed = bytes(data[compressedHeader.size:])
+        try:
+            if method == METHOD_STORED:
+                unpacked = packed
+            elif method == METHOD_ZLIB:
+                if dictionaryId != self.dictionaryId:
+                    raise CompressError(f"Data was compressed with another dictionary (ID {dictionaryId:08X}), load that dictionary first")
+                inflater = zlib.decompressobj(-15, zdict=self.dictionary) if self.dictionary else zlib.decompressobj(-15)
+                unpacked = inflater.decompress(packed) + inflater.flush()
+            elif method == METHOD_LZMA:
+                unpacked = lzma.decompress(packed, format=lzma.FORMAT_RAW, filters=lzmaFilters)
+            else:
+                raise CompressError(f"Unknown compression method {method}")
+        except (zlib.error, lzma.LZMAError):
+            raise CompressError("Compressed data is corrupted")
+        if len(unpacked) != size:
+            raise CompressError("Compressed data is corrupted")
+        return unpacked
+
+defaultCompressorCache = []
+
+## compressor with the dictionary next to MemphisRider.py (or none), loaded once
+def defaultCompressor():
+    if not defaultCompressorCache:
+        dictionaryPath = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), DICTIONARY_PATH)
+        defaultCompressorCache.append(Compressor.load(dictionaryPath) if os.path.isfile(dictionaryPath) else Compressor())
+    return defaultCompressorCache[0]
+
+## the data as it was before compression, or unchanged if it isn't compressed
+def unpackData(data, compressor=None):
+    if not isCompressed(data):
+        return data
+    return (compressor or defaultCompressor()).decompress(data)
+
+## reads a preset/slot file, decompressing it if needed
+def readFile(path, compressor=None):
+    with open (path, 'rb') as dataFile:
+        return unpackData(dataFile.read(), compressor)
+
+## builds a preset dictionary from sample files' data: the data is cut into SEGMENT_SIZE byte pieces (at 4 byte boundaries, the
+## part fields' alignment), and the pieces found in the most samples fill the dictionary. deflate finds matches at the end of the
+## dictionary most cheaply, so the most common pieces go last
+def trainDictionary(samples, size=DICTIONARY_SIZE):
+    counts = {}
+    for sample in samples:
+        segments = {bytes(sample[position:position+SEGMENT_SIZE]) for position in range(0, len(sample) - SEGMENT_SIZE + 1, 4)}
+        for segment in segments:
+            counts[segment] = counts.get(segment, 0) + 1
+    common = sorted((count, segment) for segment, count in counts.items() if count > 1)
+    picked = [segment for count, segment in common[-(size // SEGMENT_SIZE):]]
+    return b''.join(picked)
+
+## data of the presets, slots and inventories in files and folders, decompressed, for training
+def trainingSamples(paths, compressor=None):
+    extensions = (".bin", ".u2cc", ".u2ci")
+    for path in paths:
+        if os.path.isdir(path):
+            filePaths = [os.path.join(root, fileName) for root, dirs, fileNames in os.walk(path) for fileName in fileNames]
+        else:
+            filePaths = [path]
+        for filePath in filePaths:
+            if filePath.lower().endswith(extensions):
+                try:
+                    yield readFile(filePath, compressor)
+                except (CompressError, OSError):
+                    continue
+
+## compresses (or decompresses) files in place; returns (files changed, bytes before, bytes after)
+def convertFiles(paths, compressor, unpack=False):
+    changed = before = after = 0
+    extensions = (".bin", ".u2cc", ".u2ci")
+    for path in paths:
+        if os.path.isdir(path):
+            filePaths = [os.path.join(root, fileName) for root, dirs, fileNames in os.walk(path) for fileName in fileNames if fileName.lower().endswith(extensions)]
+        else:
+            filePaths = [path]
+        for filePath in filePaths:
+            with open (filePath, 'rb') as dataFile:
+                data = dataFile.read()
+            if isCompressed(data) != unpack:
+                continue
+            newData = compressor.decompress(data) if unpack else compressor.compress(data)
+            tempPath = filePath + ".tmp"
+            with open (tempPath, 'wb') as dataFile:
+                dataFile.write(newData)
+            os.replace(tempPath, filePath)
+            changed += 1
+            before += len(data)
+            after += len(newData)
+    return changed, before, after
+
+def main(args):
+    if args.action == "train":
+        dictionary = trainDictionary(trainingSamples(args.paths))
+        with open (args.output, 'wb') as dictionaryFile:
+            dictionaryFile.write(dictionary)
+        print(f"Wrote a {len(dictionary)} byte dictionary (ID {zlib.adler32(dictionary):08X}) to {args.output}")
+        return 0
+    compressor = Compressor.load(args.dictionary) if args.dictionary else defaultCompressor()
+    changed, before, after = convertFiles(args.paths, compressor, args.action == "unpack")
+    if changed:
+        print(f"{'Decompressed' if args.action == 'unpack' else 'Compressed'} {changed} files, {before} -> {after} bytes ({after / before:.1%})")
+    else:
+        print("Nothing to do")
+    return 0
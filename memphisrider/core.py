@@ -0,0 +1,748 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## headless profile (save game) handling, no Tk involved; all offsets are noted in decimal and documented in offsets.txt
+
+import contextlib
+import hashlib
+import mmap
+import os
+import struct
+
+from memphisrider.undo import UndoHistory
+
+## profile layout
+PROFILE_SIZE = 54966
+
+MY_CARS = 1
+CAREER = 2
+
+MY_CARS_OFFSET = 1196
+MY_CARS_SLOT_SIZE = 1072
+MY_CARS_COUNT = 20
+
+CAREER_OFFSET = 22636
+CAREER_SLOT_SIZE = 1072
+CAREER_INV_SIZE = 962
+CAREER_STRIDE = CAREER_SLOT_SIZE + CAREER_INV_SIZE
+CAREER_COUNT = 5
+
+CAREER_ID_OFFSET = 44415
+MY_CARS_ID_OFFSET = 50639
+PROFILE_NAME_OFFSET = 53797
+PROFILE_NAME_SIZE = 7
+
+## header fields tracked for dirty-range saves, besides the slots themselves
+headerFields = {
+    "careerId": (CAREER_ID_OFFSET, 4),
+    "myCarsId": (MY_CARS_ID_OFFSET, 4),
+    "profileName": (PROFILE_NAME_OFFSET, PROFILE_NAME_SIZE),
+    }
+
+## fallback ID written to the My Cars ID field when the garage is empty
+EMPTY_MY_CARS_ID = b'\x16\x1e\x9b\x95'
+
+## slot block layout
+SLOT_ENABLE = 8
+SLOT_SHOW = 12
+SLOT_XNAME = slice(24, 28)
+SLOT_VISUAL = slice(28, 776)
+SLOT_PERF = slice(788, 856)
+SLOT_PURCHASED = 1069
+
+## preset layout
+PRESET_HEADER_SIZE = 76
+PRESET_SIZE = 824
+PRESET_SPONSOR = b'\x40\x14\x43'
+PRESET_XNAME = 8
+PRESET_NAME = 40
+PRESET_PERF = 72
+
+xnames = {
+            "PEUGOT":"0x13E5B272",
+            "FOCUS": "0xDF04CA02",
+            "COROLLA":"0xEB137CF7",
+            "240SX":"0x80FB5001",
+            "MIATA":"0x6B5D4503",
+            "CIVIC":"0x4DC09002",
+            "PEUGOT106":"0x0A07104B",
+            "CORSA":"0xD7FA9302",
+            "HUMMER":"0x4DDD2661",
+            "NAVIGATOR":"0x4AC91902",
+            "ESCALADE":"0x714770CF",
+            "TIBURON":"0x2205FD04",
+            "SENTRA":"0xECBFAE79",
+            "CELICA":"0x60EC5A54",
+            "IS300":"0xEE360203",
+            "SUPRA":"0x8AC4B803",
+            "GOLF":"0x87301600",
+            "A3":"0x53040000",
+            "RSX":"0x7CDB0000",
+            "ECLIPSE":"0x84DA0275",
+            "TT":"0xE7060000",
+            "RX8":"0x01DC0000",
+            "350Z":"0xD1C60A00",
+            "G35":"0x6EA80000",
+            "3000GT":"0x5D9B7C2D",
+            "GTO":"0xC9AC0000",
+            "MUSTANGGT":"0x19581635",
+            "SKYLINE":"0x5E3748BE",
+            "LANCEREVO8":"0xF6EFD209",
+            "RX7":"0x00DC0000",
+            "IMPREZAWRX":"0xF85844CF",
+            "(empty)": "0x00000000"
+          }
+
+## performance part data written at 788-856 for each performance level (stock, level 1, 2 and 3)
+perfLevels = [bytes(b'\x00'*68),
+              bytes(b'\x01\x01\x00\x00\x00\x00\x01\x01\x01\x00\x00\x00\x01\x00\x00\x01\x01\x01\x01\x00\x00\x00\x00\x00\x00\x00\x01\x00\x00\x01\x01\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x00\x00\x00\x00\x01\x00\x00\x01\x01\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x00\x00\x00'),
+              bytes(b'\x01\x01\x01\x01\x00\x00\x01\x01\x00\x01\x01\x00\x00\x01\x00\x00\x01\x01\x01\x01\x01\x01\x00\x00\x00\x00\x00\x01\x00\x00\x01\x01\x01\x00\x00\x00\x01\x00\x00\x01\x00\x01\x01\x00\x00\x01\x01\x01\x01\x01\x01\x00\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00'),
+              bytes(b'\x01\x01\x01\x01\x01\x01\x01\x01\x00\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00\x01\x01\x01\x01\x01\x01\x01\x00\x00\x01\x00\x01\x00\x00\x00\x00\x01\x01\x01\x00\x01\x00\x00\x01\x01\x01\x01\x00\x01\x01\x01\x01\x01\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01\x00\x00\x01')]
+
+## raised when a profile, slot or preset file does not have the expected layout
+class ProfileError(Exception):
+    pass
+
+## gets hash from a string, thanks to TerminatorVasya for lending me his code
+def hashString(string):
+    if string is None:
+        return 0
+
+    result = -1
+
+    for char in string:
+        result = result * 0x21 + ord(char)
+    # Mask the result to keep only the last 4 bytes
+    result &= 0xFFFFFFFF
+
+    # Convert to bytes in little-endian order (reverse byte order)
+    reversed_bytes = result.to_bytes(4, byteorder='big')[::-1]
+
+    # Convert back to hexadecimal string
+    return ''.join(f"{byte:02X}" for byte in reversed_bytes)
+
+## formats a raw hash string as stored in the XNAME lists, e.g. 0x13E5B272
+def formatXnameHash(hashValue):
+    return f"{int(hashValue,16):#0{10}x}".upper().replace("0X","0x")
+
+## reverse index from the raw 4 byte XNAME hash (as an int) to the XNAME, built from the built-in list plus the user list;
+## built-in names win over user names with the same hash, and every clash is recorded in collisions
+class XnameIndex:
+    def __init__(self, userXnames={}):
+        self.rebuild(userXnames)
+
+    def rebuild(self, userXnames={}):
+        ## bumped on every change so slots can tell whether the name they cached is still current
+        self.version = getattr(self, 'version', 0) + 1
+        self.hashes = {}
+        ## hash of each user XNAME, to drop its old entry when it's added again with another hash
+        self.userHashes = {}
+        self.collisions = []
+        for name, hashValue in xnames.items():
+            self.hashes[int(hashValue,16)] = name
+        self.builtinHashes = set(self.hashes)
+        for name, hashValue in userXnames.items():
+            self.add(name, hashValue)
+
+    ## adds a user XNAME, returns the name it clashes with (if any) so callers can warn about it
+    def add(self, name, hashValue):
+        hashInt = int(hashValue,16)
+        oldHash = self.userHashes.get(name)
+        self.userHashes[name] = hashInt
+        renamed = oldHash is not None and oldHash != hashInt and oldHash not in self.builtinHashes and self.hashes.get(oldHash) == name
+        if renamed:
+            del self.hashes[oldHash]
+        existing = self.hashes.get(hashInt)
+        if existing is not None and existing != name:
+            self.collisions.append((formatXnameHash(hashValue), existing, name))
+            if renamed:
+                self.version += 1
+            return existing
+        self.hashes[hashInt] = name
+        self.version += 1
+        return None
+
+    ## returns the XNAME for a raw 4 byte slot hash, or the hash as 0x... if it isn't known
+    def lookup(self, slotHash):
+        hashInt = int.from_bytes(slotHash, 'big')
+        name = self.hashes.get(hashInt)
+        if name is None:
+            return f"0x{hashInt:08X}"
+        return name
+
+builtinXnameIndex = XnameIndex()
+
+## checks XNAME hashes passed through it against the built-in XNAME list and the user XNAME list (through their index), then returns the result
+def checkSlotXname(slot, xnameIndex=builtinXnameIndex):
+    return xnameIndex.lookup(slot)
+
+## builds the NNMC/MCNN or NNCR/CRNN slot ID pair for a slot index
+def slotId(garage, index):
+    if garage == MY_CARS:
+        return f"{index+1:02d}MC".encode('ascii') + f"MC{index+1:02d}".encode('ascii')
+    return f"{index+1:02d}CR".encode('ascii') + f"CR{index+1:02d}".encode('ascii')
+
+## strips a fixed-width preset string field down to the characters MemphisRider accepts
+def presetString(field):
+    string = ''
+    for c in bytes(field).decode('ascii', 'ignore'):
+        if c.isalnum() or c == "_":
+            string += c
+    return string
+
+## parses an unserialized Binary preset (.bin), returning its header fields and a view of the visual data
+def readPreset(data):
+    if len(data) < PRESET_SIZE:
+        raise ProfileError("Invalid preset file, please select a valid unserialized preset file.")
+    presetView = memoryview(data)
+    return {
+        "sponsor": bytes(presetView[0:3]) == PRESET_SPONSOR,
+        "xname": presetString(presetView[PRESET_XNAME:PRESET_XNAME+32]),
+        "presetName": presetString(presetView[PRESET_NAME:PRESET_NAME+32]),
+        "perfLevel": presetView[PRESET_PERF],
+        "data": presetView[PRESET_HEADER_SIZE:PRESET_SIZE],
+        }
+
+## builds an unserialized Binary preset (.bin) from a slot's visual data
+def buildPreset(xname, presetName, visualData, perfLevel=0, sponsor=False):
+    preset = bytearray(PRESET_SIZE)
+    if sponsor:
+        preset[0:3] = PRESET_SPONSOR
+    xnameBytes = xname.encode('ascii')[:32]
+    preset[PRESET_XNAME:PRESET_XNAME+len(xnameBytes)] = xnameBytes
+    nameBytes = presetName.upper().encode('ascii')[:32]
+    preset[PRESET_NAME:PRESET_NAME+len(nameBytes)] = nameBytes
+    preset[PRESET_PERF] = perfLevel
+    preset[PRESET_HEADER_SIZE:PRESET_SIZE] = visualData
+    return bytes(preset)
+
+## byte range of a slot block in the profile; career slots include their part inventory
+def slotRegion(garage, index):
+    if garage == MY_CARS:
+        return MY_CARS_OFFSET + index*MY_CARS_SLOT_SIZE, MY_CARS_SLOT_SIZE
+    return CAREER_OFFSET + index*CAREER_STRIDE, CAREER_STRIDE
+
+## byte range of a dirty region key: a (garage, index) slot, a header field name or a raw ("range", offset, length)
+def regionRange(region):
+    if region in headerFields:
+        return headerFields[region]
+    if region[0] == "range":
+        return region[1], region[2]
+    return slotRegion(*region)
+
+## sorted (offset, length) ranges covering the given regions, with touching or overlapping ranges merged into one write
+def writePlan(regions):
+    plan = []
+    for offset, length in sorted(regionRange(region) for region in regions):
+        if plan and offset <= plan[-1][0] + plan[-1][1]:
+            lastOffset, lastLength = plan[-1]
+            plan[-1] = (lastOffset, max(lastLength, offset + length - lastOffset))
+        else:
+            plan.append((offset, length))
+    return plan
+
+## copies a file, letting the kernel do it (or share the blocks on filesystems that support reflinks) through copy_file_range
+def cloneFile(sourcePath, destinationPath):
+    with open (sourcePath, 'rb') as sourceFile, open (destinationPath, 'wb') as destinationFile:
+        if hasattr(os, 'copy_file_range'):
+            try:
+                remaining = os.fstat(sourceFile.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(sourceFile.fileno(), destinationFile.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+            except OSError:
+                pass
+            sourceFile.seek(0)
+            destinationFile.seek(0)
+            destinationFile.truncate()
+        while True:
+            chunk = sourceFile.read(1 << 16)
+            if not chunk:
+                break
+            destinationFile.write(chunk)
+
+def writeAt(fd, data, offset):
+    if hasattr(os, 'pwrite'):
+        os.pwrite(fd, data, offset)
+    else:
+        os.lseek(fd, offset, os.SEEK_SET)
+        os.write(fd, data)
+
+## makes a rename durable on POSIX systems; Windows has no directory handles to sync
+def syncFolder(path):
+    if os.name != 'nt':
+        folderFd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(folderFd)
+        finally:
+            os.close(folderFd)
+
+## replaces path with a copy of sourcePath (or an empty file) that has the plan's ranges of data written over it; the copy is
+## synced before it's renamed over path, so a crash or a full disk leaves either the old or the new file, never a mix
+def replaceFile(path, data, plan, sourcePath=None):
+    tempPath = path + ".tmp"
+    try:
+        if sourcePath is not None:
+            cloneFile(sourcePath, tempPath)
+        openFlags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        if sourcePath is None:
+            openFlags |= os.O_TRUNC
+        tempFd = os.open(tempPath, openFlags, 0o666)
+        try:
+            for offset, length in plan:
+                writeAt(tempFd, data[offset:offset+length], offset)
+            os.fsync(tempFd)
+        finally:
+            os.close(tempFd)
+        if sourcePath is not None:
+            os.chmod(tempPath, os.stat(sourcePath).st_mode & 0o7777)
+        os.replace(tempPath, path)
+    except BaseException:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise
+    syncFolder(path)
+
+## writes the dirty regions of data over the profile at path, see Profile.save
+def writeProfile(path, data, dirtyRegions, backup=False, compressor=None):
+    plan = writePlan(dirtyRegions)
+    sourcePath = path
+    if not os.path.isfile(path) or os.path.getsize(path) != PROFILE_SIZE:
+        ## nothing usable to clone from, write everything
+        plan = [(0, PROFILE_SIZE)]
+        sourcePath = None
+    if backup and sourcePath is not None:
+        from memphisrider.backup import addDelta
+        addDelta(path, plan, data, compressor)
+    replaceFile(path, data, plan, sourcePath)
+
+## one slot of a garage: views of its 1072 byte block (and career inventory) in the profile buffer, plus the XNAME and
+## fingerprint worked out from it, cached until the slot's data changes
+class CarSlot:
+    __slots__ = ("index", "offset", "data", "inventory", "name", "nameKey", "fingerprint")
+
+    def __init__(self, view, garage, index):
+        self.index = index
+        self.offset, length = slotRegion(garage, index)
+        self.data = view[self.offset:self.offset+MY_CARS_SLOT_SIZE]
+        self.inventory = view[self.offset+MY_CARS_SLOT_SIZE:self.offset+length] if garage == CAREER else None
+        self.invalidate()
+
+    def invalidate(self):
+        self.name = None
+        self.nameKey = None
+        self.fingerprint = None
+
+    def caches(self):
+        return self.name, self.nameKey, self.fingerprint
+
+    def setCaches(self, caches):
+        self.name, self.nameKey, self.fingerprint = caches
+
+    def release(self):
+        self.data.release()
+        if self.inventory is not None:
+            self.inventory.release()
+
+## the slots of one garage; My Cars slots and career slots with their inventories are laid out back to back, so the garage is a
+## single contiguous range of the profile and moving slots around is plain slice assignment within it
+class Garage:
+    __slots__ = ("kind", "offset", "stride", "view", "slots")
+
+    def __init__(self, view, kind):
+        self.kind = kind
+        count = MY_CARS_COUNT if kind == MY_CARS else CAREER_COUNT
+        self.offset, self.stride = slotRegion(kind, 0)
+        self.view = view[self.offset:self.offset + self.stride*count]
+        self.slots = [CarSlot(view, kind, i) for i in range(count)]
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __getitem__(self, index):
+        return self.slots[index]
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    def block(self, index):
+        return self.view[index*self.stride:(index+1)*self.stride]
+
+    ## moves one slot to newIndex, shifting the ones in between by one; memoryview slice assignment copies overlapping ranges
+    ## like memmove, so only the moved slot needs a temporary copy
+    def move(self, index, newIndex):
+        stride = self.stride
+        movedSlot = bytes(self.block(index))
+        if newIndex > index:
+            self.view[index*stride:newIndex*stride] = self.view[(index+1)*stride:(newIndex+1)*stride]
+        else:
+            self.view[(newIndex+1)*stride:(index+1)*stride] = self.view[newIndex*stride:index*stride]
+        self.view[newIndex*stride:(newIndex+1)*stride] = movedSlot
+
+    ## slot i gets the block that was in slot order[i], with a single copy of the garage
+    def permute(self, order):
+        garageData = bytes(self.view)
+        stride = self.stride
+        for newIndex, oldIndex in enumerate(order):
+            if newIndex != oldIndex:
+                self.view[newIndex*stride:(newIndex+1)*stride] = garageData[oldIndex*stride:(oldIndex+1)*stride]
+
+    def release(self):
+        for slot in self.slots:
+            slot.release()
+        self.view.release()
+
+## a 54966 byte profile held in one buffer; slots and career inventories are memoryview windows into it, so reading them never copies.
+## the buffer is either a bytearray or, for profiles opened with openMapped, the memory-mapped file itself
+class Profile:
+    def __init__(self, data, path='', mapped=None):
+        if len(data) != PROFILE_SIZE:
+            raise ProfileError("Invalid profile file, please select another file")
+        self.path = path
+        self.mapped = mapped
+        if mapped is not None:
+            self.buffer = mapped
+        else:
+            self.buffer = bytearray(data)
+        self.view = memoryview(self.buffer)
+        self.dirtyRegions = set()
+        ## (garage, index) of the slots changed since the last takeChangedSlots()
+        self.changedSlots = set()
+        ## edits made inside change() can be undone; pendingChange holds the old bytes of every region the current change touched
+        self.undoHistory = UndoHistory()
+        self.pendingChange = None
+        self.garages = {MY_CARS:Garage(self.view, MY_CARS), CAREER:Garage(self.view, CAREER)}
+        ## plain views of the slot blocks, for code that only needs the bytes
+        self.myCarsSlots = [slot.data for slot in self.garages[MY_CARS]]
+        self.careerSlots = [slot.data for slot in self.garages[CAREER]]
+        self.careerInventories = [slot.inventory for slot in self.garages[CAREER]]
+
+    ## reads a profile from disk in a single read
+    @classmethod
+    def open(cls, path):
+        with open (path, 'rb') as profile:
+            data = profile.read()
+        return cls(data, path)
+
+    ## maps a profile file into memory so slot edits go straight into the file buffer; only the touched ranges are flushed on save.
+    ## edits may reach the file before save is called, so use open() when changes have to be discardable
+    @classmethod
+    def openMapped(cls, path):
+        with open (path, 'r+b') as profile:
+            if os.fstat(profile.fileno()).st_size != PROFILE_SIZE:
+                raise ProfileError("Invalid profile file, please select another file")
+            mapped = mmap.mmap(profile.fileno(), PROFILE_SIZE, access=mmap.ACCESS_WRITE)
+        return cls(mapped, path, mapped)
+
+    ## releases the slot views and, for mapped profiles, unmaps the file
+    def close(self):
+        for garage in self.garages.values():
+            garage.release()
+        self.view.release()
+        if self.mapped is not None:
+            self.mapped.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    ## dataChanged=False is for edits that leave the visual data alone (IDs, flags), so the slot keeps its cached fingerprint
+    def markDirty(self, region, dataChanged=True):
+        if self.pendingChange is not None and region not in self.pendingChange:
+            offset, length = regionRange(region)
+            self.pendingChange[region] = (offset, bytes(self.view[offset:offset+length]))
+        self.dirtyRegions.add(region)
+        if region in headerFields:
+            return
+        if region[0] in self.garages:
+            self.changedSlots.add(region)
+            if dataChanged:
+                self.garages[region[0]][region[1]].invalidate()
+        else:
+            offset, length = regionRange(region)
+            for garage in self.garages:
+                for index in range(len(self.garages[garage])):
+                    slotOffset, slotLength = slotRegion(garage, index)
+                    if slotOffset < offset + length and offset < slotOffset + slotLength:
+                        self.changedSlots.add((garage, index))
+                        if dataChanged:
+                            self.garages[garage][index].invalidate()
+
+    ## the slots changed since the last call, as (garage, index) pairs, so a UI can refresh just those
+    def takeChangedSlots(self):
+        changedSlots = self.changedSlots
+        self.changedSlots = set()
+        return changedSlots
+
+    ## groups the edits made inside the with block into one undo step, e.g.
+    ##     with profile.change("Import preset"):
+    ##         profile.importPreset(...)
+    ## nested changes are folded into the outer one
+    @contextlib.contextmanager
+    def change(self, label):
+        if self.pendingChange is not None:
+            yield
+            return
+        self.pendingChange = {}
+        try:
+            yield
+        finally:
+            oldRegions = self.pendingChange
+            self.pendingChange = None
+            self.undoHistory.record(label, oldRegions, self.view)
+
+    ## reverts the last change, returns its label or None if there was nothing to undo
+    def undo(self):
+        return self.undoHistory.undo(self.view, self.markDirty)
+
+    ## re-applies the last undone change, returns its label or None if there was nothing to redo
+    def redo(self):
+        return self.undoHistory.redo(self.view, self.markDirty)
+
+    ## True when there are changes that haven't been saved yet
+    def isDirty(self):
+        return bool(self.dirtyRegions)
+
+    def slots(self, garage):
+        if garage == MY_CARS:
+            return self.myCarsSlots
+        return self.careerSlots
+
+    def slotCount(self, garage):
+        if garage == MY_CARS:
+            return MY_CARS_COUNT
+        return CAREER_COUNT
+
+    def slotXnameHash(self, garage, index):
+        return self.slots(garage)[index][SLOT_XNAME]
+
+    def slotVisualData(self, garage, index):
+        return self.slots(garage)[index][SLOT_VISUAL]
+
+    ## resolves the XNAME of a slot, returns the raw 0x... hash for unknown cars
+    ## (cached per slot until the slot or the XNAME index changes)
+    def slotXname(self, garage, index, xnameIndex=builtinXnameIndex):
+        carSlot = self.garages[garage][index]
+        if carSlot.nameKey is None or carSlot.nameKey[0] is not xnameIndex or carSlot.nameKey[1] != xnameIndex.version:
+            carSlot.name = xnameIndex.lookup(carSlot.data[SLOT_XNAME])
+            carSlot.nameKey = (xnameIndex, xnameIndex.version)
+        return carSlot.name
+
+    ## MD5 hex digest of the slot's visual data (what the preset history is keyed by), cached until the slot changes
+    def slotFingerprint(self, garage, index):
+        carSlot = self.garages[garage][index]
+        if carSlot.fingerprint is None:
+            carSlot.fingerprint = hashlib.md5(carSlot.data[SLOT_VISUAL]).hexdigest()
+        return carSlot.fingerprint
+
+    ## forgets every cached XNAME and fingerprint
+    def clearSlotCaches(self):
+        for garage in self.garages.values():
+            for carSlot in garage:
+                carSlot.invalidate()
+
+    ## an empty slot has no car hash, which resolves to "(empty)"
+    def isSlotEmpty(self, garage, index):
+        return self.slotXnameHash(garage, index) == b'\x00\x00\x00\x00'
+
+    ## counts purchased career slots, the game needs at least one of them
+    def careerSlotCount(self):
+        return sum(1 for slot in self.careerSlots if slot[SLOT_PURCHASED] != 0)
+
+    ## returns a copy of the slot block (and inventory for career slots) for writing to .u2cc/.u2ci files
+    def exportSlot(self, garage, index):
+        if garage == MY_CARS:
+            return bytes(self.myCarsSlots[index]), None
+        return bytes(self.careerSlots[index]), bytes(self.careerInventories[index])
+
+    ## sets the slot's ID pair and visibility flags so the game picks it up
+    def enableSlot(self, garage, index):
+        slot = self.slots(garage)[index]
+        self.markDirty((garage, index), False)
+        slot[0:8] = slotId(garage, index)
+        slot[SLOT_ENABLE] = 1
+        if garage == MY_CARS:
+            slot[SLOT_SHOW] = 2
+        else:
+            slot[SLOT_SHOW] = 4
+            slot[SLOT_PURCHASED] = 1
+
+    ## imports slot data (and career inventory if given) in place; both are checked before anything is written
+    def importSlot(self, garage, index, slotData, inventoryData=None):
+        if len(slotData) != MY_CARS_SLOT_SIZE:
+            raise ProfileError("Invalid slot file, please select a valid .u2cc file.")
+        if garage == CAREER and inventoryData is not None and len(inventoryData) != CAREER_INV_SIZE:
+            raise ProfileError("Invalid part inventory file, please select a valid .u2ci file.")
+        self.markDirty((garage, index))
+        self.slots(garage)[index][:] = slotData
+        self.enableSlot(garage, index)
+        if garage == CAREER and inventoryData is not None:
+            self.careerInventories[index][:] = inventoryData
+
+    ## imports preset visual data to a slot; perfLevel None leaves the slot's performance data untouched
+    def importPreset(self, garage, index, xnameHash, presetData, perfLevel=None):
+        slot = self.slots(garage)[index]
+        self.markDirty((garage, index))
+        if perfLevel is not None:
+            slot[SLOT_PERF] = perfLevels[min(perfLevel, 3)]
+        slot[SLOT_XNAME] = struct.pack('>I', int(xnameHash,16))
+        slot[SLOT_VISUAL] = presetData
+        self.enableSlot(garage, index)
+
+    ## clears slot data, setting up default data to make slot usable again
+    def clearSlot(self, garage, index):
+        slot = self.slots(garage)[index]
+        self.markDirty((garage, index))
+        slot[:] = bytes(MY_CARS_SLOT_SIZE)
+        slot[SLOT_ENABLE] = 1
+        slot[856:1061] = b'\x64'*205
+        if garage == MY_CARS:
+            slot[SLOT_SHOW] = 2
+        else:
+            slot[SLOT_SHOW] = 4
+
+    ## swaps two slots (career inventories travel with their slot), then renumbers slot IDs
+    def swapSlots(self, garage, indexA, indexB):
+        order = list(range(self.slotCount(garage)))
+        order[indexA], order[indexB] = indexB, indexA
+        self.permuteSlots(garage, order)
+
+    ## moves a slot to newIndex, shifting the slots in between; returns False if there's nothing to move
+    def moveSlot(self, garage, index, newIndex):
+        if newIndex < 0 or newIndex >= self.slotCount(garage) or newIndex == index:
+            return False
+        slots = self.garages[garage]
+        caches = [carSlot.caches() for carSlot in slots]
+        for i in range(min(index, newIndex), max(index, newIndex) + 1):
+            self.markDirty((garage, i))
+        slots.move(index, newIndex)
+        caches.insert(newIndex, caches.pop(index))
+        for carSlot, slotCaches in zip(slots, caches):
+            carSlot.setCaches(slotCaches)
+        self.renumberSlots(garage)
+        return True
+
+    ## reorders a whole garage in one pass: slot i gets what was in slot order[i] (career inventories and cached XNAMEs and
+    ## fingerprints travel with their slot), then the slot IDs are renumbered once. returns False if the order changes nothing
+    def permuteSlots(self, garage, order):
+        order = list(order)
+        if sorted(order) != list(range(self.slotCount(garage))):
+            raise ProfileError(f"Slot order {order} is not a permutation of the garage's {self.slotCount(garage)} slots")
+        if order == sorted(order):
+            return False
+        slots = self.garages[garage]
+        caches = [carSlot.caches() for carSlot in slots]
+        for newIndex, oldIndex in enumerate(order):
+            if newIndex != oldIndex:
+                self.markDirty((garage, newIndex))
+        slots.permute(order)
+        for carSlot, oldIndex in zip(slots, order):
+            carSlot.setCaches(caches[oldIndex])
+        self.renumberSlots(garage)
+        return True
+
+    ## rewrites NNMC/MCNN or NNCR/CRNN IDs of every slot that has one to match its position
+    def renumberSlots(self, garage):
+        for i, slot in enumerate(self.slots(garage)):
+            if slot[0:4] != b'\x00\x00\x00\x00' and slot[0:8] != slotId(garage, i):
+                self.markDirty((garage, i), False)
+                slot[0:8] = slotId(garage, i)
+
+    ## first non-empty slot ID of a garage, shown in the game's main menu
+    def firstSlotId(self, garage):
+        for slot in self.slots(garage):
+            if slot[0:4] != b'\x00\x00\x00\x00':
+                return bytes(slot[0:4])
+        return None
+
+    ## sets a header field, marking it dirty only when its value changes
+    def setHeaderField(self, field, value):
+        offset, length = headerFields[field]
+        if self.view[offset:offset+length] != value:
+            self.markDirty(field)
+            self.view[offset:offset+length] = value
+
+    ## updates the My Cars and Career ID fields in the buffer
+    def updateIds(self):
+        myCarsId = self.firstSlotId(MY_CARS)
+        self.setHeaderField("myCarsId", myCarsId if myCarsId is not None else EMPTY_MY_CARS_ID)
+        careerId = self.firstSlotId(CAREER)
+        if careerId is not None:
+            self.setHeaderField("careerId", careerId)
+
+    ## profile name stored in the save itself, the game uses up to 7 characters of the file name
+    def profileName(self, path):
+        ## the game only shows ASCII names, others get ? in their place
+        nameBytes = os.path.split(path)[1][0:PROFILE_NAME_SIZE].encode('ascii', errors='replace')
+        return nameBytes + bytes(PROFILE_NAME_SIZE - len(nameBytes))
+
+    ## writes the slots and header fields changed since the last save back to the profile's own file. the changed ranges are
+    ## merged into one write plan and applied to a clone of the file, which then replaces it, so the profile on disk is never
+    ## half written; with backup=True the bytes the plan overwrites are first added to the profile's delta backup
+    ## (see memphisrider.backup). mapped profiles are already edited in place, so only the touched ranges are flushed, and
+    ## they can't be backed up
+    def save(self, backup=False, compressor=None):
+        if self.mapped is not None and backup:
+            raise ProfileError("Memory-mapped profiles can't keep delta backups.")
+        self.updateIds()
+        if self.mapped is not None:
+            for region in self.dirtyRegions:
+                offset, length = regionRange(region)
+                pageOffset = offset - offset % mmap.ALLOCATIONGRANULARITY
+                self.mapped.flush(pageOffset, offset + length - pageOffset)
+        elif self.dirtyRegions:
+            writeProfile(self.path, self.view, self.dirtyRegions, backup, compressor)
+        self.dirtyRegions.clear()
+
+    ## save() split in two for writing from another thread (see memphisrider.writer): the dirty regions and a copy of the
+    ## buffer are taken now, so later edits go into the next save, and the returned function does the file I/O. returns the
+    ## regions too, to be marked dirty again if the write fails
+    def prepareSave(self, backup=False, compressor=None):
+        if self.mapped is not None:
+            savedRegions = set(self.dirtyRegions)
+            self.save(backup)
+            return savedRegions, lambda: None
+        self.updateIds()
+        savedRegions = set(self.dirtyRegions)
+        self.dirtyRegions.clear()
+        if not savedRegions:
+            return savedRegions, lambda: None
+        data = bytes(self.view)
+        path = self.path
+        return savedRegions, lambda: writeProfile(path, data, savedRegions, backup, compressor)
+
+    ## saves the profile as another file, the opened profile keeps pointing to its own file
+    def saveAs(self, path):
+        self.prepareSaveAs(path)()
+
+    ## like prepareSave, for saveAs
+    def prepareSaveAs(self, path):
+        self.updateIds()
+        profileCopy = bytearray(self.buffer)
+        profileCopy[PROFILE_NAME_OFFSET:PROFILE_NAME_OFFSET+PROFILE_NAME_SIZE] = self.profileName(path)
+        return lambda: replaceFile(path, profileCopy, [(0, PROFILE_SIZE)])
@@ -0,0 +1,264 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## bulk XNAME guessing for add-on cars the XNAME lists don't know yet: hashes candidate names with the game's rolling string hash
+## (the same one as hashString) and matches them against every unresolved car hash found in profiles, slot files and presets.
+##
+## candidates come from word lists and/or patterns; a pattern is literal text and [...] groups of |-separated alternatives, where
+## an alternative can hold a {from-to} number range (zero-padded when written like {01-20}) or be @file to take every line of a file:
+##
+##     [MITSU|MAZDA|@brands.txt][|_][RX{1-9}|{100-999}][|_BASE|_TUNED]
+##
+## the hash is affine in its input, hash(prefix + part) = hash(prefix) * 0x21^len(part) + hash0(part) (mod 2^32), so every
+## alternative of a group is hashed once as a fixed-width uint8 array per length, and the candidate hashes of a pattern are
+## built by broadcasting prefix states against the group's alternatives instead of hashing each full string
+
+import json
+import os
+import re
+
+from memphisrider.core import PROFILE_SIZE, MY_CARS, CAREER, MY_CARS_SLOT_SIZE, PRESET_SIZE, Profile, ProfileError, XnameIndex, readPreset, formatXnameHash
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+## how many candidate hashes are built and matched at once
+CHUNK_SIZE = 1 << 22
+
+groupPattern = re.compile(r'\[([^\]]*)\]|([^\[]+)')
+rangePattern = re.compile(r'\{(\d+)-(\d+)\}')
+
+## raised when a pattern or word list can't be used
+class CrackError(Exception):
+    pass
+
+## hashes equal-length names given as an (N, length) uint8 array, starting from the given state(s); returns uint32 states
+def hashColumns(nameArray, start=0xFFFFFFFF):
+    result = numpy.full(nameArray.shape[0], start, dtype=numpy.uint32)
+    multiplier = numpy.uint32(0x21)
+    for column in nameArray.T:
+        result *= multiplier
+        result += column
+    return result
+
+## expands {from-to} ranges in one alternative
+def expandRanges(alternative):
+    match = rangePattern.search(alternative)
+    if match is None:
+        return [alternative]
+    first, last = match.group(1), match.group(2)
+    width = len(first) if first.startswith('0') and len(first) > 1 else 0
+    expanded = []
+    for number in range(int(first), int(last) + 1):
+        for rest in expandRanges(alternative[match.end():]):
+            expanded.append(f"{alternative[:match.start()]}{number:0{width}d}{rest}")
+    return expanded
+
+def readWordList(path):
+    with open (path, 'r', errors='replace') as wordListFile:
+        return [line.strip() for line in wordListFile if line.strip()]
+
+## turns a pattern into a list of groups, each a list of alternatives
+def parsePattern(pattern, baseDir=''):
+    groups = []
+    for match in groupPattern.finditer(pattern):
+        if match.group(2) is not None:
+            groups.append(expandRanges(match.group(2)))
+            continue
+        alternatives = []
+        for alternative in match.group(1).split('|'):
+            if alternative.startswith('@'):
+                alternatives.extend(readWordList(os.path.join(baseDir, alternative[1:])))
+            else:
+                alternatives.extend(expandRanges(alternative))
+        groups.append(alternatives)
+    if not groups or pattern.count('[') != pattern.count(']'):
+        raise CrackError(f'Invalid pattern "{pattern}"')
+    return groups
+
+## a group of alternatives split by length: [(length, indexes into the group, hash0 of each alternative)]
+class CandidateGroup:
+    def __init__(self, alternatives):
+        self.alternatives = [alternative.upper() for alternative in dict.fromkeys(alternatives) if alternative.isascii()]
+        byLength = {}
+        for index, alternative in enumerate(self.alternatives):
+            byLength.setdefault(len(alternative), []).append(index)
+        self.lengths = []
+        for length, indexes in sorted(byLength.items()):
+            nameData = ''.join(self.alternatives[i] for i in indexes).encode('ascii')
+            nameArray = numpy.frombuffer(nameData, dtype=numpy.uint8).reshape(len(indexes), length)
+            self.lengths.append((length, numpy.array(indexes, dtype=numpy.int64), hashColumns(nameArray, 0)))
+
+    def __len__(self):
+        return len(self.alternatives)
+
+## candidate hash states (uint32) and their candidate numbers for the prefix groups; the number is a mixed radix index into the groups
+def combine(states, ids, group):
+    newStates = []
+    newIds = []
+    for length, indexes, partHashes in group.lengths:
+        multiplier = numpy.uint32(pow(0x21, length, 1 << 32))
+        newStates.append((states[:, None] * multiplier + partHashes[None, :]).ravel())
+        newIds.append((ids[:, None] * len(group) + indexes[None, :]).ravel())
+    return numpy.concatenate(newStates), numpy.concatenate(newIds)
+
+## rebuilds the candidate name from its number
+def candidateName(groups, candidateId):
+    parts = []
+    for group in reversed(groups):
+        candidateId, index = divmod(int(candidateId), len(group))
+        parts.append(group.alternatives[index])
+    return ''.join(reversed(parts))
+
+## yields the full candidate states and numbers chunk by chunk: every group is combined with at most CHUNK_SIZE // len(group)
+## prefix states at a time, so no array grows past about CHUNK_SIZE entries (or one group's size) whatever the pattern
+def expandGroups(states, ids, groups):
+    if not groups:
+        yield states, ids
+        return
+    group = groups[0]
+    chunk = max(1, CHUNK_SIZE // len(group))
+    for start in range(0, len(states), chunk):
+        chunkStates, chunkIds = combine(states[start:start+chunk], ids[start:start+chunk], group)
+        yield from expandGroups(chunkStates, chunkIds, groups[1:])
+
+## hashes every candidate of a pattern (given as groups of alternatives) and yields (name, raw hash) for those in targets,
+## a set of raw 32 bit hash states; candidates are built in chunks (see expandGroups) so memory stays bounded
+def crackGroups(alternativeGroups, targets):
+    groups = [CandidateGroup(alternatives) for alternatives in alternativeGroups]
+    if not targets or any(len(group) == 0 for group in groups):
+        return
+    targetArray = numpy.array(sorted(targets), dtype=numpy.uint32)
+    states = numpy.array([0xFFFFFFFF], dtype=numpy.uint32)
+    ids = numpy.zeros(1, dtype=numpy.int64)
+    for chunkStates, chunkIds in expandGroups(states, ids, groups):
+        for match in numpy.flatnonzero(numpy.isin(chunkStates, targetArray)):
+            yield candidateName(groups, chunkIds[match]), int(chunkStates[match])
+
+## number of candidates a pattern expands to
+def candidateCount(alternativeGroups):
+    count = 1
+    for alternatives in alternativeGroups:
+        count *= len(set(alternatives))
+    return count
+
+## collects the raw car hashes (as slots store them) of profiles, .u2cc slot files and .bin presets under the given paths;
+## presets store the XNAME itself, so those names are returned as extra candidates
+def scanTargets(paths):
+    hashes = set()
+    presetXnames = set()
+    for path in paths:
+        if os.path.isdir(path):
+            filePaths = [os.path.join(root, fileName) for root, dirs, fileNames in os.walk(path) for fileName in fileNames]
+        else:
+            filePaths = [path]
+        for filePath in filePaths:
+            try:
+                fileSize = os.path.getsize(filePath)
+                if fileSize == PROFILE_SIZE:
+                    with Profile.open(filePath) as profile:
+                        for garage in (MY_CARS, CAREER):
+                            for i in range(profile.slotCount(garage)):
+                                hashes.add(bytes(profile.slotXnameHash(garage, i)))
+                elif fileSize == MY_CARS_SLOT_SIZE and filePath.lower().endswith(".u2cc"):
+                    with open (filePath, 'rb') as slotFile:
+                        hashes.add(slotFile.read()[24:28])
+                elif fileSize == PRESET_SIZE and filePath.lower().endswith(".bin"):
+                    with open (filePath, 'rb') as presetFile:
+                        presetXnames.add(readPreset(presetFile.read())["xname"])
+            except (ProfileError, OSError):
+                continue
+    hashes.discard(b'\x00\x00\x00\x00')
+    return hashes, presetXnames
+
+## hashes as slots store them, keeping the ones the index can't resolve, as raw 32 bit hash states
+def unresolvedHashes(slotHashes, xnameIndex):
+    return {int.from_bytes(slotHash, 'little') for slotHash in slotHashes if xnameIndex.lookup(slotHash).startswith("0x")}
+
+## runs word lists and patterns against the unresolved hashes; returns {raw hash state: [names]}
+def crack(targets, wordLists=(), patterns=(), extraNames=(), baseDir=''):
+    if numpy is None:
+        raise CrackError("XNAME cracking needs NumPy, install it with: pip install numpy")
+    matches = {}
+    jobs = []
+    names = list(extraNames)
+    for wordListPath in wordLists:
+        names.extend(readWordList(wordListPath))
+    if names:
+        jobs.append([names])
+    for pattern in patterns:
+        jobs.append(parsePattern(pattern, baseDir))
+    for groups in jobs:
+        for name, rawState in crackGroups(groups, targets):
+            if name not in matches.setdefault(rawState, []):
+                matches[rawState].append(name)
+    return matches
+
+## the raw hash state as written in the XNAME lists (0x... of the byte-swapped state, like hashString returns)
+def xnameListHash(rawState):
+    return formatXnameHash(rawState.to_bytes(4, 'little').hex())
+
+## adds matches to the user XNAME list, written sorted like the app does; returns the names added
+def saveMatches(matches, userXnames, userXnamesPath):
+    added = {}
+    for rawState, names in sorted(matches.items()):
+        name = names[0]
+        if name not in userXnames:
+            added[name] = xnameListHash(rawState)
+    if added:
+        userXnames = dict(userXnames)
+        userXnames.update(added)
+        userXnamesSorted = dict(sorted(userXnames.items(), key=lambda item: item[0]))
+        with open (userXnamesPath, 'w') as userXnamesFile:
+            userXnamesFile.write(json.dumps(userXnamesSorted, indent=4))
+    return added
+
+def main(args):
+    from memphisrider.batch import loadUserXnames, userXnamesPath
+    xnamesPath = args.user_xnames or userXnamesPath
+    userXnames = loadUserXnames(xnamesPath)
+    xnameIndex = XnameIndex(userXnames)
+
+    slotHashes, presetXnames = scanTargets(args.paths)
+    for hashValue in args.hash or []:
+        slotHashes.add(int(formatXnameHash(hashValue), 16).to_bytes(4, 'big'))
+    targets = unresolvedHashes(slotHashes, xnameIndex)
+    if not targets:
+        print("No unresolved car hashes found.")
+        return 0
+    print(f"{len(targets)} unresolved car hashes: {', '.join(xnameListHash(target) for target in sorted(targets))}")
+
+    patterns = args.pattern or []
+    total = len(presetXnames) + sum(len(readWordList(path)) for path in args.wordlist or [])
+    total += sum(candidateCount(parsePattern(pattern)) for pattern in patterns)
+    print(f"Trying {total} candidates...")
+    matches = crack(targets, args.wordlist or [], patterns, presetXnames)
+
+    for rawState, names in sorted(matches.items()):
+        print(f"{xnameListHash(rawState)}  {', '.join(names)}")
+    print(f"Resolved {len(matches)} of {len(targets)} hashes")
+    if matches and not args.dry_run:
+        added = saveMatches(matches, userXnames, xnamesPath)
+        print(f"Added {len(added)} XNAMEs to {xnamesPath}")
+    return 0
@@ -0,0 +1,233 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## slot level diff and three-way merge of profiles, e.g. to reconcile copies of one player's profile from two machines.
+##
+## comparisons go from coarse to fine over memoryviews of the profile buffers: the whole profile, then each slot block (with its
+## career inventory), and only for blocks that differ the fields documented in offsets.txt. the rest of the profile (career
+## progress and whatever else lies outside the garages) is compared as a whole first and then in small chunks.
+## a merge applies the other side's changes to "ours" in place, so writing the result is one ordinary save of the changed ranges
+
+import json
+import os
+
+from memphisrider.core import (PROFILE_SIZE, MY_CARS, CAREER, MY_CARS_OFFSET, CAREER_OFFSET, CAREER_STRIDE, CAREER_COUNT,
+                               MY_CARS_SLOT_SIZE, ProfileError, Profile, XnameIndex, headerFields, builtinXnameIndex)
+
+## slot fields from offsets.txt, as (name, start, end) within the 1072 byte block
+slotFields = [
+    ("ids", 0, 8),
+    ("enable", 8, 9),
+    ("show", 12, 13),
+    ("xname", 24, 28),
+    ("visual", 28, 776),
+    ("perf", 788, 856),
+    ("purchased", 1069, 1070),
+    ]
+
+## the bytes between the documented fields, reported as "other"
+def fieldGaps(fields, size):
+    gaps = []
+    position = 0
+    for name, start, end in sorted(fields, key=lambda field: field[1]):
+        if start > position:
+            gaps.append(("other", position, start))
+        position = max(position, end)
+    if position < size:
+        gaps.append(("other", position, size))
+    return gaps
+
+slotSegments = slotFields + fieldGaps(slotFields, MY_CARS_SLOT_SIZE)
+
+## parts of the profile outside the garages, minus the header fields (IDs are recomputed on save, the name comes from the file name)
+GARAGES_END = CAREER_OFFSET + CAREER_STRIDE*CAREER_COUNT
+MERGE_CHUNK = 4
+
+def outsideRanges():
+    ranges = []
+    for start, end in sorted([(0, MY_CARS_OFFSET)] + [(GARAGES_END, PROFILE_SIZE)]):
+        cuts = sorted((offset, offset + length) for offset, length in headerFields.values() if start <= offset < end)
+        for cutStart, cutEnd in cuts:
+            if cutStart > start:
+                ranges.append((start, cutStart))
+            start = cutEnd
+        if start < end:
+            ranges.append((start, end))
+    return ranges
+
+otherRanges = outsideRanges()
+
+## names of the slot fields that differ between two CarSlots (inventory included for career slots), [] if they're the same
+def diffSlot(slotA, slotB):
+    fields = []
+    if slotA.data != slotB.data:
+        ## cached fingerprints settle the visual data without comparing it again
+        for name, start, end in slotSegments:
+            if name == "visual" and slotA.fingerprint is not None and slotB.fingerprint is not None:
+                changed = slotA.fingerprint != slotB.fingerprint
+            else:
+                changed = slotA.data[start:end] != slotB.data[start:end]
+            if changed and name not in fields:
+                fields.append(name)
+    if slotA.inventory is not None and slotA.inventory != slotB.inventory:
+        fields.append("inventory")
+    return fields
+
+## coalesced (offset, length) ranges that differ between two views, compared in MERGE_CHUNK sized pieces
+def diffRanges(viewA, viewB, ranges=otherRanges):
+    changed = []
+    for start, end in ranges:
+        if viewA[start:end] == viewB[start:end]:
+            continue
+        for offset in range(start, end, MERGE_CHUNK):
+            chunkEnd = min(offset + MERGE_CHUNK, end)
+            if viewA[offset:chunkEnd] != viewB[offset:chunkEnd]:
+                if changed and changed[-1][0] + changed[-1][1] == offset:
+                    changed[-1] = (changed[-1][0], chunkEnd - changed[-1][0])
+                else:
+                    changed.append((offset, chunkEnd - offset))
+    return changed
+
+## compares two profiles; returns {"slots": [{"garage", "slot", "fields", "xnames"}], "header": [...], "other": [(offset, length)]}
+def diffProfiles(profileA, profileB, xnameIndex=builtinXnameIndex):
+    result = {"slots":[], "header":[], "other":[]}
+    if profileA.view == profileB.view:
+        return result
+    for garage in (MY_CARS, CAREER):
+        garageA = profileA.garages[garage]
+        garageB = profileB.garages[garage]
+        if garageA.view == garageB.view:
+            continue
+        for slotA, slotB in zip(garageA, garageB):
+            fields = diffSlot(slotA, slotB)
+            if fields:
+                result["slots"].append({"garage":garage, "slot":slotA.index, "fields":fields,
+                                        "xnames":(profileA.slotXname(garage, slotA.index, xnameIndex), profileB.slotXname(garage, slotB.index, xnameIndex))})
+    for field, (offset, length) in headerFields.items():
+        if profileA.view[offset:offset+length] != profileB.view[offset:offset+length]:
+            result["header"].append(field)
+    result["other"] = diffRanges(profileA.view, profileB.view)
+    return result
+
+## three-way merge of theirs into ours against their common ancestor base, in place on ours (as one undo step).
+## changes made on one side only are taken; a slot changed on both sides is merged field by field, and a field (or chunk outside
+## the garages) changed differently on both sides is a conflict, resolved by prefer ("ours" or "theirs"). returns
+## (number of regions taken from theirs, conflicts as readable strings); with prefer=None and conflicts, ours is left untouched
+def mergeProfiles(base, ours, theirs, prefer=None):
+    if prefer not in (None, "ours", "theirs"):
+        raise ProfileError(f'prefer must be "ours" or "theirs", not "{prefer}"')
+    edits = []
+    conflicts = []
+    for garage in (MY_CARS, CAREER):
+        garageName = "My Cars" if garage == MY_CARS else "Career"
+        if ours.garages[garage].view == theirs.garages[garage].view:
+            continue
+        for baseSlot, ourSlot, theirSlot in zip(base.garages[garage], ours.garages[garage], theirs.garages[garage]):
+            if ourSlot.data == theirSlot.data and ourSlot.inventory == theirSlot.inventory:
+                continue
+            segments = [(name, ourSlot.data, theirSlot.data, baseSlot.data, start, end) for name, start, end in slotSegments]
+            if ourSlot.inventory is not None:
+                segments.append(("inventory", ourSlot.inventory, theirSlot.inventory, baseSlot.inventory, 0, len(ourSlot.inventory)))
+            for name, ourData, theirData, baseData, start, end in segments:
+                ourPart = ourData[start:end]
+                theirPart = theirData[start:end]
+                if ourPart == theirPart or theirPart == baseData[start:end]:
+                    continue
+                if ourPart != baseData[start:end]:
+                    conflicts.append(f"{garageName} slot {ourSlot.index+1} {name}")
+                    if prefer != "theirs":
+                        continue
+                edits.append(((garage, ourSlot.index), ourSlot.offset + (start if ourData is ourSlot.data else MY_CARS_SLOT_SIZE + start), bytes(theirPart)))
+    for offset, length in diffRanges(ours.view, theirs.view):
+        for chunkOffset in range(offset, offset + length, MERGE_CHUNK):
+            chunkEnd = min(chunkOffset + MERGE_CHUNK, offset + length)
+            if theirs.view[chunkOffset:chunkEnd] == base.view[chunkOffset:chunkEnd]:
+                continue
+            if ours.view[chunkOffset:chunkEnd] != base.view[chunkOffset:chunkEnd]:
+                conflicts.append(f"bytes {chunkOffset}-{chunkEnd-1}")
+                if prefer != "theirs":
+                    continue
+            edits.append((("range", chunkOffset, chunkEnd - chunkOffset), chunkOffset, bytes(theirs.view[chunkOffset:chunkEnd])))
+    if conflicts and prefer is None:
+        return 0, conflicts
+    with ours.change("merge"):
+        for region, offset, data in edits:
+            ours.markDirty(region)
+            ours.view[offset:offset+len(data)] = data
+    return len(edits), conflicts
+
+## pairs up profiles to compare: two files, or every profile file name found in both folders
+def profilePairs(pathA, pathB):
+    if os.path.isdir(pathA) and os.path.isdir(pathB):
+        names = sorted(set(os.listdir(pathA)) & set(os.listdir(pathB)))
+        return [(os.path.join(pathA, name), os.path.join(pathB, name)) for name in names
+                if os.path.isfile(os.path.join(pathA, name)) and os.path.getsize(os.path.join(pathA, name)) == PROFILE_SIZE]
+    return [(pathA, pathB)]
+
+def printDiff(pathA, pathB, result):
+    if not (result["slots"] or result["header"] or result["other"]):
+        print(f"{pathA} and {pathB} are the same")
+        return
+    print(f"--- {pathA}\n+++ {pathB}")
+    for slotDiff in result["slots"]:
+        garageName = "My Cars" if slotDiff["garage"] == MY_CARS else "Career"
+        xnameA, xnameB = slotDiff["xnames"]
+        xnameStr = xnameA if xnameA == xnameB else f"{xnameA} -> {xnameB}"
+        print(f"  {garageName} slot {slotDiff['slot']+1} ({xnameStr}): {', '.join(slotDiff['fields'])}")
+    if result["header"]:
+        print(f"  header: {', '.join(result['header'])}")
+    if result["other"]:
+        changedBytes = sum(length for offset, length in result["other"])
+        print(f"  {changedBytes} bytes outside the garages in {len(result['other'])} ranges")
+
+def mainDiff(args):
+    from memphisrider.batch import loadUserXnames
+    xnameIndex = XnameIndex(loadUserXnames())
+    different = 0
+    results = []
+    for pathA, pathB in profilePairs(args.a, args.b):
+        with Profile.open(pathA) as profileA, Profile.open(pathB) as profileB:
+            result = diffProfiles(profileA, profileB, xnameIndex)
+        if result["slots"] or result["header"] or result["other"]:
+            different += 1
+        if args.json:
+            results.append({"a":pathA, "b":pathB, **result})
+        else:
+            printDiff(pathA, pathB, result)
+    if args.json:
+        print(json.dumps(results, indent=4))
+    return 1 if different else 0
+
+def mainMerge(args):
+    with Profile.open(args.base) as base, Profile.open(args.ours) as ours, Profile.open(args.theirs) as theirs:
+        taken, conflicts = mergeProfiles(base, ours, theirs, args.prefer)
+        for conflict in conflicts:
+            print(f"CONFLICT  {conflict}{f' (kept {args.prefer})' if args.prefer else ''}")
+        if conflicts and args.prefer is None:
+            print(f"{len(conflicts)} conflicts, nothing written; use --prefer ours or --prefer theirs to resolve them")
+            return 1
+        if args.output and os.path.abspath(args.output) != os.path.abspath(args.ours):
+            ours.saveAs(args.output)
+        elif ours.isDirty():
+            ours.save(backup=True)
+        print(f"Merged {taken} changes from {args.theirs} into {args.output or args.ours}")
+    return 0
@@ -0,0 +1,174 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## fleet-wide analytics over many profiles: N profiles stacked into one (N, 54966) uint8 array, either read in bulk straight into
+## the array or memory mapped from a fleet file (the profiles concatenated, with a .json list of their paths next to it).
+##
+## each garage gets a structured view over that array, one record per slot with the fields from offsets.txt:
+##
+##     fleet.slots(CAREER)['purchased'][:, 2]    # purchased flag of career slot 3 in every profile
+##
+## the views share the array's memory, so counts, histograms and filters are plain vectorized NumPy operations
+
+import json
+import os
+
+from memphisrider.core import (PROFILE_SIZE, MY_CARS, CAREER, MY_CARS_OFFSET, MY_CARS_SLOT_SIZE, MY_CARS_COUNT,
+                               CAREER_OFFSET, CAREER_STRIDE, CAREER_COUNT, CAREER_INV_SIZE, builtinXnameIndex)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+## raised when profiles can't be loaded into a fleet
+class FleetError(Exception):
+    pass
+
+## record layout of a slot block; the XNAME hash is read big-endian so its values are XnameIndex keys
+def slotDtype(stride):
+    names = ['ids', 'enable', 'show', 'xname', 'visual', 'perf', 'purchased']
+    formats = [('u1', 8), 'u1', 'u1', '>u4', ('u1', 748), ('u1', 68), 'u1']
+    offsets = [0, 8, 12, 24, 28, 788, 1069]
+    if stride > MY_CARS_SLOT_SIZE:
+        names.append('inventory')
+        formats.append(('u1', CAREER_INV_SIZE))
+        offsets.append(MY_CARS_SLOT_SIZE)
+    return numpy.dtype({'names':names, 'formats':formats, 'offsets':offsets, 'itemsize':stride})
+
+garageLayouts = {
+    MY_CARS: (MY_CARS_OFFSET, MY_CARS_SLOT_SIZE, MY_CARS_COUNT),
+    CAREER: (CAREER_OFFSET, CAREER_STRIDE, CAREER_COUNT),
+    }
+
+## profile files among the given files and folders (folders are searched recursively), picked by their size
+def profilePaths(paths):
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, fileNames in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, fileName) for fileName in sorted(fileNames))
+        else:
+            found.append(path)
+    return [path for path in found if os.path.isfile(path) and os.path.getsize(path) == PROFILE_SIZE]
+
+class Fleet:
+    def __init__(self, data, paths):
+        if numpy is None:
+            raise FleetError("Fleet analytics need NumPy, install it with: pip install numpy")
+        self.data = data
+        self.paths = list(paths)
+        self.garages = {}
+        for garage, (offset, stride, count) in garageLayouts.items():
+            self.garages[garage] = data[:, offset:offset+stride*count].view(slotDtype(stride))
+
+    ## reads the profile files (or every profile in the given folders) straight into one array, one readinto per file
+    @classmethod
+    def load(cls, paths):
+        if numpy is None:
+            raise FleetError("Fleet analytics need NumPy, install it with: pip install numpy")
+        paths = profilePaths(paths)
+        data = numpy.empty((len(paths), PROFILE_SIZE), dtype=numpy.uint8)
+        for row, path in zip(data, paths):
+            with open (path, 'rb', buffering=0) as profileFile:
+                if profileFile.readinto(row) != PROFILE_SIZE:
+                    raise FleetError(f'{path} changed while it was being read')
+        return cls(data, paths)
+
+    ## memory maps a fleet file written by pack; nothing is read until a view is used
+    @classmethod
+    def open(cls, fleetPath):
+        if numpy is None:
+            raise FleetError("Fleet analytics need NumPy, install it with: pip install numpy")
+        with open (fleetPath + ".json", 'r') as pathsFile:
+            paths = json.load(pathsFile)
+        if os.path.getsize(fleetPath) != len(paths)*PROFILE_SIZE:
+            raise FleetError(f'{fleetPath} does not match its list of {len(paths)} profiles')
+        if not paths:
+            return cls(numpy.empty((0, PROFILE_SIZE), dtype=numpy.uint8), paths)
+        return cls(numpy.memmap(fleetPath, dtype=numpy.uint8, mode='r', shape=(len(paths), PROFILE_SIZE)), paths)
+
+    ## writes the fleet to one file that open can map later, e.g. to snapshot a league's profiles
+    def pack(self, fleetPath):
+        with open (fleetPath, 'wb') as fleetFile:
+            fleetFile.write(numpy.ascontiguousarray(self.data).data)
+        with open (fleetPath + ".json", 'w') as pathsFile:
+            pathsFile.write(json.dumps(self.paths, indent=4))
+
+    def __len__(self):
+        return len(self.paths)
+
+    ## structured (N, slot count) view of a garage's slots
+    def slots(self, garage):
+        return self.garages[garage]
+
+    ## (N, slot count) bool array of the slots without a car
+    def emptySlots(self, garage):
+        return self.garages[garage]['xname'] == 0
+
+    ## profile paths where mask (one bool per profile) is set
+    def select(self, mask):
+        return [self.paths[row] for row in numpy.flatnonzero(mask)]
+
+    ## (xname, count) of the cars in a garage (or both), most used first
+    def carCounts(self, garage=None, xnameIndex=builtinXnameIndex):
+        garages = [garage] if garage is not None else list(self.garages)
+        hashes = numpy.concatenate([self.garages[g]['xname'].ravel() for g in garages])
+        values, counts = numpy.unique(hashes[hashes != 0], return_counts=True)
+        order = numpy.argsort(-counts, kind='stable')
+        return [(xnameIndex.lookup(int(values[i]).to_bytes(4, 'big')), int(counts[i])) for i in order]
+
+    ## number of profiles with each slot empty, one count per slot
+    def emptyCounts(self, garage):
+        return self.emptySlots(garage).sum(axis=0)
+
+def main(args):
+    from memphisrider.batch import loadUserXnames
+    from memphisrider.core import XnameIndex
+    xnameIndex = XnameIndex(loadUserXnames())
+    if args.open:
+        fleet = Fleet.open(args.open)
+    else:
+        fleet = Fleet.load(args.paths)
+    if args.pack:
+        fleet.pack(args.pack)
+        print(f"Packed {len(fleet)} profiles into {args.pack}")
+    report = {"profiles":len(fleet)}
+    for garage, garageName in ((MY_CARS, "myCars"), (CAREER, "career")):
+        report[garageName] = {
+            "cars":fleet.carCounts(garage, xnameIndex)[:args.top],
+            "emptySlots":[int(count) for count in fleet.emptyCounts(garage)],
+            "purchased":[int(count) for count in (fleet.slots(garage)['purchased'] != 0).sum(axis=0)],
+            }
+    if args.json:
+        print(json.dumps(report, indent=4))
+        return 0
+    print(f"{len(fleet)} profiles")
+    for garage, garageName in ((MY_CARS, "My Cars"), (CAREER, "Career")):
+        garageReport = report["myCars" if garage == MY_CARS else "career"]
+        print(f"\n{garageName}, most used cars:")
+        for xname, count in garageReport["cars"]:
+            print(f"  {count:>8}  {xname}")
+        print(f"{garageName}, profiles with the slot empty:")
+        print("  " + "  ".join(f"{slot+1}:{count}" for slot, count in enumerate(garageReport["emptySlots"])))
+    return 0
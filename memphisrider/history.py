@@ -0,0 +1,234 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## preset history: MD5 of a preset's/slot's visual data -> {"presetName", "lastPath", "lastDate"}
+##
+## kept as an append-only JSON Lines log, one {"hash": ..., "presetName": ..., "lastPath": ..., "lastDate": ...} object per line;
+## recording a preset appends a single line instead of rewriting the whole history, later lines win over earlier ones for the
+## same hash, and the log is compacted (rewritten with one line per hash) once stale lines outnumber the live entries.
+## the first load migrates MemphisRider_presetHistory.json or the legacy MemphisRider_slotPresetNames.txt, which are left untouched
+
+import json
+import os
+
+HISTORY_PATH = "MemphisRider_presetHistory.jsonl"
+LEGACY_HISTORY_PATHS = ("MemphisRider_presetHistory.json", "MemphisRider_slotPresetNames.txt")
+
+## don't bother compacting small logs
+COMPACT_MIN_STALE = 1000
+
+## raised when the history file can't be used
+class HistoryError(Exception):
+    pass
+
+## appends lines to the log; a log ending in a torn line (e.g. cut off by a crash) gets a newline first so the new lines
+## aren't glued onto it. only touches the file, so it can run on a writer thread
+def appendLog(path, historyData):
+    with open (path, 'ab+') as historyFile:
+        if historyFile.tell() > 0:
+            historyFile.seek(-1, os.SEEK_END)
+            if historyFile.read(1) != b'\n':
+                historyData = b'\n' + historyData
+        historyFile.write(historyData)
+
+## replaces the log with compacted data
+def replaceLog(path, historyData):
+    tempPath = path + ".tmp"
+    with open (tempPath, 'wb') as historyFile:
+        historyFile.write(historyData)
+        historyFile.flush()
+        os.fsync(historyFile.fileno())
+    os.replace(tempPath, path)
+
+## turns an entry of the old JSON history (or a bare preset name from the legacy .txt) into the current format
+def legacyEntry(value):
+    if isinstance(value, dict):
+        return value
+    return {"presetName":value, "lastPath":'n/a', "lastDate":"n/a"}
+
+class PresetHistory:
+    def __init__(self, path=HISTORY_PATH, legacyPaths=LEGACY_HISTORY_PATHS):
+        self.path = path
+        self.legacyPaths = legacyPaths
+        self.entries = {}
+        self.staleLines = 0
+        ## how far the log has been read, so load() only parses lines appended since (e.g. by another instance)
+        self.readOffset = 0
+        self.readSize = 0
+        ## entries handed to the writer but not on disk yet, a load() meanwhile mustn't replace them with older lines
+        self.unwritten = {}
+        ## entries whose append failed, written again with the next ones
+        self.retryEntries = []
+        ## when set, e.g. to a BackgroundWriter's submit, appends and compactions are handed to it as
+        ## submitWrite(task, *args, callback=..., errback=...) instead of being done right away. the tasks only write the file;
+        ## entries and read offsets are only touched by the thread calling record()/load() and by the callbacks, which run on it too
+        self.submitWrite = None
+
+    def __contains__(self, presetHash):
+        return presetHash in self.entries
+
+    def __getitem__(self, presetHash):
+        return self.entries[presetHash]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, presetHash, default=None):
+        return self.entries.get(presetHash, default)
+
+    ## (re)loads the log; cheap when nothing changed, reads only the new lines when it was appended to
+    def load(self):
+        if not os.path.isfile(self.path):
+            self.entries.clear()
+            self.staleLines = 0
+            self.readOffset = self.readSize = 0
+            self.migrate()
+            self.entries.update(self.unwritten)
+            return self
+        fileSize = os.path.getsize(self.path)
+        if fileSize == self.readSize:
+            return self
+        if fileSize < self.readSize:
+            ## compacted or replaced by someone else, start over
+            self.entries.clear()
+            self.staleLines = 0
+            self.readOffset = 0
+        with open (self.path, 'rb') as historyFile:
+            historyFile.seek(self.readOffset)
+            historyData = historyFile.read()
+        lines = historyData.split(b'\n')
+        ## the last piece has no newline yet: either empty, or a line still being written (or cut off by a crash), which is skipped;
+        ## a torn line left in the middle by a crash is skipped as well and dropped by the next compaction
+        badLines = 0
+        for line in lines[:-1]:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                presetHash = record.pop("hash")
+            except (json.decoder.JSONDecodeError, KeyError, AttributeError, TypeError, UnicodeDecodeError):
+                badLines += 1
+                continue
+            ## reading back our own lines isn't a new stale line
+            if presetHash in self.entries and self.entries[presetHash] != record:
+                self.staleLines += 1
+            self.entries[presetHash] = record
+        self.entries.update(self.unwritten)
+        if badLines and not self.entries:
+            raise HistoryError(f'{self.path} is corrupted or misconfigured.')
+        self.staleLines += badLines
+        self.readOffset += len(historyData) - len(lines[-1])
+        self.readSize = fileSize
+        return self
+
+    ## one-time import of the old whole-file JSON history
+    def migrate(self):
+        for legacyPath in self.legacyPaths:
+            if os.path.isfile(legacyPath):
+                with open (legacyPath, 'r') as legacyFile:
+                    try:
+                        legacyEntries = json.load(legacyFile)
+                    except json.decoder.JSONDecodeError:
+                        raise HistoryError(f'{legacyPath} is corrupted or misconfigured.')
+                if not isinstance(legacyEntries, dict):
+                    raise HistoryError(f'{legacyPath} is corrupted or misconfigured.')
+                for presetHash, value in legacyEntries.items():
+                    self.entries[presetHash] = legacyEntry(value)
+                self.compact()
+                return True
+        return False
+
+    ## adds or updates one entry with a single appended line
+    def record(self, presetHash, presetName, lastPath, lastDate):
+        entry = {"presetName":presetName, "lastPath":lastPath, "lastDate":lastDate}
+        if self.entries.get(presetHash) == entry:
+            return
+        if presetHash in self.entries:
+            self.staleLines += 1
+        self.entries[presetHash] = entry
+        self.writeEntries([(presetHash, entry)])
+
+    ## appends several entries with one write, e.g. after a batch import
+    def recordMany(self, records):
+        newEntries = []
+        for presetHash, presetName, lastPath, lastDate in records:
+            entry = {"presetName":presetName, "lastPath":lastPath, "lastDate":lastDate}
+            if self.entries.get(presetHash) == entry:
+                continue
+            if presetHash in self.entries:
+                self.staleLines += 1
+            self.entries[presetHash] = entry
+            newEntries.append((presetHash, entry))
+        if newEntries:
+            self.writeEntries(newEntries)
+
+    ## lines appended here (and by other instances) are picked up by the next load(), which skips the ones already known
+    def writeEntries(self, newEntries):
+        newEntries = self.retryEntries + newEntries
+        self.retryEntries = []
+        self.unwritten.update(newEntries)
+        historyData = b''.join(self.serialize(presetHash, entry) for presetHash, entry in newEntries)
+        self.submit(appendLog, self.path, historyData, callback=lambda result: self.written(newEntries),
+                    errback=lambda writeError: self.writeFailed(newEntries))
+
+    ## errback(error) runs instead of callback when the write fails; without a submitWrite the error is raised afterwards
+    def submit(self, task, *args, callback, errback):
+        if self.submitWrite is not None:
+            self.submitWrite(task, *args, callback=callback, errback=errback)
+            return
+        try:
+            result = task(*args)
+        except OSError as writeError:
+            errback(writeError)
+            raise
+        callback(result)
+
+    def written(self, newEntries):
+        for presetHash, entry in newEntries:
+            if self.unwritten.get(presetHash) is entry:
+                del self.unwritten[presetHash]
+        if self.staleLines > max(COMPACT_MIN_STALE, len(self.entries)):
+            self.compact()
+
+    ## the entries stay in memory (and in unwritten), and are appended again by the next record
+    def writeFailed(self, newEntries):
+        self.retryEntries.extend((presetHash, entry) for presetHash, entry in newEntries if self.unwritten.get(presetHash) is entry)
+
+    def serialize(self, presetHash, entry):
+        return (json.dumps({"hash":presetHash, **entry}) + "\n").encode()
+
+    ## rewrites the log with one line per hash, sorted by preset name like the old JSON file was
+    ## the data is taken now, appends submitted later are written after it
+    def compact(self):
+        sortedEntries = sorted(self.entries.items(), key=lambda item: item[1]["presetName"])
+        historyData = b''.join(self.serialize(presetHash, entry) for presetHash, entry in sortedEntries)
+        staleLines = self.staleLines
+        self.staleLines = 0
+        self.submit(replaceLog, self.path, historyData, callback=lambda result: self.compacted(len(historyData)),
+                    errback=lambda writeError: self.compactFailed(staleLines))
+
+    def compacted(self, historySize):
+        self.readOffset = self.readSize = historySize
+
+    ## the log is left as it was, so its stale lines are still there to compact next time
+    def compactFailed(self, staleLines):
+        self.staleLines += staleLines
@@ -0,0 +1,175 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## index of the preset (.bin) and slot (.u2cc/.u2ci) files kept on disk, so customizations can be found without opening every file.
+##
+## every file is recorded with its size, mtime and kind; presets and slots also get the fingerprint (MD5 of the 748 byte visual
+## data, the same key the preset history uses) and their XNAME. re-scans walk the folders with os.scandir and only read files whose
+## size or mtime changed, spreading the reads over a thread pool since they're I/O bound.
+## the index is a single JSON file, rewritten (through a temp file) once per scan
+
+import hashlib
+import json
+import os
+
+from memphisrider.core import (MY_CARS_SLOT_SIZE, CAREER_INV_SIZE, PRESET_SIZE, SLOT_XNAME, SLOT_VISUAL,
+                               ProfileError, XnameIndex, builtinXnameIndex, readPreset)
+from memphisrider.compress import CompressError, unpackData
+
+LIBRARY_INDEX_PATH = "MemphisRider_libraryIndex.json"
+LIBRARY_INDEX_VERSION = 1
+
+libraryExtensions = (".bin", ".u2cc", ".u2ci")
+
+## raised when the index file can't be used
+class LibraryError(Exception):
+    pass
+
+## largest file kind we index, plus one byte to tell exact sizes from bigger files
+READ_SIZE = max(PRESET_SIZE, MY_CARS_SLOT_SIZE, CAREER_INV_SIZE) + 1
+
+## reads one library file and returns its index entry (without size/mtime)
+def indexFile(path, xnameIndex=builtinXnameIndex):
+    extension = os.path.splitext(path)[1].lower()
+    with open (path, 'rb') as libraryFile:
+        data = libraryFile.read(READ_SIZE)
+    try:
+        data = unpackData(data)
+    except CompressError:
+        return {"kind":"other"}
+    if extension == ".bin" and len(data) == PRESET_SIZE:
+        preset = readPreset(data)
+        return {"kind":"preset", "fingerprint":hashlib.md5(preset["data"]).hexdigest(), "xname":preset["xname"],
+                "presetName":preset["presetName"], "perfLevel":preset["perfLevel"]}
+    if extension == ".u2cc" and len(data) == MY_CARS_SLOT_SIZE:
+        slotView = memoryview(data)
+        return {"kind":"slot", "fingerprint":hashlib.md5(slotView[SLOT_VISUAL]).hexdigest(), "xname":xnameIndex.lookup(slotView[SLOT_XNAME])}
+    if extension == ".u2ci" and len(data) == CAREER_INV_SIZE:
+        return {"kind":"inventory", "fingerprint":hashlib.md5(data).hexdigest()}
+    ## serialized presets and anything else we can't use, kept so re-scans skip them too
+    return {"kind":"other"}
+
+## walks folders with os.scandir, yielding (path, size, mtime_ns) of every library file
+def scanFolder(folder):
+    pendingFolders = [folder]
+    while pendingFolders:
+        try:
+            entries = os.scandir(pendingFolders.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pendingFolders.append(entry.path)
+                    elif entry.name.lower().endswith(libraryExtensions) and entry.is_file():
+                        stat = entry.stat()
+                        yield os.path.abspath(entry.path), stat.st_size, stat.st_mtime_ns
+                except OSError:
+                    continue
+
+class LibraryIndex:
+    def __init__(self, path=LIBRARY_INDEX_PATH):
+        self.path = path
+        self.files = {}
+
+    def load(self):
+        if os.path.isfile(self.path):
+            with open (self.path, 'r') as indexFile:
+                try:
+                    index = json.load(indexFile)
+                except json.decoder.JSONDecodeError:
+                    raise LibraryError(f'{self.path} is corrupted or misconfigured.')
+            ## older or newer layouts are simply rebuilt
+            if isinstance(index, dict) and index.get("version") == LIBRARY_INDEX_VERSION:
+                self.files = index["files"]
+        return self
+
+    def save(self):
+        tempPath = self.path + ".tmp"
+        with open (tempPath, 'w') as indexFile:
+            json.dump({"version":LIBRARY_INDEX_VERSION, "files":self.files}, indexFile, separators=(',', ':'))
+        os.replace(tempPath, self.path)
+
+    ## indexes the given folders; unchanged files (same size and mtime) aren't read again, files that are gone are dropped.
+    ## returns a dict with the number of new, updated, unchanged and removed files
+    def scan(self, folders, userXnames={}, workers=None):
+        xnameIndex = XnameIndex(userXnames)
+        stats = {"new":0, "updated":0, "unchanged":0, "removed":0}
+        seen = set()
+        changed = []
+        for folder in folders:
+            for path, size, mtime in scanFolder(folder):
+                if path in seen:
+                    continue
+                seen.add(path)
+                entry = self.files.get(path)
+                if entry is not None and entry["size"] == size and entry["mtime"] == mtime:
+                    stats["unchanged"] += 1
+                else:
+                    stats["updated" if entry is not None else "new"] += 1
+                    changed.append((path, size, mtime))
+
+        ## imported here, concurrent.futures pulls in logging and would slow down the app's startup
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda path: self.readEntry(path, xnameIndex), [path for path, size, mtime in changed])
+            for (path, size, mtime), entry in zip(changed, results):
+                if entry is None:
+                    self.files.pop(path, None)
+                    continue
+                entry["size"] = size
+                entry["mtime"] = mtime
+                self.files[path] = entry
+
+        scannedFolders = tuple(os.path.join(os.path.abspath(folder), '') for folder in folders)
+        for path in [path for path in self.files if path.startswith(scannedFolders) and path not in seen]:
+            del self.files[path]
+            stats["removed"] += 1
+        return stats
+
+    ## None for files that vanished or can't be read between the scan and the read
+    def readEntry(self, path, xnameIndex):
+        try:
+            return indexFile(path, xnameIndex)
+        except (ProfileError, OSError):
+            return None
+
+    ## paths of the presets/slots with the given visual data fingerprint
+    def findFingerprint(self, fingerprint):
+        return [path for path, entry in self.files.items() if entry.get("fingerprint") == fingerprint]
+
+    ## paths of the presets/slots for a car
+    def findXname(self, xname):
+        return [path for path, entry in self.files.items() if entry.get("xname") == xname]
+
+def main(args):
+    from memphisrider.batch import loadUserXnames
+    libraryIndex = LibraryIndex(args.index).load()
+    stats = libraryIndex.scan(args.folders, loadUserXnames(), args.workers)
+    libraryIndex.save()
+    kinds = {}
+    for entry in libraryIndex.files.values():
+        kinds[entry["kind"]] = kinds.get(entry["kind"], 0) + 1
+    print(f'{stats["new"]} new, {stats["updated"]} updated, {stats["unchanged"]} unchanged, {stats["removed"]} removed; '
+          f'{kinds.get("preset", 0)} presets, {kinds.get("slot", 0)} slots, {kinds.get("inventory", 0)} inventories indexed in {args.index}')
+    return 0
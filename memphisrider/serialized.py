@@ -0,0 +1,176 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## serialized Binary presets ("gMp" files): the car is referenced by part names built from its XNAME (SUPRA_BASE, SUPRA_BODY_KIT01...),
+## and the 16-bit little-endian size at offset 28 (of the chunk that follows it) has to grow or shrink with the file when the XNAME
+## changes length.
+##
+## the XNAME is found with a single regex over every known XNAME followed by _BASE (longest names first, so RX8 doesn't win over
+## RX8_TUNED), falling back to any NAME_BASE token for cars that aren't in the lists; renaming walks the references once and writes
+## the pieces between them straight to the output, then patches the size field by the total length change. only that one size
+## field is known, so a reference outside the chunk it covers (whose own size would need fixing too) is refused rather than
+## written into a corrupt preset
+
+import os
+import re
+import struct
+
+from memphisrider.core import ProfileError, xnames
+
+SERIALIZED_MAGIC = b'gMp'
+SERIALIZED_SIZE_OFFSET = 28
+SERIALIZED_CHUNK_OFFSET = SERIALIZED_SIZE_OFFSET + 2
+
+## any part name ending in _BASE, for XNAMEs we don't know yet
+unknownXnamePattern = re.compile(rb'(?<![A-Z0-9_])([A-Z0-9_]+?)_BASE(?![A-Z0-9])')
+
+## finds XNAMEs of serialized presets, one compiled pattern for the whole XNAME list
+class XnameMatcher:
+    def __init__(self, names):
+        self.names = set(names)
+        alternatives = b'|'.join(re.escape(name.encode('ascii')) for name in sorted(self.names, key=len, reverse=True))
+        self.pattern = re.compile(rb'(?<![A-Z0-9_])(' + alternatives + rb')_BASE(?![A-Z0-9])')
+
+    ## returns (xname, known) of the first _BASE part, or (None, False) if there is none
+    def find(self, data):
+        match = self.pattern.search(data)
+        if match is not None:
+            return match.group(1).decode('ascii'), True
+        match = unknownXnamePattern.search(data)
+        if match is not None:
+            return match.group(1).decode('ascii'), False
+        return None, False
+
+## matcher for the built-in XNAMEs plus the given user XNAMEs
+def xnameMatcher(userXnames={}):
+    return XnameMatcher([name for name in list(xnames) + list(userXnames) if name != "(empty)"])
+
+def isSerializedPreset(data):
+    return bytes(data[0:3]) == SERIALIZED_MAGIC and len(data) >= SERIALIZED_SIZE_OFFSET + 2
+
+def checkSerializedPreset(data):
+    if not isSerializedPreset(data):
+        raise ProfileError("Not a serialized Binary preset .bin file")
+
+## every reference to an XNAME in part names (the XNAME followed by "_"), as (start, end) spans
+def xnameReferences(data, xname):
+    pattern = re.compile(rb'(?<![A-Z0-9_])' + re.escape(xname.encode('ascii')) + rb'(?=_)')
+    return [match.span() for match in pattern.finditer(data)]
+
+## yields the pieces of the renamed preset in order, with the size field at offset 28 adjusted; raises ProfileError before
+## yielding anything when a reference lies outside the chunk the size field covers, and before the last piece if the renamed
+## chunk doesn't come out as long as the patched size says
+def renamedPieces(data, oldXname, newXname):
+    checkSerializedPreset(data)
+    references = xnameReferences(data, oldXname)
+    newName = newXname.encode('ascii')
+    oldSize = struct.unpack_from('<H', data, SERIALIZED_SIZE_OFFSET)[0]
+    chunkEnd = SERIALIZED_CHUNK_OFFSET + oldSize
+    if chunkEnd > len(data):
+        raise ProfileError("The preset's size field is larger than the file, it may be corrupted")
+    for start, end in references:
+        if start < SERIALIZED_CHUNK_OFFSET or end > chunkEnd:
+            raise ProfileError(f"{oldXname} is referenced outside the chunk the preset's size field covers, it can't be renamed safely")
+    sizeChange = (len(newName) - len(oldXname)) * len(references)
+    sizeField = oldSize + sizeChange
+    if not 0 <= sizeField <= 0xFFFF:
+        raise ProfileError(f"Renaming {oldXname} to {newXname} makes the preset too large")
+    view = memoryview(data)
+    yield view[:SERIALIZED_SIZE_OFFSET]
+    yield struct.pack('<H', sizeField)
+    position = SERIALIZED_CHUNK_OFFSET
+    chunkLength = 0
+    for start, end in references:
+        yield view[position:start]
+        yield newName
+        chunkLength += start - position + len(newName)
+        position = end
+    chunkLength += chunkEnd - position
+    if chunkLength != sizeField:
+        raise ProfileError(f"Renaming {oldXname} to {newXname} left the preset's size field wrong, it wasn't written")
+    yield view[position:]
+
+## renames the car of a serialized preset in memory
+def renameXname(data, oldXname, newXname):
+    return b''.join(renamedPieces(data, oldXname, newXname))
+
+## renames the car of a serialized preset file; writes through a temp file so the source can also be the destination
+def renameXnameFile(path, newXname, outPath=None, matcher=None, oldXname=None):
+    with open (path, 'rb') as presetFile:
+        data = presetFile.read()
+    checkSerializedPreset(data)
+    if oldXname is None:
+        oldXname, known = (matcher or xnameMatcher()).find(data)
+        if oldXname is None:
+            raise ProfileError(f"No XNAME found in {path}")
+    outPath = outPath or path
+    tempPath = outPath + ".tmp"
+    try:
+        with open (tempPath, 'wb') as presetWrite:
+            for piece in renamedPieces(data, oldXname, newXname):
+                presetWrite.write(piece)
+    except ProfileError:
+        os.remove(tempPath)
+        raise
+    os.replace(tempPath, outPath)
+    return oldXname
+
+## renames every serialized preset in the given files/folders, optionally only those of one car; yields (path, oldXname, error)
+def renameXnames(paths, newXname, outDir=None, userXnames={}, onlyXname=None):
+    matcher = xnameMatcher(userXnames)
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                presetPaths = sorted(entry.path for entry in entries if entry.is_file() and entry.name.lower().endswith(".bin"))
+        else:
+            presetPaths = [path]
+        for presetPath in presetPaths:
+            try:
+                with open (presetPath, 'rb') as presetFile:
+                    data = presetFile.read()
+                if not isSerializedPreset(data):
+                    continue
+                oldXname, known = matcher.find(data)
+                if oldXname is None or (onlyXname is not None and oldXname != onlyXname):
+                    continue
+                outPath = os.path.join(outDir, os.path.basename(presetPath)) if outDir else presetPath
+                renameXnameFile(presetPath, newXname, outPath, oldXname=oldXname)
+                yield presetPath, oldXname, None
+            except (ProfileError, OSError) as renameError:
+                yield presetPath, None, str(renameError)
+
+def main(args):
+    from memphisrider.batch import loadUserXnames
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    elif not args.in_place:
+        raise ProfileError("Give an output folder with -o, or --in-place to overwrite the presets")
+    renamed = failed = 0
+    for path, oldXname, renameError in renameXnames(args.paths, args.xname.upper(), args.output, loadUserXnames(), args.only and args.only.upper()):
+        if renameError:
+            failed += 1
+            print(f"FAILED  {path}: {renameError}")
+        else:
+            renamed += 1
+            print(f"{path}: {oldXname} -> {args.xname.upper()}")
+    print(f"{renamed} serialized presets renamed, {failed} failed")
+    return 1 if failed else 0
@@ -0,0 +1,165 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+
+## the app's settings and state in one place: the user XNAMEs, the recent folders and the preset history (which keeps its own
+## append-only log, see memphisrider.history). each file is read once and only read again when its mtime or size changed,
+## e.g. edited by hand or by another instance, and disk is checked at most every REFRESH_INTERVAL seconds, so re-opening
+## profiles costs no settings I/O at all. changes are only marked with changed(); flush() writes everything changed since the
+## last flush in one go, which the app calls a moment after the last change so a burst of edits is a single write
+
+import json
+import os
+import time
+
+from memphisrider.history import HISTORY_PATH, LEGACY_HISTORY_PATHS, PresetHistory
+
+## file name and the legacy names read when it doesn't exist yet, per setting
+SETTINGS_FILES = {"userXnames":("MemphisRider_userXnames.json", ("MemphisRider_userXnames.txt",)),
+                  "userDirPaths":("MemphisRider_userDirHistory.json", ("MemphisRider_userDirPaths.txt",))}
+DEFAULT_DIR_PATHS = {"openProfileDir":"", "importPresetDir":"", "exportPresetDir":"", "importSlotDir":"", "exportSlotDir":""}
+REFRESH_INTERVAL = 2.0
+
+## raised when a settings file can't be used
+class SettingsError(Exception):
+    pass
+
+## writes the settings files, returns (name, (path, mtime, size)) of each. only touches the files, so it can run on a writer
+## thread
+def writeFiles(writes):
+    writtenStamps = []
+    for name, path, settingsText in writes:
+        tempPath = path + ".tmp"
+        with open (tempPath, 'w') as settingsFile:
+            settingsFile.write(settingsText)
+        os.replace(tempPath, path)
+        fileStat = os.stat(path)
+        writtenStamps.append((name, (path, fileStat.st_mtime_ns, fileStat.st_size)))
+    return writtenStamps
+
+class SettingsStore:
+    def __init__(self, folder=''):
+        self.folder = folder
+        ## these stay the same objects for the store's lifetime, re-reads update them in place
+        self.userXnames = {}
+        self.userDirPaths = dict(DEFAULT_DIR_PATHS)
+        self.presetHistory = PresetHistory(os.path.join(folder, HISTORY_PATH), tuple(os.path.join(folder, path) for path in LEGACY_HISTORY_PATHS))
+        ## (path, mtime, size) of each file as last read or written, and when disk was last checked
+        self.stamps = {}
+        self.checkTimes = {}
+        self.changedNames = set()
+        ## flushed but not on disk yet, not re-read meanwhile
+        self.writingNames = set()
+        ## when set, e.g. to a BackgroundWriter's submit, flush() hands the writes to it as
+        ## submitWrite(task, *args, callback=..., errback=...); the task only writes the files, stamps are updated by the
+        ## callback on the calling thread
+        self.submitWrite = None
+
+    def paths(self, name):
+        path, legacyPaths = SETTINGS_FILES[name]
+        return [os.path.join(self.folder, candidate) for candidate in (path,) + legacyPaths]
+
+    def due(self, name, force):
+        checkTime = time.monotonic()
+        if not force and checkTime - self.checkTimes.get(name, -REFRESH_INTERVAL) < REFRESH_INTERVAL:
+            return False
+        self.checkTimes[name] = checkTime
+        return True
+
+    def stamp(self, name):
+        for path in self.paths(name):
+            try:
+                fileStat = os.stat(path)
+            except OSError:
+                continue
+            return (path, fileStat.st_mtime_ns, fileStat.st_size)
+        return None
+
+    ## re-reads a settings file if it changed on disk; edits not flushed yet win over the file. returns True when re-read
+    def refreshFile(self, name, force=False):
+        if name in self.changedNames or name in self.writingNames or not self.due(name, force):
+            return False
+        fileStamp = self.stamp(name)
+        if fileStamp == self.stamps.get(name):
+            return False
+        loaded = {}
+        if fileStamp is not None:
+            with open (fileStamp[0], 'r') as settingsFile:
+                try:
+                    loaded = json.load(settingsFile)
+                except json.decoder.JSONDecodeError:
+                    raise SettingsError(f'{fileStamp[0]} is corrupted or misconfigured.')
+            if not isinstance(loaded, dict):
+                raise SettingsError(f'{fileStamp[0]} is corrupted or misconfigured.')
+        settings = getattr(self, name)
+        settings.clear()
+        if name == "userDirPaths":
+            settings.update(DEFAULT_DIR_PATHS)
+        settings.update(loaded)
+        self.stamps[name] = fileStamp
+        return True
+
+    ## re-reads whatever changed on disk, returns the names of the settings that were re-read
+    def refresh(self, force=False):
+        refreshed = [name for name in SETTINGS_FILES if self.refreshFile(name, force)]
+        if self.due("presetHistory", force):
+            self.presetHistory.load()
+        return refreshed
+
+    ## marks a setting as edited, it's written by the next flush()
+    def changed(self, name):
+        self.changedNames.add(name)
+
+    ## writes every setting changed since the last flush, sorted like the app always wrote them
+    def flush(self):
+        writes = []
+        for name in sorted(self.changedNames):
+            settings = getattr(self, name)
+            if name == "userXnames":
+                settings = dict(sorted(settings.items(), key=lambda item: item[0]))
+            writes.append((name, self.paths(name)[0], json.dumps(settings, indent=4)))
+        self.writingNames.update(self.changedNames)
+        self.changedNames.clear()
+        if not writes:
+            return
+        if self.submitWrite is not None:
+            self.submitWrite(writeFiles, writes, callback=self.written, errback=lambda writeError: self.writeFailed(writes))
+            return
+        try:
+            writtenStamps = writeFiles(writes)
+        except OSError:
+            self.writeFailed(writes)
+            raise
+        self.written(writtenStamps)
+
+    ## our own writes aren't changes to read back
+    def written(self, writtenStamps):
+        for name, fileStamp in writtenStamps:
+            self.stamps[name] = fileStamp
+            self.writingNames.discard(name)
+
+    ## the settings are marked as changed again, so the next flush() retries them
+    def writeFailed(self, writes):
+        for name, path, settingsText in writes:
+            self.writingNames.discard(name)
+            self.changedNames.add(name)
@@ -0,0 +1,228 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## near-duplicate search over the 748 byte visual data of the presets and slots in the library index, e.g. to find the copies
+## of a livery that only differ in a part or two (the preset history only knows exact copies, by MD5).
+##
+## the visual data is kept as an (N, 187) uint32 array, one word per part field, in MemphisRider_similarityIndex.npz; it is
+## refreshed from the library index, only reading files whose size or mtime changed. the distance between two presets is the
+## number of fields that differ (or, with bits=True, the number of differing bits), computed for the whole library at once.
+## for fast lookups the fields are also bucketed by locality sensitive hashing: each of LSH_TABLES tables keys every preset by
+## LSH_FIELDS randomly picked fields, so presets that differ in only a few fields share a bucket in at least one table with
+## high probability, and only the presets sharing a bucket with the query are compared
+
+import os
+
+from memphisrider.core import PRESET_SIZE, PRESET_HEADER_SIZE, MY_CARS_SLOT_SIZE, SLOT_VISUAL, ProfileError
+from memphisrider.compress import CompressError, unpackData
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SIMILARITY_INDEX_PATH = "MemphisRider_similarityIndex.npz"
+
+VISUAL_SIZE = PRESET_SIZE - PRESET_HEADER_SIZE
+FIELD_COUNT = VISUAL_SIZE // 4
+
+LSH_TABLES = 8
+LSH_FIELDS = 24
+LSH_SEED = 0x55F0
+
+## raised when the similarity index can't be built or used
+class SimilarityError(Exception):
+    pass
+
+## the visual data of a preset (.bin) or slot (.u2cc) file, None for anything else
+def readVisualData(path):
+    extension = os.path.splitext(path)[1].lower()
+    with open (path, 'rb') as libraryFile:
+        data = libraryFile.read(max(PRESET_SIZE, MY_CARS_SLOT_SIZE) + 1)
+    try:
+        data = unpackData(data)
+    except CompressError:
+        return None
+    if extension == ".bin" and len(data) == PRESET_SIZE:
+        return data[PRESET_HEADER_SIZE:PRESET_SIZE]
+    if extension == ".u2cc" and len(data) == MY_CARS_SLOT_SIZE:
+        return data[SLOT_VISUAL]
+    return None
+
+## number of set bits of every byte value, for bit distances without numpy.bitwise_count (NumPy < 2.0)
+def popcountTable():
+    return numpy.unpackbits(numpy.arange(256, dtype=numpy.uint8)[:, None], axis=1).sum(axis=1, dtype=numpy.uint16)
+
+class SimilarityIndex:
+    def __init__(self, path=SIMILARITY_INDEX_PATH):
+        if numpy is None:
+            raise SimilarityError("Similarity search needs NumPy, install it with: pip install numpy")
+        self.path = path
+        self.paths = []
+        self.stamps = numpy.empty((0, 2), dtype=numpy.int64)
+        self.fields = numpy.empty((0, FIELD_COUNT), dtype=numpy.uint32)
+        self.tables = None
+
+    def load(self):
+        if os.path.isfile(self.path):
+            try:
+                with numpy.load(self.path, allow_pickle=False) as index:
+                    paths, stamps, fields = index["paths"], index["stamps"], index["fields"]
+            except (ValueError, KeyError, OSError):
+                raise SimilarityError(f'{self.path} is corrupted or misconfigured.')
+            if fields.ndim == 2 and fields.shape[1] == FIELD_COUNT and len(paths) == len(fields) == len(stamps):
+                self.paths = paths.tolist()
+                self.stamps = stamps
+                self.fields = fields
+                self.tables = None
+        return self
+
+    def save(self):
+        tempPath = self.path + ".tmp.npz"
+        numpy.savez(tempPath, paths=numpy.array(self.paths, dtype=str), stamps=self.stamps, fields=self.fields)
+        os.replace(tempPath, self.path)
+
+    ## brings the index in line with a LibraryIndex: presets and slots that are new or changed (by size and mtime) are read,
+    ## the others keep their rows. returns the number of files read
+    def update(self, libraryIndex):
+        rows = {path: row for row, path in enumerate(self.paths)}
+        paths = []
+        stamps = []
+        fields = []
+        readCount = 0
+        for path, entry in sorted(libraryIndex.files.items()):
+            if entry["kind"] not in ("preset", "slot"):
+                continue
+            stamp = (entry["size"], entry["mtime"])
+            row = rows.get(path)
+            if row is not None and tuple(self.stamps[row]) == stamp:
+                visualFields = self.fields[row]
+            else:
+                try:
+                    visualData = readVisualData(path)
+                except OSError:
+                    continue
+                readCount += 1
+                if visualData is None:
+                    continue
+                visualFields = numpy.frombuffer(visualData, dtype=numpy.uint32)
+            paths.append(path)
+            stamps.append(stamp)
+            fields.append(visualFields)
+        self.paths = paths
+        self.stamps = numpy.array(stamps, dtype=numpy.int64).reshape(-1, 2)
+        self.fields = numpy.array(fields, dtype=numpy.uint32).reshape(-1, FIELD_COUNT)
+        self.tables = None
+        return readCount
+
+    def __len__(self):
+        return len(self.paths)
+
+    ## distance of every indexed preset (or just the given rows) to the visual data
+    def distances(self, visualData, rows=None, bits=False):
+        query = numpy.frombuffer(bytes(visualData), dtype=numpy.uint32)
+        if len(query) != FIELD_COUNT:
+            raise SimilarityError(f"Visual data must be {VISUAL_SIZE} bytes")
+        fields = self.fields if rows is None else self.fields[rows]
+        if not bits:
+            return (fields != query).sum(axis=1)
+        difference = fields ^ query
+        if hasattr(numpy, "bitwise_count"):
+            return numpy.bitwise_count(difference).sum(axis=1, dtype=numpy.int64)
+        return popcountTable()[difference.view(numpy.uint8)].sum(axis=1, dtype=numpy.int64)
+
+    ## for each LSH table: (picked fields, multipliers, sorted bucket keys, rows in key order)
+    def buildTables(self):
+        random = numpy.random.default_rng(LSH_SEED)
+        self.tables = []
+        for table in range(LSH_TABLES):
+            picked = random.choice(FIELD_COUNT, LSH_FIELDS, replace=False)
+            multipliers = random.integers(1, 1 << 63, LSH_FIELDS, dtype=numpy.uint64) | numpy.uint64(1)
+            keys = self.bucketKeys(self.fields, picked, multipliers)
+            order = numpy.argsort(keys, kind='stable')
+            self.tables.append((picked, multipliers, keys[order], order))
+
+    @staticmethod
+    def bucketKeys(fields, picked, multipliers):
+        with numpy.errstate(over='ignore'):
+            return (fields[:, picked].astype(numpy.uint64) * multipliers).sum(axis=1, dtype=numpy.uint64)
+
+    ## rows sharing an LSH bucket with the visual data in any table
+    def candidates(self, visualData):
+        if self.tables is None:
+            self.buildTables()
+        query = numpy.frombuffer(bytes(visualData), dtype=numpy.uint32).reshape(1, FIELD_COUNT)
+        rows = []
+        for picked, multipliers, sortedKeys, order in self.tables:
+            key = self.bucketKeys(query, picked, multipliers)[0]
+            rows.append(order[numpy.searchsorted(sortedKeys, key, 'left'):numpy.searchsorted(sortedKeys, key, 'right')])
+        return numpy.unique(numpy.concatenate(rows))
+
+    ## presets/slots within maxDistance differing fields of the visual data, closest first, as (path, distance);
+    ## exact=True compares the whole library instead of the LSH candidates, which also finds the rare near-duplicates LSH misses
+    def search(self, visualData, maxDistance=8, limit=20, exact=False, bits=False):
+        if not len(self.paths):
+            return []
+        rows = None if exact else self.candidates(visualData)
+        distances = self.distances(visualData, rows, bits)
+        if rows is None:
+            rows = numpy.arange(len(self.paths))
+        close = distances <= maxDistance
+        rows, distances = rows[close], distances[close]
+        order = numpy.argsort(distances, kind='stable')[:limit]
+        return [(self.paths[rows[i]], int(distances[i])) for i in order]
+
+## the similarity index, brought up to date with the library index and saved if anything was read
+def loadSimilarityIndex(libraryIndex, path=SIMILARITY_INDEX_PATH):
+    similarityIndex = SimilarityIndex(path).load()
+    if similarityIndex.update(libraryIndex) or not os.path.isfile(path):
+        similarityIndex.save()
+    return similarityIndex
+
+## visual data to search for: a preset, slot file, or a slot of a profile (slot counted from 1, garage "mycars" or "career")
+def queryVisualData(path, garage=None, slot=None):
+    if slot is not None:
+        from memphisrider.core import Profile, MY_CARS, CAREER
+        with Profile.open(path) as profile:
+            garageId = MY_CARS if garage in (None, "mycars") else CAREER
+            if not 1 <= slot <= profile.slotCount(garageId):
+                raise ProfileError(f"{path} has no slot {slot} in that garage")
+            return bytes(profile.slotVisualData(garageId, slot - 1))
+    visualData = readVisualData(path)
+    if visualData is None:
+        raise ProfileError(f"{path} is not an unserialized preset (.bin) or slot file (.u2cc)")
+    return visualData
+
+def main(args):
+    from memphisrider.library import LibraryIndex
+    libraryIndex = LibraryIndex(args.index).load()
+    if not libraryIndex.files:
+        raise SimilarityError(f'{args.index} is empty, index your presets first with the index command')
+    similarityIndex = loadSimilarityIndex(libraryIndex, args.similarity_index)
+    visualData = queryVisualData(args.query, args.garage, args.slot)
+    matches = similarityIndex.search(visualData, args.max_distance, args.limit, args.exact, args.bits)
+    unit = "bits" if args.bits else "fields"
+    for path, distance in matches:
+        print(f"{distance:>5} {unit}  {path}")
+    if not matches:
+        print(f"No presets within {args.max_distance} differing {unit} among {len(similarityIndex)} indexed presets and slots")
+    return 0
@@ -0,0 +1,72 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## garage sorting: builds the slot order for a sort key, which Profile.permuteSlots then applies in one pass.
+##
+## keys are "xname" (car name, unknown cars by hash), "presetName" (the name the preset history knows the slot's customization
+## by, falling back to the car name), "custom" (the order of XNAMEs or preset names listed in a file, one per line; slots that
+## aren't listed keep their order after the listed ones) and "none" (keep the order, e.g. to only move empty slots to the end).
+## sorting is stable, and empty slots go last when emptyLast is set
+
+from memphisrider.core import ProfileError, builtinXnameIndex
+
+sortKeys = ("xname", "presetName", "custom", "none")
+
+## reads a custom order file, one XNAME or preset name per line; blank lines and lines starting with # are skipped
+def loadCustomOrder(path):
+    customOrder = []
+    with open (path, 'r') as orderFile:
+        for line in orderFile:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                customOrder.append(line.upper())
+    return customOrder
+
+## slot order (old slot index for each new position) for a garage sorted by key
+def sortOrder(profile, garage, key="xname", emptyLast=True, xnameIndex=builtinXnameIndex, presetHistory={}, customOrder=()):
+    if key not in sortKeys:
+        raise ProfileError(f'Unknown sort key "{key}", expected one of {", ".join(sortKeys)}')
+    customRanks = {name:rank for rank, name in reversed(list(enumerate(customOrder)))}
+
+    def slotSortKey(index):
+        empty = profile.isSlotEmpty(garage, index)
+        emptyRank = 1 if empty and emptyLast else 0
+        if empty or key == "none":
+            return (emptyRank, 0, "")
+        xname = profile.slotXname(garage, index, xnameIndex)
+        if key == "xname":
+            return (emptyRank, 0, xname)
+        historyEntry = presetHistory.get(profile.slotFingerprint(garage, index)) if key in ("presetName", "custom") else None
+        presetName = historyEntry["presetName"].upper() if historyEntry else None
+        if key == "presetName":
+            return (emptyRank, 0, presetName or xname)
+        ## custom: a listed preset name wins over a listed XNAME
+        for name in (presetName, xname):
+            if name in customRanks:
+                return (emptyRank, customRanks[name], "")
+        return (emptyRank, len(customRanks), "")
+
+    return sorted(range(profile.slotCount(garage)), key=slotSortKey)
+
+## sorts a garage in place, returns True if anything moved
+def sortGarage(profile, garage, key="xname", emptyLast=True, xnameIndex=builtinXnameIndex, presetHistory={}, customOrder=()):
+    return profile.permuteSlots(garage, sortOrder(profile, garage, key, emptyLast, xnameIndex, presetHistory, customOrder))
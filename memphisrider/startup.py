@@ -0,0 +1,70 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## startup timing for MemphisRider.py --profile-startup: the time spent in each startup phase (imports, building the window,
+## first paint and the loading deferred until after it) and the number of modules each phase imported.
+## for a per-module breakdown of the imports, run python -X importtime MemphisRider.py
+
+import sys
+import time
+
+## time from starting the script to the first paint of the window that we aim to stay under on low-end machines, in seconds
+FIRST_PAINT_BUDGET = 0.3
+
+## start is the perf_counter time the script started at, cpuBefore the process time used by then (the interpreter's own startup)
+class StartupProfile:
+    def __init__(self, enabled, start=None, cpuBefore=0.0, moduleCount=0):
+        self.enabled = enabled
+        self.start = start if start is not None else time.perf_counter()
+        self.cpuBefore = cpuBefore
+        self.last = self.start
+        self.moduleCount = moduleCount
+        self.phases = []
+        self.firstPaint = None
+
+    ## ends a phase; when is the perf_counter time it ended at, if it wasn't just now
+    def mark(self, phase, when=None, moduleCount=None):
+        if not self.enabled:
+            return
+        now = when if when is not None else time.perf_counter()
+        modules = moduleCount if moduleCount is not None else len(sys.modules)
+        self.phases.append((phase, now - self.last, modules - self.moduleCount))
+        self.last = now
+        self.moduleCount = modules
+
+    ## marks the end of the phase after which the window is on screen
+    def markFirstPaint(self, phase):
+        self.mark(phase)
+        if self.enabled:
+            self.firstPaint = self.last - self.start
+
+    def report(self, file=sys.stderr):
+        if not self.enabled:
+            return
+        print(f"{'phase':<32}{'ms':>9}{'modules':>9}", file=file)
+        print(f"{'interpreter (CPU time)':<32}{self.cpuBefore*1000:>9.1f}{'':>9}", file=file)
+        for phase, duration, modules in self.phases:
+            print(f"{phase:<32}{duration*1000:>9.1f}{modules:>9}", file=file)
+        print(f"{'total':<32}{(self.last - self.start)*1000:>9.1f}{len(sys.modules):>9}", file=file)
+        if self.firstPaint is not None:
+            verdict = "within" if self.firstPaint <= FIRST_PAINT_BUDGET else "OVER"
+            print(f"first paint after {self.firstPaint*1000:.1f} ms, {verdict} the {FIRST_PAINT_BUDGET*1000:.0f} ms budget", file=file)
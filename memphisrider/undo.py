@@ -0,0 +1,114 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+## multi-level undo/redo for profile edits. an entry only holds the regions (slots, career inventories, header fields) an edit
+## changed, each as the zlib-compressed XOR of the old and new bytes: XORing it onto the region turns new into old and back,
+## so the same diff serves undo and redo, and the unchanged bytes of a slot compress down to almost nothing.
+## the oldest entries are dropped once the entries take more than memoryLimit bytes
+
+import collections
+import zlib
+
+DEFAULT_UNDO_MEMORY = 16 << 20
+
+## XOR of two equal length byte strings, through ints since Python has no bytewise XOR for bytes
+def xorBytes(a, b):
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+class UndoEntry:
+    __slots__ = ("label", "diffs", "size")
+
+    ## diffs is a list of (region, offset, length, compressed XOR diff)
+    def __init__(self, label, diffs):
+        self.label = label
+        self.diffs = diffs
+        self.size = sum(len(diff) for region, offset, length, diff in diffs) + 64 * len(diffs)
+
+class UndoHistory:
+    def __init__(self, memoryLimit=DEFAULT_UNDO_MEMORY):
+        self.memoryLimit = memoryLimit
+        self.undoEntries = collections.deque()
+        self.redoEntries = []
+        self.size = 0
+
+    ## builds an entry from {region: (offset, old bytes)} and the buffer after the edit; regions that ended up unchanged are left out
+    def record(self, label, oldRegions, view):
+        diffs = []
+        for region, (offset, oldData) in oldRegions.items():
+            newData = view[offset:offset+len(oldData)]
+            if newData != oldData:
+                diffs.append((region, offset, len(oldData), zlib.compress(xorBytes(oldData, newData), 1)))
+        if not diffs:
+            return None
+        entry = UndoEntry(label, diffs)
+        self.undoEntries.append(entry)
+        self.size += entry.size
+        for redoEntry in self.redoEntries:
+            self.size -= redoEntry.size
+        self.redoEntries.clear()
+        self.evict()
+        return entry
+
+    ## drops the oldest undo entries until everything fits in memoryLimit again (the newest entry is always kept)
+    def evict(self):
+        while self.size > self.memoryLimit and len(self.undoEntries) > 1:
+            self.size -= self.undoEntries.popleft().size
+
+    def setMemoryLimit(self, memoryLimit):
+        self.memoryLimit = memoryLimit
+        self.evict()
+
+    def canUndo(self):
+        return bool(self.undoEntries)
+
+    def canRedo(self):
+        return bool(self.redoEntries)
+
+    ## XORs an entry's diffs onto the buffer, calling markDirty for every region it touches
+    def apply(self, entry, view, markDirty):
+        for region, offset, length, diff in entry.diffs:
+            markDirty(region)
+            view[offset:offset+length] = xorBytes(view[offset:offset+length], zlib.decompress(diff))
+
+    ## reverts the newest edit, returns its label (None if there's nothing to undo)
+    def undo(self, view, markDirty):
+        if not self.undoEntries:
+            return None
+        entry = self.undoEntries.pop()
+        self.apply(entry, view, markDirty)
+        self.redoEntries.append(entry)
+        return entry.label
+
+    ## re-applies the newest undone edit, returns its label (None if there's nothing to redo)
+    def redo(self, view, markDirty):
+        if not self.redoEntries:
+            return None
+        entry = self.redoEntries.pop()
+        self.apply(entry, view, markDirty)
+        self.undoEntries.append(entry)
+        return entry.label
+
+    def undoLabel(self):
+        return self.undoEntries[-1].label if self.undoEntries else None
+
+    def redoLabel(self):
+        return self.redoEntries[-1].label if self.redoEntries else None
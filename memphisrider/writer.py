@@ -0,0 +1,78 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+
+## background writer: file writes run one at a time on a single thread, in the order they were submitted, so a slow (e.g.
+## network) drive doesn't freeze the app while a profile or history file is written. finished writes wait in a queue until
+## poll() is called from the app's own thread (the GUI polls with Tk's after()), so callbacks run on that thread, in
+## submission order as well; flush() waits for everything submitted so far, e.g. before exiting
+
+import queue
+import threading
+
+class BackgroundWriter:
+    def __init__(self):
+        self.tasks = queue.Queue()
+        self.finished = queue.Queue()
+        ## submitted writes whose callbacks haven't run yet; only touched by the submitting thread
+        self.pending = 0
+        self.thread = None
+
+    ## queues task(*args); callback(result) or errback(error) is run by a later poll()/flush(). without an errback the
+    ## error is raised from poll()
+    def submit(self, task, *args, callback=None, errback=None):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="MemphisRider writer", daemon=True)
+            self.thread.start()
+        self.pending += 1
+        self.tasks.put((task, args, callback, errback))
+
+    def run(self):
+        while True:
+            task, args, callback, errback = self.tasks.get()
+            try:
+                self.finished.put((callback, errback, task(*args), None))
+            except Exception as writeError:
+                self.finished.put((callback, errback, None, writeError))
+            self.tasks.task_done()
+
+    ## runs the callbacks of the writes finished so far, returns how many are still pending
+    def poll(self):
+        while True:
+            try:
+                callback, errback, result, writeError = self.finished.get_nowait()
+            except queue.Empty:
+                return self.pending
+            self.pending -= 1
+            if writeError is not None:
+                if errback is None:
+                    raise writeError
+                errback(writeError)
+            elif callback is not None:
+                callback(result)
+
+    ## waits until every write submitted so far is done, then runs their callbacks
+    def flush(self):
+        if self.thread is not None:
+            self.tasks.join()
+        return self.poll()
@@ -0,0 +1,62 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+## shared by the tests: a scratch folder per test, and the generators of the benchmark corpus for profiles, presets and slots
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+rootDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, rootDir)
+sys.path.insert(0, os.path.join(rootDir, "benchmarks"))
+
+from corpus import carXnames, makePreset, makeProfile, makeSlotPair, randomBytes
+
+## a test case with its own scratch folder and random generator
+class ScratchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.scratch = tempfile.mkdtemp(prefix="memphisrider_test_")
+        self.addCleanup(shutil.rmtree, self.scratch, True)
+        self.rng = random.Random(2004)
+
+    def path(self, *names):
+        return os.path.join(self.scratch, *names)
+
+    def readBytes(self, path):
+        with open (path, 'rb') as dataFile:
+            return dataFile.read()
+
+    def writeBytes(self, path, data):
+        with open (path, 'wb') as dataFile:
+            dataFile.write(data)
+        return path
+
+    ## writes a generated profile (every slot filled by default) and returns its path
+    def saveProfile(self, name="PROFILE", fillRatio=1.0):
+        path = self.path(name)
+        makeProfile(self.rng, fillRatio).saveAs(path)
+        return path
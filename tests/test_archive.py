@@ -0,0 +1,86 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import hashlib
+import os
+import unittest
+
+from common import ScratchTestCase, carXnames, randomBytes
+
+import memphisrider
+from memphisrider import MY_CARS, CAREER
+
+class ArchiveTest(ScratchTestCase):
+    def setUp(self):
+        super().setUp()
+        os.makedirs(self.path("library", "slots"))
+        self.presetData = randomBytes(self.rng, 748)
+        self.writeBytes(self.path("library", "SUPRA.bin"), memphisrider.buildPreset(carXnames[0], "SUPRA", self.presetData, 3))
+        profilePath = self.saveProfile()
+        with memphisrider.Profile.open(profilePath) as profile:
+            self.slotData, self.inventoryData = profile.exportSlot(CAREER, 0)
+        self.writeBytes(self.path("library", "slots", "career.u2cc"), self.slotData)
+        self.writeBytes(self.path("library", "slots", "career.u2ci"), self.inventoryData)
+        self.writeBytes(self.path("library", "notes.txt"), b'not a preset')
+        self.archivePath = self.path("library.mra")
+        self.assertEqual(memphisrider.packArchive(self.archivePath, [self.path("library")]), (3, 1))
+
+    def testFind(self):
+        with memphisrider.Archive(self.archivePath) as archive:
+            self.assertEqual(len(archive), 3)
+            self.assertEqual(sorted(entry.name for entry in archive), ["SUPRA.bin", "slots/career.u2cc", "slots/career.u2ci"])
+            preset = archive.find("SUPRA.bin")
+            self.assertIsNotNone(preset)
+            self.assertIsNone(archive.find("MISSING.bin"))
+            self.assertEqual(bytes(memphisrider.readPreset(archive.data(preset))["data"]), self.presetData)
+            fingerprint = hashlib.md5(self.presetData).hexdigest()
+            self.assertEqual([entry.name for entry in archive.findFingerprint(fingerprint)], ["SUPRA.bin"])
+            self.assertEqual([entry.name for entry in archive.findXname(carXnames[0])], ["SUPRA.bin"])
+            self.assertEqual(archive.findXname(memphisrider.xnames[carXnames[0]])[0].name, "SUPRA.bin")
+            slot = archive.find("slots/career.u2cc")
+            self.assertEqual(archive.entry(slot.inventory).name, "slots/career.u2ci")
+
+    def testImport(self):
+        profilePath = self.saveProfile("TARGET")
+        with memphisrider.Profile.open(profilePath) as profile, memphisrider.Archive(self.archivePath) as archive:
+            memphisrider.importEntry(profile, MY_CARS, 1, archive, archive.find("SUPRA.bin"))
+            self.assertEqual(bytes(profile.slotVisualData(MY_CARS, 1)), self.presetData)
+            self.assertEqual(profile.slotXname(MY_CARS, 1), carXnames[0])
+            memphisrider.importEntry(profile, CAREER, 1, archive, archive.find("slots/career.u2cc"))
+            self.assertEqual(profile.exportSlot(CAREER, 1)[1], self.inventoryData)
+            with self.assertRaises(memphisrider.ProfileError):
+                memphisrider.importEntry(profile, CAREER, 2, archive, archive.find("slots/career.u2ci"))
+
+    def testUnpack(self):
+        with memphisrider.Archive(self.archivePath) as archive:
+            self.assertEqual(archive.unpack(self.path("out")), 3)
+        self.assertEqual(self.readBytes(self.path("out", "slots", "career.u2cc")), self.slotData)
+        self.assertEqual(self.readBytes(self.path("out", "SUPRA.bin")), self.readBytes(self.path("library", "SUPRA.bin")))
+
+    def testNotAnArchive(self):
+        self.writeBytes(self.path("bad.mra"), bytes(200))
+        with self.assertRaises(memphisrider.ArchiveError):
+            memphisrider.Archive(self.path("bad.mra"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import os
+import unittest
+from unittest import mock
+
+from common import ScratchTestCase
+
+import memphisrider
+from memphisrider import MY_CARS, CAREER
+from memphisrider import core
+from memphisrider.backup import deltaPath, addDelta, parseDeltas
+
+class DeltaBackupTest(ScratchTestCase):
+    ## saves a few edits with backups, returns the profile data after each save (the first one before any)
+    def saveEdits(self, path, compressor=None):
+        states = [self.readBytes(path)]
+        for garage, index in ((MY_CARS, 0), (CAREER, 2), (MY_CARS, 4)):
+            with memphisrider.Profile.open(path) as profile:
+                profile.clearSlot(garage, index)
+                profile.save(backup=True, compressor=compressor)
+            states.append(self.readBytes(path))
+        return states
+
+    def testRestoreSteps(self):
+        path = self.saveProfile()
+        states = self.saveEdits(path)
+        self.assertEqual(len(memphisrider.readDeltas(path)), 3)
+        memphisrider.restoreDeltas(path)
+        self.assertEqual(self.readBytes(path), states[2])
+        memphisrider.restoreDeltas(path, 2)
+        self.assertEqual(self.readBytes(path), states[0])
+        self.assertFalse(os.path.isfile(deltaPath(path)))
+        with self.assertRaises(memphisrider.ProfileError):
+            memphisrider.restoreDeltas(path)
+
+    def testCompressedBackups(self):
+        path = self.saveProfile()
+        compressor = memphisrider.Compressor()
+        states = self.saveEdits(path, compressor)
+        memphisrider.restoreDeltas(path, 3, compressor=compressor)
+        self.assertEqual(self.readBytes(path), states[0])
+
+    def testChangedProfileIsRefused(self):
+        path = self.saveProfile()
+        states = self.saveEdits(path)
+        changedData = bytearray(states[-1])
+        changedData[100] ^= 0xFF
+        self.writeBytes(path, changedData)
+        with self.assertRaises(memphisrider.ProfileError):
+            memphisrider.restoreDeltas(path)
+        memphisrider.restoreDeltas(path, force=True)
+        restoredData = self.readBytes(path)
+        offset, length = memphisrider.slotRegion(MY_CARS, 4)
+        self.assertEqual(restoredData[offset:offset+length], states[2][offset:offset+length])
+
+    def testTornRecordIsDropped(self):
+        path = self.saveProfile()
+        states = self.saveEdits(path)
+        with open (deltaPath(path), 'ab') as deltaFile:
+            deltaFile.write(b'\x01\x02\x03')
+        records, validLength = parseDeltas(path)
+        self.assertEqual(len(records), 3)
+        ## the next backup replaces the torn tail instead of appending after it
+        newData = bytearray(states[-1])
+        newData[200:210] = bytes(10)
+        addDelta(path, [(200, 10)], newData)
+        self.assertEqual(len(parseDeltas(path)[0]), 4)
+        self.assertEqual(os.path.getsize(deltaPath(path)), parseDeltas(path)[1])
+
+class AtomicSaveTest(ScratchTestCase):
+    def testFailedSaveKeepsTheProfile(self):
+        path = self.saveProfile()
+        originalData = self.readBytes(path)
+        with memphisrider.Profile.open(path) as profile:
+            profile.clearSlot(MY_CARS, 0)
+            with mock.patch.object(core.os, "replace", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    profile.save()
+        self.assertEqual(self.readBytes(path), originalData)
+        self.assertEqual(os.listdir(self.scratch), ["PROFILE"])
+
+    def testOnlyThePlanIsWritten(self):
+        path = self.saveProfile()
+        with memphisrider.Profile.open(path) as profile:
+            profile.clearSlot(CAREER, 1)
+            editedData = bytearray(profile.buffer)
+        ## bytes outside the plan come from the file on disk, not from the buffer
+        onDisk = bytearray(self.readBytes(path))
+        onDisk[0:4] = b'TEST'
+        self.writeBytes(path, onDisk)
+        core.writeProfile(path, editedData, {(CAREER, 1)})
+        savedData = self.readBytes(path)
+        offset, length = memphisrider.slotRegion(CAREER, 1)
+        self.assertEqual(savedData[0:4], b'TEST')
+        self.assertEqual(savedData[offset:offset+length], editedData[offset:offset+length])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import json
+import os
+import unittest
+
+from common import ScratchTestCase, carXnames, makeProfile, randomBytes
+
+import memphisrider
+from memphisrider import MY_CARS, CAREER, batch
+from memphisrider.core import SLOT_PERF
+
+class BatchTest(ScratchTestCase):
+    def setUp(self):
+        super().setUp()
+        os.makedirs(self.path("profiles"))
+        self.profilePaths = []
+        for i in range(3):
+            path = self.path("profiles", f"LEAGUE{i}")
+            makeProfile(self.rng, 1.0).saveAs(path)
+            self.profilePaths.append(path)
+        self.presetData = randomBytes(self.rng, 748)
+        self.writeBytes(self.path("SUPRA.bin"), memphisrider.buildPreset(carXnames[0], "SUPRA", self.presetData, 2))
+
+    def runOperations(self, operations, profilePaths=None, userXnames={}, **options):
+        parsed = batch.parseOperations(operations, self.scratch)
+        results = list(batch.runBatch(profilePaths or self.profilePaths, parsed, userXnames, workers=1, **options))
+        return {path: (success, messages) for path, success, messages in results}
+
+    def slotPerf(self, path, garage, index):
+        with memphisrider.Profile.open(path) as profile:
+            return bytes(profile.slots(garage)[index][SLOT_PERF])
+
+    def testOperations(self):
+        results = self.runOperations([
+            {"op": "importPreset", "garage": "myCars", "slot": 3, "file": "SUPRA.bin"},
+            {"op": "clearSlot", "garage": "career", "slot": 2},
+            {"op": "moveSlot", "garage": "myCars", "slot": 3, "to": 1},
+            {"op": "exportSlots", "garage": "myCars", "slot": 1, "dir": "exports/{profile}"}])
+        for path in self.profilePaths:
+            self.assertEqual(results[path][0], True, results[path][1])
+            with memphisrider.Profile.open(path) as profile:
+                self.assertEqual(bytes(profile.slotVisualData(MY_CARS, 0)), self.presetData)
+                self.assertTrue(profile.isSlotEmpty(CAREER, 1))
+            exportPath = self.path("exports", os.path.basename(path), f"{os.path.basename(path)}_myCars01.u2cc")
+            self.assertEqual(self.readBytes(exportPath)[28:776], self.presetData)
+
+    def testPerfLevels(self):
+        path = self.profilePaths[0]
+        keptPerf = self.slotPerf(path, MY_CARS, 1)
+        results = self.runOperations([
+            {"op": "importPreset", "garage": "myCars", "slot": 1, "file": "SUPRA.bin"},
+            {"op": "importPreset", "garage": "myCars", "slot": 2, "file": "SUPRA.bin", "perfLevel": "keep"},
+            {"op": "importPreset", "garage": "myCars", "slot": 3, "file": "SUPRA.bin", "perfLevel": 0}], [path])
+        self.assertTrue(results[path][0], results[path][1])
+        self.assertEqual(self.slotPerf(path, MY_CARS, 0), memphisrider.perfLevels[2])
+        self.assertEqual(self.slotPerf(path, MY_CARS, 1), keptPerf)
+        self.assertEqual(self.slotPerf(path, MY_CARS, 2), memphisrider.perfLevels[0])
+
+    def testInvalidOperations(self):
+        invalidOperations = [
+            {"op": "explode", "garage": "myCars", "slot": 1},
+            {"op": "clearSlot", "garage": "garage", "slot": 1},
+            {"op": "clearSlot", "garage": "career", "slot": 6},
+            {"op": "moveSlot", "garage": "myCars", "slot": 1},
+            {"op": "importSlot", "garage": "myCars", "slot": 1},
+            {"op": "importPreset", "garage": "myCars", "slot": 1, "file": "SUPRA.bin", "perfLevel": True},
+            {"op": "importPreset", "garage": "myCars", "slot": 1, "file": "SUPRA.bin", "perfLevel": 1.0},
+            {"op": "importPreset", "garage": "myCars", "slot": 1, "file": "SUPRA.bin", "perfLevel": 4},
+            {"op": "sortSlots", "key": "colour"}]
+        for operation in invalidOperations:
+            with self.assertRaises(batch.ManifestError, msg=json.dumps(operation)):
+                batch.parseOperations([operation], self.scratch)
+
+    def testFailuresStayPerProfile(self):
+        brokenPath = self.path("profiles", "BROKEN")
+        self.writeBytes(brokenPath, bytes(memphisrider.PROFILE_SIZE - 1))
+        self.writeBytes(self.path("ADDON.bin"), memphisrider.buildPreset("ADDON", "ADDON", self.presetData))
+        results = self.runOperations([{"op": "clearSlot", "garage": "myCars", "slot": 1}], self.profilePaths + [brokenPath])
+        self.assertFalse(results[brokenPath][0])
+        self.assertTrue(all(results[path][0] for path in self.profilePaths))
+        ## an unexpected error (here a user XNAME hash too long to store) fails each profile on its own instead of ending the batch
+        results = self.runOperations([{"op": "importPreset", "garage": "myCars", "slot": 2, "file": "ADDON.bin"}],
+                                     userXnames={"ADDON": "0x123456789"})
+        self.assertEqual(len(results), len(self.profilePaths))
+        self.assertFalse(any(success for success, messages in results.values()))
+        self.assertIn("error:", results[self.profilePaths[0]][1][-1])
+        ## malformed hashes are refused up front
+        with self.assertRaises(batch.ManifestError):
+            self.runOperations([{"op": "clearSlot", "garage": "myCars", "slot": 1}], userXnames={"ADDON": "0xNOTAHASH"})
+
+    def testFailedProfileIsNotSaved(self):
+        path = self.profilePaths[0]
+        originalData = self.readBytes(path)
+        results = self.runOperations([{"op": "clearSlot", "garage": "myCars", "slot": 1},
+                                      {"op": "importSlot", "garage": "myCars", "slot": 2, "file": "MISSING.u2cc"}], [path])
+        self.assertFalse(results[path][0])
+        self.assertEqual(self.readBytes(path), originalData)
+
+    def testDryRun(self):
+        originalData = [self.readBytes(path) for path in self.profilePaths]
+        results = self.runOperations([{"op": "clearSlot", "garage": "myCars", "slot": 1}], dryRun=True)
+        self.assertTrue(all(success for success, messages in results.values()))
+        self.assertEqual([self.readBytes(path) for path in self.profilePaths], originalData)
+
+    def testWorkerProcesses(self):
+        parsed = batch.parseOperations([{"op": "clearSlot", "garage": "myCars", "slot": 1}], self.scratch)
+        results = list(batch.runBatch(self.profilePaths, parsed, workers=2))
+        self.assertEqual(sorted(path for path, success, messages in results if success), sorted(self.profilePaths))
+        for path in self.profilePaths:
+            with memphisrider.Profile.open(path) as profile:
+                self.assertTrue(profile.isSlotEmpty(MY_CARS, 0))
+
+    def testFindProfiles(self):
+        self.writeBytes(self.path("profiles", "notes.txt"), b'not a profile')
+        self.assertEqual(sorted(batch.findProfiles([self.path("profiles")])), sorted(self.profilePaths))
+
+if __name__ == '__main__':
+    unittest.main()
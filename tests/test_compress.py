@@ -0,0 +1,77 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import unittest
+
+from common import ScratchTestCase, carXnames, makeProfile, randomBytes
+
+import memphisrider
+from memphisrider import MY_CARS
+
+class CompressTest(ScratchTestCase):
+    def samples(self):
+        profile = makeProfile(self.rng)
+        return [profile.exportSlot(MY_CARS, index)[0] for index in range(memphisrider.MY_CARS_COUNT)]
+
+    def testRoundTripWithoutDictionary(self):
+        compressor = memphisrider.Compressor()
+        for data in self.samples():
+            packed = compressor.compress(data)
+            self.assertLess(len(packed), len(data))
+            self.assertEqual(compressor.decompress(packed), data)
+            self.assertEqual(memphisrider.unpackData(packed, compressor), data)
+
+    def testRoundTripWithDictionary(self):
+        samples = self.samples()
+        compressor = memphisrider.Compressor(memphisrider.trainDictionary(samples))
+        self.assertIsNotNone(compressor.dictionary)
+        for data in samples:
+            self.assertEqual(compressor.decompress(compressor.compress(data)), data)
+        ## data packed with a dictionary can't be read without it
+        with self.assertRaises(memphisrider.CompressError):
+            memphisrider.Compressor().decompress(compressor.compress(samples[0]))
+
+    def testIncompressibleIsStored(self):
+        compressor = memphisrider.Compressor()
+        data = randomBytes(self.rng, 1000)
+        self.assertEqual(compressor.decompress(compressor.compress(data)), data)
+
+    def testFiles(self):
+        compressor = memphisrider.Compressor()
+        preset = memphisrider.buildPreset(carXnames[0], "PACKED", randomBytes(self.rng, 748))
+        plainPath = self.writeBytes(self.path("plain.bin"), preset)
+        packedPath = self.writeBytes(self.path("packed.bin"), compressor.compress(preset))
+        self.assertEqual(memphisrider.readFile(plainPath, compressor), preset)
+        self.assertEqual(memphisrider.readFile(packedPath, compressor), preset)
+
+    def testCorruptedData(self):
+        compressor = memphisrider.Compressor()
+        packed = bytearray(compressor.compress(self.samples()[0]))
+        packed[-5:] = bytes(5)
+        with self.assertRaises(memphisrider.CompressError):
+            compressor.decompress(bytes(packed))
+        with self.assertRaises(memphisrider.CompressError):
+            compressor.decompress(b'plain data')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import itertools
+import unittest
+from unittest import mock
+
+import common
+
+import memphisrider
+from memphisrider import crack
+
+## the raw hash state of a name, one character at a time
+def rawHash(name):
+    state = 0xFFFFFFFF
+    for char in name.encode('ascii'):
+        state = (state * 0x21 + char) & 0xFFFFFFFF
+    return state
+
+@unittest.skipIf(crack.numpy is None, "needs NumPy")
+class CrackTest(unittest.TestCase):
+    groups = [["MITSU", "MAZDA", "A"], ["", "_"], ["RX1", "RX2", "RX10", "X", "ECLIPSE"], ["", "_BASE"]]
+
+    def bruteForce(self, targets):
+        names = (''.join(parts) for parts in itertools.product(*self.groups))
+        return sorted((name, rawHash(name)) for name in names if rawHash(name) in targets)
+
+    def testRawHashMatchesXnameLists(self):
+        for name in common.carXnames[:20]:
+            self.assertEqual(crack.xnameListHash(rawHash(name)), memphisrider.xnames[name])
+
+    def testFindsEveryCandidateAcrossChunks(self):
+        names = [''.join(parts) for parts in itertools.product(*self.groups)]
+        targets = {rawHash(name) for name in names[::7]} | {rawHash("NOT_A_CANDIDATE")}
+        expected = self.bruteForce(targets)
+        self.assertEqual(len(expected), len(names[::7]))
+        ## chunk sizes below, at and across the size of the groups, so prefix states get split at every group
+        for chunkSize in (1, 2, 3, 4, 5, 7, 15, 16, 1 << 22):
+            with self.subTest(chunkSize=chunkSize), mock.patch.object(crack, "CHUNK_SIZE", chunkSize):
+                self.assertEqual(sorted(crack.crackGroups(self.groups, targets)), expected)
+
+    def testChunksStayBounded(self):
+        groups = [crack.CandidateGroup(alternatives) for alternatives in self.groups]
+        states = crack.numpy.array([0xFFFFFFFF], dtype=crack.numpy.uint32)
+        ids = crack.numpy.zeros(1, dtype=crack.numpy.int64)
+        with mock.patch.object(crack, "CHUNK_SIZE", 8):
+            chunks = list(crack.expandGroups(states, ids, groups))
+        self.assertEqual(sum(len(chunkStates) for chunkStates, chunkIds in chunks), crack.candidateCount(self.groups))
+        self.assertTrue(all(len(chunkStates) <= 8 for chunkStates, chunkIds in chunks))
+
+    def testCrack(self):
+        targets = {rawHash("MAZDA_RX2_BASE"), rawHash("WORDLIST_CAR"), rawHash("UNKNOWN")}
+        matches = crack.crack(targets, patterns=["[MITSU|MAZDA][|_]RX{1-9}[|_BASE]"], extraNames=["wordlist_car"])
+        self.assertEqual(matches, {rawHash("MAZDA_RX2_BASE"):["MAZDA_RX2_BASE"], rawHash("WORDLIST_CAR"):["WORDLIST_CAR"]})
+
+class PatternTest(unittest.TestCase):
+    def testParsePattern(self):
+        self.assertEqual(crack.parsePattern("[MITSU|MAZDA][|_]RX{8-9}"), [["MITSU", "MAZDA"], ["", "_"], ["RX8", "RX9"]])
+        self.assertEqual(crack.candidateCount(crack.parsePattern("[A|B|A]{1-3}")), 6)
+
+    def testExpandRanges(self):
+        self.assertEqual(crack.expandRanges("CAR{08-11}"), ["CAR08", "CAR09", "CAR10", "CAR11"])
+        self.assertEqual(crack.expandRanges("{1-2}X{1-2}"), ["1X1", "1X2", "2X1", "2X2"])
+        self.assertEqual(crack.expandRanges("PLAIN"), ["PLAIN"])
+
+    def testInvalidPattern(self):
+        for pattern in ("", "[OPEN", "CLOSED]"):
+            with self.subTest(pattern=pattern), self.assertRaises(crack.CrackError):
+                crack.parsePattern(pattern)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import unittest
+
+from common import ScratchTestCase, makeProfile, randomBytes
+
+import memphisrider
+from memphisrider import diff
+from memphisrider import MY_CARS, CAREER
+
+## a career progress byte outside the garages and the header fields
+PROGRESS_OFFSET = diff.GARAGES_END + 100
+
+class DiffMergeTest(ScratchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.base = makeProfile(self.rng)
+        self.ours = memphisrider.Profile(self.base.buffer)
+        self.theirs = memphisrider.Profile(self.base.buffer)
+
+    def setVisual(self, profile, garage, index):
+        profile.importPreset(garage, index, bytes(profile.slotXnameHash(garage, index)).hex(), randomBytes(self.rng, 748))
+
+    def setProgress(self, profile, value):
+        with profile.change("progress"):
+            profile.markDirty(("range", PROGRESS_OFFSET, 1))
+            profile.view[PROGRESS_OFFSET] = value
+
+    def testDiff(self):
+        self.assertEqual(diff.diffProfiles(self.ours, self.theirs), {"slots":[], "header":[], "other":[]})
+        self.setVisual(self.theirs, MY_CARS, 3)
+        self.theirs.importPreset(CAREER, 1, bytes(self.theirs.slotXnameHash(CAREER, 1)).hex(), self.theirs.slotVisualData(CAREER, 1), 3)
+        self.theirs.careerInventories[1][0] ^= 0xFF
+        self.setProgress(self.theirs, self.theirs.view[PROGRESS_OFFSET] ^ 0xFF)
+        result = diff.diffProfiles(self.ours, self.theirs)
+        slotDiffs = [(slotDiff["garage"], slotDiff["slot"], slotDiff["fields"]) for slotDiff in result["slots"]]
+        self.assertEqual(slotDiffs[0], (MY_CARS, 3, ["visual"]))
+        self.assertEqual(slotDiffs[1][:2], (CAREER, 1))
+        self.assertIn("inventory", slotDiffs[1][2])
+        self.assertEqual(len(slotDiffs), 2)
+        self.assertEqual(result["other"], [(PROGRESS_OFFSET - (PROGRESS_OFFSET - diff.GARAGES_END) % diff.MERGE_CHUNK, diff.MERGE_CHUNK)])
+
+    def testMergeSeparateChanges(self):
+        self.setVisual(self.ours, MY_CARS, 1)
+        self.setVisual(self.theirs, MY_CARS, 2)
+        self.setVisual(self.theirs, CAREER, 0)
+        self.setProgress(self.theirs, 0x42)
+        theirSlots = [bytes(self.theirs.slotVisualData(MY_CARS, 2)), bytes(self.theirs.slotVisualData(CAREER, 0))]
+        ourSlot = bytes(self.ours.slotVisualData(MY_CARS, 1))
+        taken, conflicts = diff.mergeProfiles(self.base, self.ours, self.theirs)
+        self.assertEqual(conflicts, [])
+        self.assertEqual(taken, 3)
+        self.assertEqual(bytes(self.ours.slotVisualData(MY_CARS, 1)), ourSlot)
+        self.assertEqual([bytes(self.ours.slotVisualData(MY_CARS, 2)), bytes(self.ours.slotVisualData(CAREER, 0))], theirSlots)
+        self.assertEqual(self.ours.view[PROGRESS_OFFSET], 0x42)
+        self.assertIn((MY_CARS, 2), self.ours.dirtyRegions)
+        self.assertEqual(self.ours.undo(), "merge")
+        self.assertEqual(diff.diffProfiles(self.ours, self.base)["slots"][0]["slot"], 1)
+
+    def testConflicts(self):
+        self.setVisual(self.ours, MY_CARS, 5)
+        self.setVisual(self.theirs, MY_CARS, 5)
+        self.setProgress(self.ours, 1)
+        self.setProgress(self.theirs, 2)
+        ourData = bytes(self.ours.buffer)
+        taken, conflicts = diff.mergeProfiles(self.base, self.ours, self.theirs)
+        self.assertEqual((taken, len(conflicts)), (0, 2))
+        self.assertIn("My Cars slot 6 visual", conflicts)
+        self.assertEqual(bytes(self.ours.buffer), ourData)
+        diff.mergeProfiles(self.base, self.ours, self.theirs, prefer="ours")
+        self.assertEqual(bytes(self.ours.buffer), ourData)
+        diff.mergeProfiles(self.base, self.ours, self.theirs, prefer="theirs")
+        self.assertEqual(bytes(self.ours.slotVisualData(MY_CARS, 5)), bytes(self.theirs.slotVisualData(MY_CARS, 5)))
+        self.assertEqual(self.ours.view[PROGRESS_OFFSET], 2)
+        with self.assertRaises(memphisrider.ProfileError):
+            diff.mergeProfiles(self.base, self.ours, self.theirs, prefer="both")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import unittest
+
+from common import ScratchTestCase, randomBytes
+
+import memphisrider
+from memphisrider import MY_CARS, CAREER
+
+class DirtyRegionTest(ScratchTestCase):
+    def testWritePlanMergesTouchingRanges(self):
+        plan = memphisrider.writePlan([(MY_CARS, 1), (MY_CARS, 0), (MY_CARS, 5), ("range", 10, 20), ("range", 25, 10)])
+        firstOffset, slotLength = memphisrider.slotRegion(MY_CARS, 0)
+        self.assertEqual(plan, [(10, 25), (firstOffset, 2*slotLength), memphisrider.slotRegion(MY_CARS, 5)])
+        self.assertEqual(memphisrider.writePlan([]), [])
+
+    def testOnlyChangedSlotsAreDirty(self):
+        path = self.saveProfile()
+        with memphisrider.Profile.open(path) as profile:
+            profile.clearSlot(MY_CARS, 3)
+            profile.moveSlot(CAREER, 1, 0)
+            self.assertIn((MY_CARS, 3), profile.dirtyRegions)
+            self.assertIn((CAREER, 0), profile.dirtyRegions)
+            self.assertIn((CAREER, 1), profile.dirtyRegions)
+            self.assertNotIn((MY_CARS, 0), profile.dirtyRegions)
+
+class MappedProfileTest(ScratchTestCase):
+    def testEditsGoToTheFile(self):
+        path = self.saveProfile()
+        presetData = randomBytes(self.rng, 748)
+        with memphisrider.Profile.openMapped(path) as profile:
+            profile.importPreset(MY_CARS, 2, "0x13E5B272", presetData)
+            profile.clearSlot(CAREER, 3)
+            profile.save()
+            self.assertFalse(profile.isDirty())
+        with memphisrider.Profile.open(path) as profile:
+            self.assertEqual(bytes(profile.slotVisualData(MY_CARS, 2)), presetData)
+            self.assertTrue(profile.isSlotEmpty(CAREER, 3))
+
+    def testSameResultAsBufferedSave(self):
+        mappedPath = self.saveProfile("MAPPED")
+        bufferedPath = self.path("BUFFERED")
+        self.writeBytes(bufferedPath, self.readBytes(mappedPath))
+        for openProfile, path in ((memphisrider.Profile.openMapped, mappedPath), (memphisrider.Profile.open, bufferedPath)):
+            with openProfile(path) as profile:
+                profile.moveSlot(MY_CARS, 4, 0)
+                profile.clearSlot(MY_CARS, 19)
+                profile.save()
+        ## the profile name field holds the file name, so compare everything else
+        nameOffset = memphisrider.PROFILE_NAME_OFFSET
+        mappedData, bufferedData = self.readBytes(mappedPath), self.readBytes(bufferedPath)
+        self.assertEqual(mappedData[:nameOffset], bufferedData[:nameOffset])
+        self.assertEqual(mappedData[nameOffset+memphisrider.PROFILE_NAME_SIZE:], bufferedData[nameOffset+memphisrider.PROFILE_NAME_SIZE:])
+
+    def testMappedProfilesRefuseBackups(self):
+        path = self.saveProfile()
+        with memphisrider.Profile.openMapped(path) as profile:
+            profile.clearSlot(MY_CARS, 0)
+            with self.assertRaises(memphisrider.ProfileError):
+                profile.save(backup=True)
+
+    def testWrongSize(self):
+        self.writeBytes(self.path("SHORT"), bytes(100))
+        with self.assertRaises(memphisrider.ProfileError):
+            memphisrider.Profile.openMapped(self.path("SHORT"))
+
+if __name__ == '__main__':
+    unittest.main()
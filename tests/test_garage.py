@@ -0,0 +1,86 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import hashlib
+import unittest
+
+from common import ScratchTestCase, makeSlotPair
+
+import memphisrider
+from memphisrider import MY_CARS, CAREER
+
+class GarageTest(ScratchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.profile = memphisrider.Profile.open(self.saveProfile())
+        self.addCleanup(self.profile.close)
+
+    ## the slot blocks (with career inventories) of a garage, without the slot IDs that are renumbered after every move
+    def blocks(self, garage):
+        garageSlots = self.profile.garages[garage]
+        return [bytes(garageSlots.block(i))[8:] for i in range(len(garageSlots))]
+
+    def checkCaches(self, garage):
+        for i in range(self.profile.slotCount(garage)):
+            fingerprint = hashlib.md5(self.profile.slotVisualData(garage, i)).hexdigest()
+            self.assertEqual(self.profile.slotFingerprint(garage, i), fingerprint)
+
+    def testMoveSlot(self):
+        for garage, index, newIndex in ((MY_CARS, 1, 7), (MY_CARS, 9, 0), (CAREER, 0, 4), (CAREER, 4, 2)):
+            with self.subTest(garage=garage, index=index, newIndex=newIndex):
+                for i in range(self.profile.slotCount(garage)):
+                    self.profile.slotFingerprint(garage, i)
+                expected = self.blocks(garage)
+                expected.insert(newIndex, expected.pop(index))
+                self.assertTrue(self.profile.moveSlot(garage, index, newIndex))
+                self.assertEqual(self.blocks(garage), expected)
+                self.assertEqual(bytes(self.profile.slots(garage)[newIndex][0:8]), memphisrider.slotId(garage, newIndex))
+                self.checkCaches(garage)
+        self.assertFalse(self.profile.moveSlot(MY_CARS, 0, self.profile.slotCount(MY_CARS)))
+
+    def testPermuteSlots(self):
+        for i in range(self.profile.slotCount(CAREER)):
+            self.profile.slotFingerprint(CAREER, i)
+        order = list(range(self.profile.slotCount(CAREER)))
+        self.rng.shuffle(order)
+        oldBlocks = self.blocks(CAREER)
+        self.assertTrue(self.profile.permuteSlots(CAREER, order))
+        self.assertEqual(self.blocks(CAREER), [oldBlocks[oldIndex] for oldIndex in order])
+        self.checkCaches(CAREER)
+        with self.assertRaises(memphisrider.ProfileError):
+            self.profile.permuteSlots(CAREER, [0] * self.profile.slotCount(CAREER))
+
+    def testImportSlotChecksSizes(self):
+        slotData, inventory = makeSlotPair(self.rng)
+        before = self.blocks(CAREER)
+        with self.assertRaises(memphisrider.ProfileError):
+            self.profile.importSlot(CAREER, 1, slotData, inventory[:-1])
+        with self.assertRaises(memphisrider.ProfileError):
+            self.profile.importSlot(CAREER, 1, slotData + b'\x00', inventory)
+        self.assertEqual(self.blocks(CAREER), before)
+        self.assertNotIn((CAREER, 1), self.profile.dirtyRegions)
+        self.profile.importSlot(CAREER, 1, slotData, inventory)
+        self.assertEqual(self.profile.exportSlot(CAREER, 1), (slotData, inventory))
+
+if __name__ == '__main__':
+    unittest.main()
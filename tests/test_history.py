@@ -0,0 +1,103 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import json
+import unittest
+from unittest import mock
+
+from common import ScratchTestCase
+
+import memphisrider
+from memphisrider import history
+
+class PresetHistoryTest(ScratchTestCase):
+    def makeHistory(self, legacyPaths=()):
+        return memphisrider.PresetHistory(self.path("history.jsonl"), tuple(self.path(path) for path in legacyPaths)).load()
+
+    def lineCount(self):
+        with open (self.path("history.jsonl"), 'rb') as historyFile:
+            return historyFile.read().count(b'\n')
+
+    def testRecordAndReload(self):
+        presetHistory = self.makeHistory()
+        presetHistory.record("aa", "FIRST", "a.bin", "2004-11-09")
+        presetHistory.recordMany([("bb", "SECOND", "b.bin", "2004-11-10"), ("aa", "RENAMED", "a.bin", "2004-11-11")])
+        ## recording the same entry again doesn't write anything
+        presetHistory.record("bb", "SECOND", "b.bin", "2004-11-10")
+        self.assertEqual(self.lineCount(), 3)
+        reloaded = self.makeHistory()
+        self.assertEqual(len(reloaded), 2)
+        self.assertEqual(reloaded["aa"]["presetName"], "RENAMED")
+        self.assertEqual(reloaded.get("bb"), {"presetName":"SECOND", "lastPath":"b.bin", "lastDate":"2004-11-10"})
+        self.assertEqual(reloaded.staleLines, 1)
+
+    def testPicksUpOtherInstances(self):
+        presetHistory = self.makeHistory()
+        presetHistory.record("aa", "FIRST", "a.bin", "n/a")
+        other = self.makeHistory()
+        other.record("bb", "OTHER", "b.bin", "n/a")
+        presetHistory.load()
+        self.assertIn("bb", presetHistory)
+        self.assertEqual(presetHistory.staleLines, 0)
+
+    def testMigration(self):
+        with open (self.path("old.json"), 'w') as legacyFile:
+            json.dump({"aa":{"presetName":"JSON", "lastPath":"a.bin", "lastDate":"n/a"}}, legacyFile)
+        with open (self.path("old.txt"), 'w') as legacyFile:
+            json.dump({"bb":"TXT"}, legacyFile)
+        presetHistory = self.makeHistory(("old.json", "old.txt"))
+        self.assertEqual(list(presetHistory.entries), ["aa"])
+        presetHistory = memphisrider.PresetHistory(self.path("txt.jsonl"), (self.path("old.txt"),)).load()
+        self.assertEqual(presetHistory["bb"], {"presetName":"TXT", "lastPath":"n/a", "lastDate":"n/a"})
+
+    def testCorruptedLegacyFile(self):
+        with open (self.path("old.json"), 'w') as legacyFile:
+            legacyFile.write("{not json")
+        with self.assertRaises(memphisrider.HistoryError):
+            self.makeHistory(("old.json",))
+
+    def testCompaction(self):
+        presetHistory = self.makeHistory()
+        with mock.patch.object(history, "COMPACT_MIN_STALE", 5):
+            for i in range(6):
+                presetHistory.record("aa", f"NAME{i}", "a.bin", "n/a")
+                presetHistory.record("bb", f"NAME{i}", "b.bin", "n/a")
+        self.assertLess(self.lineCount(), 12)
+        reloaded = self.makeHistory()
+        self.assertEqual(reloaded["aa"]["presetName"], "NAME5")
+        self.assertEqual(reloaded["bb"]["presetName"], "NAME5")
+        presetHistory.compact()
+        self.assertEqual(self.lineCount(), 2)
+        self.assertEqual(self.makeHistory().staleLines, 0)
+
+    def testTornLine(self):
+        presetHistory = self.makeHistory()
+        presetHistory.record("aa", "FIRST", "a.bin", "n/a")
+        with open (self.path("history.jsonl"), 'ab') as historyFile:
+            historyFile.write(b'{"hash": "zz", "presetNa')
+        presetHistory.record("bb", "SECOND", "b.bin", "n/a")
+        reloaded = self.makeHistory()
+        self.assertEqual(sorted(reloaded.entries), ["aa", "bb"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import hashlib
+import os
+import unittest
+from unittest import mock
+
+from common import ScratchTestCase, makePreset, makeProfile
+
+import memphisrider
+from memphisrider import library
+from memphisrider import MY_CARS
+
+class LibraryIndexTest(ScratchTestCase):
+    def setUp(self):
+        super().setUp()
+        os.makedirs(self.path("library", "sub"))
+        self.presets = [self.writeBytes(self.path("library", f"preset{i}.bin"), makePreset(self.rng, i)) for i in range(5)]
+        slotData, inventory = makeProfile(self.rng).exportSlot(MY_CARS, 0)
+        self.slotPath = self.writeBytes(self.path("library", "sub", "car.u2cc"), slotData)
+        self.slotData = slotData
+        self.writeBytes(self.path("library", "notes.txt"), b'not indexed')
+        self.writeBytes(self.path("library", "broken.bin"), b'too short')
+
+    def scan(self, libraryIndex):
+        with mock.patch.object(library, "indexFile", wraps=library.indexFile) as indexFile:
+            stats = libraryIndex.scan([self.path("library")], workers=2)
+        return stats, sorted(os.path.basename(call.args[0]) for call in indexFile.call_args_list)
+
+    def testIndexesPresetsAndSlots(self):
+        libraryIndex = library.LibraryIndex(self.path("index.json"))
+        stats, readFiles = self.scan(libraryIndex)
+        self.assertEqual(stats, {"new":7, "updated":0, "unchanged":0, "removed":0})
+        self.assertEqual(len(readFiles), 7)
+        entry = libraryIndex.files[os.path.abspath(self.presets[0])]
+        preset = memphisrider.readPreset(self.readBytes(self.presets[0]))
+        self.assertEqual(entry["kind"], "preset")
+        self.assertEqual(libraryIndex.findFingerprint(entry["fingerprint"]), [os.path.abspath(self.presets[0])])
+        self.assertIn(os.path.abspath(self.presets[0]), libraryIndex.findXname(preset["xname"]))
+        slotFingerprint = hashlib.md5(self.slotData[library.SLOT_VISUAL]).hexdigest()
+        self.assertEqual(libraryIndex.findFingerprint(slotFingerprint), [os.path.abspath(self.slotPath)])
+        self.assertEqual(libraryIndex.files[os.path.abspath(self.path("library", "broken.bin"))]["kind"], "other")
+
+    def testRescanOnlyReadsChangedFiles(self):
+        libraryIndex = library.LibraryIndex(self.path("index.json"))
+        self.scan(libraryIndex)
+        libraryIndex.save()
+        libraryIndex = library.LibraryIndex(self.path("index.json")).load()
+        stats, readFiles = self.scan(libraryIndex)
+        self.assertEqual(stats, {"new":0, "updated":0, "unchanged":7, "removed":0})
+        self.assertEqual(readFiles, [])
+
+        self.writeBytes(self.presets[1], makePreset(self.rng, 10))
+        fileStat = os.stat(self.presets[1])
+        os.utime(self.presets[1], ns=(fileStat.st_atime_ns, fileStat.st_mtime_ns + 1000000000))
+        os.remove(self.presets[2])
+        self.writeBytes(self.path("library", "sub", "new.bin"), makePreset(self.rng, 11))
+        stats, readFiles = self.scan(libraryIndex)
+        self.assertEqual(stats, {"new":1, "updated":1, "unchanged":5, "removed":1})
+        self.assertEqual(readFiles, ["new.bin", "preset1.bin"])
+        self.assertNotIn(os.path.abspath(self.presets[2]), libraryIndex.files)
+
+    def testOtherVersionIsRebuilt(self):
+        with open (self.path("index.json"), 'w') as indexFile:
+            indexFile.write('{"version": 0, "files": {"x": {}}}')
+        self.assertEqual(library.LibraryIndex(self.path("index.json")).load().files, {})
+        with open (self.path("index.json"), 'w') as indexFile:
+            indexFile.write('{"version"')
+        with self.assertRaises(library.LibraryError):
+            library.LibraryIndex(self.path("index.json")).load()
+
+if __name__ == '__main__':
+    unittest.main()
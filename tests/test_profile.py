@@ -0,0 +1,104 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import unittest
+
+from common import ScratchTestCase, carXnames, randomBytes
+
+import memphisrider
+from memphisrider import MY_CARS, CAREER
+
+class ProfileTest(ScratchTestCase):
+    def testOpenEditSave(self):
+        path = self.saveProfile()
+        originalData = self.readBytes(path)
+        presetData = randomBytes(self.rng, 748)
+        with memphisrider.Profile.open(path) as profile:
+            self.assertFalse(profile.isDirty())
+            profile.importPreset(MY_CARS, 1, memphisrider.xnames[carXnames[0]], presetData, 2)
+            profile.clearSlot(CAREER, 2)
+            self.assertTrue(profile.isDirty())
+            profile.save()
+            self.assertFalse(profile.isDirty())
+        savedData = self.readBytes(path)
+        self.assertEqual(len(savedData), memphisrider.PROFILE_SIZE)
+        with memphisrider.Profile.open(path) as profile:
+            self.assertEqual(bytes(profile.slotVisualData(MY_CARS, 1)), presetData)
+            self.assertEqual(profile.slotXname(MY_CARS, 1), carXnames[0])
+            self.assertTrue(profile.isSlotEmpty(CAREER, 2))
+        ## slots that weren't touched are written back as they were
+        for garage, index in ((MY_CARS, 0), (MY_CARS, 2), (CAREER, 0)):
+            offset, length = memphisrider.slotRegion(garage, index)
+            self.assertEqual(savedData[offset:offset+length], originalData[offset:offset+length])
+
+    def testSlotExportImport(self):
+        path = self.saveProfile()
+        with memphisrider.Profile.open(path) as profile:
+            slotData, inventoryData = profile.exportSlot(CAREER, 0)
+            self.assertIsNotNone(inventoryData)
+            self.assertIsNone(profile.exportSlot(MY_CARS, 0)[1])
+            fingerprint = profile.slotFingerprint(CAREER, 0)
+            profile.clearSlot(CAREER, 1)
+            self.assertTrue(profile.isSlotEmpty(CAREER, 1))
+            profile.importSlot(CAREER, 1, slotData, inventoryData)
+            self.assertEqual(profile.slotFingerprint(CAREER, 1), fingerprint)
+            self.assertEqual(profile.exportSlot(CAREER, 1)[1], inventoryData)
+            with self.assertRaises(memphisrider.ProfileError):
+                profile.importSlot(MY_CARS, 1, slotData[:100])
+
+    def testSaveAsKeepsOwnFile(self):
+        path = self.saveProfile()
+        with memphisrider.Profile.open(path) as profile:
+            profile.clearSlot(MY_CARS, 0)
+            profile.saveAs(self.path("COPY"))
+            self.assertTrue(profile.isDirty())
+        with memphisrider.Profile.open(self.path("COPY")) as copy:
+            self.assertTrue(copy.isSlotEmpty(MY_CARS, 0))
+        with memphisrider.Profile.open(path) as profile:
+            self.assertFalse(profile.isSlotEmpty(MY_CARS, 0))
+
+    def testNonAsciiFileName(self):
+        path = self.saveProfile()
+        with memphisrider.Profile.open(path) as profile:
+            profile.saveAs(self.path("PRÔFIL"))
+        with memphisrider.Profile.open(self.path("PRÔFIL")) as copy:
+            nameData = bytes(copy.buffer[memphisrider.PROFILE_NAME_OFFSET:memphisrider.PROFILE_NAME_OFFSET+memphisrider.PROFILE_NAME_SIZE])
+        self.assertTrue(nameData.startswith(b'PR?FIL'))
+
+    def testPresetRoundTrip(self):
+        presetData = randomBytes(self.rng, 748)
+        preset = memphisrider.readPreset(memphisrider.buildPreset(carXnames[1], "league", presetData, 3, True))
+        self.assertEqual((preset["xname"], preset["presetName"], preset["perfLevel"], preset["sponsor"]), (carXnames[1], "LEAGUE", 3, True))
+        self.assertEqual(bytes(preset["data"]), presetData)
+        with self.assertRaises(memphisrider.ProfileError):
+            memphisrider.readPreset(bytes(10))
+
+    def testInvalidProfile(self):
+        with self.assertRaises(memphisrider.ProfileError):
+            memphisrider.Profile(bytes(100))
+        self.writeBytes(self.path("SHORT"), bytes(100))
+        with self.assertRaises(memphisrider.ProfileError):
+            memphisrider.Profile.open(self.path("SHORT"))
+
+if __name__ == '__main__':
+    unittest.main()
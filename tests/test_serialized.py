@@ -0,0 +1,91 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import os
+import struct
+import unittest
+
+from common import ScratchTestCase
+
+import memphisrider
+from memphisrider import serialized
+
+## a serialized preset whose size field covers the part names and nothing after them
+def makeSerializedPreset(xname, tail=b'\x00' * 16):
+    chunk = b''.join(b'\x05\x00\x00\x00' + f"{xname}_{part}".encode('ascii') + b'\x00' for part in ("BASE", "BODY_KIT01", "SPOILER"))
+    return serialized.SERIALIZED_MAGIC + bytes(25) + struct.pack('<H', len(chunk)) + chunk + tail
+
+def chunkSize(data):
+    return struct.unpack_from('<H', data, serialized.SERIALIZED_SIZE_OFFSET)[0]
+
+class RenameXnameTest(ScratchTestCase):
+    def checkRename(self, oldXname, newXname):
+        data = makeSerializedPreset(oldXname)
+        renamed = serialized.renameXname(data, oldXname, newXname)
+        self.assertEqual(renamed, makeSerializedPreset(newXname))
+        self.assertEqual(len(renamed), len(data) + 3 * (len(newXname) - len(oldXname)))
+        self.assertEqual(serialized.SERIALIZED_CHUNK_OFFSET + chunkSize(renamed), len(renamed) - 16)
+        self.assertEqual(serialized.xnameMatcher().find(renamed), (newXname, True))
+
+    def testSameLength(self):
+        self.checkRename("RX8", "RX7")
+
+    def testLonger(self):
+        self.checkRename("RX8", "SKYLINE")
+
+    def testShorter(self):
+        self.checkRename("SKYLINE", "RX8")
+
+    def testUnknownXname(self):
+        self.assertEqual(serialized.xnameMatcher().find(makeSerializedPreset("ADDONCAR")), ("ADDONCAR", False))
+        self.assertEqual(serialized.xnameMatcher({"ADDONCAR":"0x12345678"}).find(makeSerializedPreset("ADDONCAR")), ("ADDONCAR", True))
+
+    def testReferenceOutsideTheChunk(self):
+        data = makeSerializedPreset("RX8", tail=b'RX8_TRAILER\x00')
+        with self.assertRaises(memphisrider.ProfileError):
+            serialized.renameXname(data, "RX8", "SKYLINE")
+
+    def testSizeFieldPastTheEnd(self):
+        data = bytearray(makeSerializedPreset("RX8", tail=b''))
+        struct.pack_into('<H', data, serialized.SERIALIZED_SIZE_OFFSET, len(data))
+        with self.assertRaises(memphisrider.ProfileError):
+            serialized.renameXname(bytes(data), "RX8", "SKYLINE")
+
+    def testNotSerialized(self):
+        with self.assertRaises(memphisrider.ProfileError):
+            serialized.renameXname(bytes(100), "RX8", "SKYLINE")
+
+    def testRenameFiles(self):
+        os.makedirs(self.path("presets"))
+        self.writeBytes(self.path("presets", "a.bin"), makeSerializedPreset("RX8"))
+        self.writeBytes(self.path("presets", "b.bin"), makeSerializedPreset("RX8", tail=b'RX8_TRAILER\x00'))
+        self.writeBytes(self.path("presets", "c.bin"), makeSerializedPreset("SKYLINE"))
+        results = list(serialized.renameXnames([self.path("presets")], "SUPRA", onlyXname="RX8"))
+        self.assertEqual([(os.path.basename(path), oldXname, renameError is None) for path, oldXname, renameError in results],
+                         [("a.bin", "RX8", True), ("b.bin", None, False)])
+        self.assertEqual(self.readBytes(self.path("presets", "a.bin")), makeSerializedPreset("SUPRA"))
+        self.assertEqual(self.readBytes(self.path("presets", "b.bin")), makeSerializedPreset("RX8", tail=b'RX8_TRAILER\x00'))
+        self.assertEqual(sorted(os.listdir(self.path("presets"))), ["a.bin", "b.bin", "c.bin"])
+
+if __name__ == '__main__':
+    unittest.main()
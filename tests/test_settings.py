@@ -0,0 +1,127 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from common import ScratchTestCase
+
+import memphisrider
+from memphisrider import settings as settingsModule
+
+class SettingsStoreTest(ScratchTestCase):
+    def testFlushAndRefresh(self):
+        settings = memphisrider.SettingsStore(self.scratch)
+        self.assertEqual(settings.refresh(force=True), [])
+        settings.userXnames["ADDON"] = "0x12345678"
+        settings.changed("userXnames")
+        settings.flush()
+        ## our own write isn't read back
+        self.assertEqual(settings.refresh(force=True), [])
+        other = memphisrider.SettingsStore(self.scratch)
+        other.refresh(force=True)
+        self.assertEqual(other.userXnames, {"ADDON":"0x12345678"})
+        other.userDirPaths["openProfileDir"] = "/saves"
+        other.changed("userDirPaths")
+        other.flush()
+        userDirPaths = settings.userDirPaths
+        self.assertEqual(settings.refresh(force=True), ["userDirPaths"])
+        self.assertIs(settings.userDirPaths, userDirPaths)
+        self.assertEqual(settings.userDirPaths["openProfileDir"], "/saves")
+
+    def testBackgroundWriter(self):
+        writer = memphisrider.BackgroundWriter()
+        settings = memphisrider.SettingsStore(self.scratch)
+        settings.submitWrite = writer.submit
+        settings.userXnames["ADDON"] = "0x12345678"
+        settings.changed("userXnames")
+        settings.flush()
+        writer.flush()
+        self.assertEqual(settings.refresh(force=True), [])
+        self.assertIn("userXnames", settings.stamps)
+
+    def testCorruptedFile(self):
+        with open (self.path("MemphisRider_userXnames.json"), 'w') as settingsFile:
+            settingsFile.write("[1, 2")
+        with self.assertRaises(memphisrider.SettingsError):
+            memphisrider.SettingsStore(self.scratch).refresh(force=True)
+
+    def testLegacyFile(self):
+        with open (self.path("MemphisRider_userXnames.txt"), 'w') as legacyFile:
+            json.dump({"OLDCAR":"0x12345678"}, legacyFile)
+        settings = memphisrider.SettingsStore(self.scratch)
+        self.assertEqual(settings.refresh(force=True), ["userXnames"])
+        self.assertEqual(settings.userXnames, {"OLDCAR":"0x12345678"})
+        self.assertEqual(settings.userDirPaths, settingsModule.DEFAULT_DIR_PATHS)
+
+    def testDiskIsCheckedOncePerInterval(self):
+        settings = memphisrider.SettingsStore(self.scratch)
+        settings.refresh(force=True)
+        other = memphisrider.SettingsStore(self.scratch)
+        other.userXnames["ADDON"] = "0x12345678"
+        other.changed("userXnames")
+        other.flush()
+        with mock.patch.object(settingsModule.os, "stat", side_effect=AssertionError("disk checked")):
+            self.assertEqual(settings.refresh(), [])
+        with mock.patch.object(settingsModule, "REFRESH_INTERVAL", 0):
+            self.assertEqual(settings.refresh(), ["userXnames"])
+
+    def testUnflushedEditsWin(self):
+        settings = memphisrider.SettingsStore(self.scratch)
+        other = memphisrider.SettingsStore(self.scratch)
+        other.userXnames["ADDON"] = "0x12345678"
+        other.changed("userXnames")
+        other.flush()
+        settings.userXnames["MINE"] = "0x11111111"
+        settings.changed("userXnames")
+        self.assertEqual(settings.refresh(force=True), [])
+        self.assertEqual(settings.userXnames, {"MINE":"0x11111111"})
+
+    def testFailedWritesAreRetried(self):
+        for submitWrite in (None, memphisrider.BackgroundWriter()):
+            with self.subTest(background=submitWrite is not None):
+                folder = self.path(f"settings{submitWrite is not None}")
+                settings = memphisrider.SettingsStore(folder)
+                settings.submitWrite = submitWrite and submitWrite.submit
+                settings.userXnames["ADDON"] = "0x12345678"
+                settings.changed("userXnames")
+                if submitWrite is None:
+                    with self.assertRaises(OSError):
+                        settings.flush()
+                else:
+                    settings.flush()
+                    submitWrite.flush()
+                self.assertEqual(settings.changedNames, {"userXnames"})
+                self.assertEqual(settings.writingNames, set())
+                os.makedirs(folder)
+                settings.flush()
+                if submitWrite is not None:
+                    submitWrite.flush()
+                other = memphisrider.SettingsStore(folder)
+                other.refresh(force=True)
+                self.assertEqual(other.userXnames, {"ADDON":"0x12345678"})
+
+if __name__ == '__main__':
+    unittest.main()
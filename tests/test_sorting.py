@@ -0,0 +1,83 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import unittest
+
+from common import ScratchTestCase, randomBytes
+
+import memphisrider
+from memphisrider import sorting
+from memphisrider import MY_CARS
+
+class SortGarageTest(ScratchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.profile = memphisrider.Profile.open(self.saveProfile())
+        self.addCleanup(self.profile.close)
+        for index in range(self.profile.slotCount(MY_CARS)):
+            self.profile.clearSlot(MY_CARS, index)
+        ## slot index -> car, with two empty slots in between
+        self.cars = {0:"SKYLINE", 2:"RX8", 3:"SUPRA", 5:"RX8", 6:"ECLIPSE"}
+        for index, xname in self.cars.items():
+            self.profile.importPreset(MY_CARS, index, memphisrider.xnames[xname], randomBytes(self.rng, 748))
+        self.presetHistory = {self.profile.slotFingerprint(MY_CARS, 5):{"presetName":"alpha"},
+                              self.profile.slotFingerprint(MY_CARS, 0):{"presetName":"zulu"}}
+
+    def xnames(self, count=5):
+        return [self.profile.slotXname(MY_CARS, index) for index in range(count)]
+
+    def testSortByXname(self):
+        order = sorting.sortOrder(self.profile, MY_CARS, "xname")
+        self.assertEqual(order[:5], [6, 2, 5, 0, 3])
+        self.assertTrue(sorting.sortGarage(self.profile, MY_CARS, "xname"))
+        self.assertEqual(self.xnames(), ["ECLIPSE", "RX8", "RX8", "SKYLINE", "SUPRA"])
+        self.assertFalse(sorting.sortGarage(self.profile, MY_CARS, "xname"))
+
+    def testEmptySlotsFirstWhenAsked(self):
+        order = sorting.sortOrder(self.profile, MY_CARS, "none", emptyLast=False)
+        self.assertEqual(order, list(range(self.profile.slotCount(MY_CARS))))
+        order = sorting.sortOrder(self.profile, MY_CARS, "none")
+        self.assertEqual(order[:5], [0, 2, 3, 5, 6])
+
+    def testSortByPresetName(self):
+        order = sorting.sortOrder(self.profile, MY_CARS, "presetName", presetHistory=self.presetHistory)
+        self.assertEqual(order[:5], [5, 6, 2, 3, 0])
+
+    def testCustomOrder(self):
+        with open (self.path("order.txt"), 'w') as orderFile:
+            orderFile.write("# favourites first\nsupra\n\nALPHA\nSKYLINE\n")
+        customOrder = sorting.loadCustomOrder(self.path("order.txt"))
+        self.assertEqual(customOrder, ["SUPRA", "ALPHA", "SKYLINE"])
+        order = sorting.sortOrder(self.profile, MY_CARS, "custom", presetHistory=self.presetHistory, customOrder=customOrder)
+        ## listed preset names and XNAMEs first, then the rest in their old order
+        self.assertEqual(order[:5], [3, 5, 0, 2, 6])
+        sorting.sortGarage(self.profile, MY_CARS, "custom", presetHistory=self.presetHistory, customOrder=customOrder)
+        self.assertEqual(self.xnames(), ["SUPRA", "RX8", "SKYLINE", "RX8", "ECLIPSE"])
+        self.assertEqual(self.profile.slotFingerprint(MY_CARS, 1), list(self.presetHistory)[0])
+
+    def testUnknownKey(self):
+        with self.assertRaises(memphisrider.ProfileError):
+            sorting.sortOrder(self.profile, MY_CARS, "colour")
+
+if __name__ == '__main__':
+    unittest.main()
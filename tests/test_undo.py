@@ -0,0 +1,102 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import unittest
+
+from common import ScratchTestCase, randomBytes
+
+import memphisrider
+from memphisrider import MY_CARS, CAREER
+from memphisrider.undo import UndoHistory
+
+class UndoRedoTest(ScratchTestCase):
+    def testUndoRedo(self):
+        path = self.saveProfile()
+        with memphisrider.Profile.open(path) as profile:
+            original = bytes(profile.buffer)
+            with profile.change("clear"):
+                profile.clearSlot(MY_CARS, 0)
+            with profile.change("move"):
+                profile.moveSlot(MY_CARS, 2, 5)
+            moved = bytes(profile.buffer)
+            self.assertEqual(profile.undo(), "move")
+            self.assertEqual(profile.undo(), "clear")
+            self.assertIsNone(profile.undo())
+            self.assertEqual(bytes(profile.buffer), original)
+            self.assertEqual(profile.redo(), "clear")
+            self.assertEqual(profile.redo(), "move")
+            self.assertIsNone(profile.redo())
+            self.assertEqual(bytes(profile.buffer), moved)
+            ## undone edits are still changes to save
+            profile.undo()
+            profile.save()
+            savedData = bytes(profile.buffer)
+        with memphisrider.Profile.open(path) as profile:
+            self.assertEqual(bytes(profile.buffer), savedData)
+
+    def testNestedChangesAreOneStep(self):
+        with memphisrider.Profile.open(self.saveProfile()) as profile:
+            original = bytes(profile.buffer)
+            with profile.change("outer"):
+                profile.clearSlot(CAREER, 0)
+                with profile.change("inner"):
+                    profile.clearSlot(MY_CARS, 1)
+            self.assertEqual(profile.undo(), "outer")
+            self.assertEqual(bytes(profile.buffer), original)
+            self.assertIsNone(profile.undo())
+
+    def testNewChangeDropsRedo(self):
+        with memphisrider.Profile.open(self.saveProfile()) as profile:
+            with profile.change("first"):
+                profile.clearSlot(MY_CARS, 0)
+            profile.undo()
+            with profile.change("second"):
+                profile.clearSlot(MY_CARS, 1)
+            self.assertIsNone(profile.redo())
+            ## a change that ends up changing nothing isn't recorded
+            with profile.change("nothing"):
+                profile.clearSlot(MY_CARS, 1)
+            self.assertEqual(profile.undo(), "second")
+
+    def testEntriesStoreCompactDeltas(self):
+        with memphisrider.Profile.open(self.saveProfile()) as profile:
+            presetData = bytearray(profile.slotVisualData(MY_CARS, 0))
+            presetData[-1] ^= 0xFF
+            with profile.change("patch"):
+                profile.importPreset(MY_CARS, 0, bytes(profile.slotXnameHash(MY_CARS, 0)).hex(), presetData)
+            ## only one byte of the slot differs, the XOR diff compresses to far less than the slot
+            self.assertLess(profile.undoHistory.size, 200)
+
+    def testMemoryLimit(self):
+        history = UndoHistory(memoryLimit=2000)
+        view = memoryview(bytearray(4000))
+        for step in range(10):
+            oldData = bytes(view[0:4000])
+            view[0:4000] = randomBytes(self.rng, 4000)
+            history.record(f"step{step}", {"region": (0, oldData)}, view)
+        ## the newest entry is kept even when it's larger than the limit on its own
+        self.assertEqual(len(history.undoEntries), 1)
+        self.assertEqual(history.undoLabel(), "step9")
+
+if __name__ == '__main__':
+    unittest.main()
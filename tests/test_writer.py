@@ -0,0 +1,112 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import os
+import threading
+import unittest
+
+from common import ScratchTestCase
+
+import memphisrider
+from memphisrider import MY_CARS
+
+class BackgroundWriterTest(ScratchTestCase):
+    def testCallbacksRunInOrderOnThePollingThread(self):
+        writer = memphisrider.BackgroundWriter()
+        results = []
+        for i in range(20):
+            writer.submit(lambda i: (i, threading.current_thread()), i,
+                          callback=lambda result: results.append((result[0], result[1], threading.current_thread())))
+        self.assertEqual(writer.flush(), 0)
+        self.assertEqual([i for i, writerThread, callbackThread in results], list(range(20)))
+        self.assertTrue(all(writerThread is writer.thread for i, writerThread, callbackThread in results))
+        self.assertTrue(all(callbackThread is threading.current_thread() for i, writerThread, callbackThread in results))
+
+    def testErrors(self):
+        writer = memphisrider.BackgroundWriter()
+        errors = []
+        writer.submit(open, self.path("missing", "file"), 'wb', callback=errors.append, errback=errors.append)
+        writer.flush()
+        self.assertIsInstance(errors[0], OSError)
+        writer.submit(open, self.path("missing", "file"), 'wb')
+        with self.assertRaises(OSError):
+            writer.flush()
+        self.assertEqual(writer.pending, 0)
+
+class ProfileWriterTest(ScratchTestCase):
+    def testPrepareSave(self):
+        path = self.saveProfile()
+        writer = memphisrider.BackgroundWriter()
+        with memphisrider.Profile.open(path) as profile:
+            profile.clearSlot(MY_CARS, 0)
+            savedRegions, write = profile.prepareSave()
+            self.assertIn((MY_CARS, 0), savedRegions)
+            ## edits made after prepareSave go into the next save
+            profile.clearSlot(MY_CARS, 1)
+            writer.submit(write)
+            writer.flush()
+            self.assertEqual(profile.dirtyRegions, {(MY_CARS, 1)})
+        with memphisrider.Profile.open(path) as profile:
+            self.assertTrue(profile.isSlotEmpty(MY_CARS, 0))
+            self.assertFalse(profile.isSlotEmpty(MY_CARS, 1))
+
+class HistoryWriterTest(ScratchTestCase):
+    def makeHistory(self):
+        return memphisrider.PresetHistory(self.path("history", "history.jsonl"), ()).load()
+
+    def testBackgroundWrites(self):
+        os.makedirs(self.path("history"))
+        writer = memphisrider.BackgroundWriter()
+        presetHistory = self.makeHistory()
+        presetHistory.submitWrite = writer.submit
+        presetHistory.recordMany((f"{i:032x}", f"PRESET{i}", "n/a", "n/a") for i in range(100))
+        ## entries are there right away, and a reload before the write is done doesn't lose them
+        presetHistory.load()
+        self.assertEqual(len(presetHistory), 100)
+        writer.flush()
+        self.assertEqual(presetHistory.unwritten, {})
+        self.assertEqual(len(self.makeHistory()), 100)
+
+    def testFailedWritesAreRetried(self):
+        writer = memphisrider.BackgroundWriter()
+        presetHistory = self.makeHistory()
+        presetHistory.submitWrite = writer.submit
+        presetHistory.record("aa", "FIRST", "a.bin", "n/a")
+        writer.flush()
+        self.assertIn("aa", presetHistory.unwritten)
+        os.makedirs(self.path("history"))
+        presetHistory.record("bb", "SECOND", "b.bin", "n/a")
+        writer.flush()
+        self.assertEqual(presetHistory.unwritten, {})
+        self.assertEqual(sorted(self.makeHistory().entries), ["aa", "bb"])
+
+    def testFailedWritesWithoutWriter(self):
+        presetHistory = self.makeHistory()
+        with self.assertRaises(OSError):
+            presetHistory.record("aa", "FIRST", "a.bin", "n/a")
+        os.makedirs(self.path("history"))
+        presetHistory.record("bb", "SECOND", "b.bin", "n/a")
+        self.assertEqual(sorted(self.makeHistory().entries), ["aa", "bb"])
+
+if __name__ == '__main__':
+    unittest.main()
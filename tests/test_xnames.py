@@ -0,0 +1,87 @@
+##    MIT License
+##
+##    Copyright (c) 2025 and later AJ_Lethal
+##
+##    Permission is hereby granted, free of charge, to any person obtaining a copy
+##    of this software and associated documentation files (the "Software"), to deal
+##    in the Software without restriction, including without limitation the rights
+##    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+##    copies of the Software, and to permit persons to whom the Software is
+##    furnished to do so, subject to the following conditions:
+##
+##    The above copyright notice and this permission notice shall be included in all
+##    copies or substantial portions of the Software.
+##
+##    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+##    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+##    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+##    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+##    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+##    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+##    SOFTWARE.
+
+
+import unittest
+
+import common
+
+import memphisrider
+from memphisrider import MY_CARS
+
+class XnameIndexTest(unittest.TestCase):
+    def testLookup(self):
+        index = memphisrider.XnameIndex()
+        for name in common.carXnames[:20]:
+            self.assertEqual(index.lookup(bytes.fromhex(memphisrider.xnames[name][2:])), name)
+        self.assertEqual(index.lookup(bytes.fromhex("12345678")), "0x12345678")
+
+    def testUserXnames(self):
+        index = memphisrider.XnameIndex({"ADDON": "0x12345678"})
+        self.assertEqual(index.lookup(bytes.fromhex("12345678")), "ADDON")
+        self.assertEqual(index.collisions, [])
+
+    def testCollisionKeepsBuiltinName(self):
+        builtinName = common.carXnames[0]
+        builtinHash = memphisrider.xnames[builtinName]
+        index = memphisrider.XnameIndex()
+        self.assertEqual(index.add("CLASH", builtinHash), builtinName)
+        self.assertEqual(index.lookup(bytes.fromhex(builtinHash[2:])), builtinName)
+        self.assertEqual(index.collisions, [(memphisrider.formatXnameHash(builtinHash), builtinName, "CLASH")])
+        index = memphisrider.XnameIndex({"FIRST": "0x12345678", "SECOND": "0x12345678"})
+        self.assertEqual(index.lookup(bytes.fromhex("12345678")), "FIRST")
+        self.assertEqual(len(index.collisions), 1)
+
+    def testVersion(self):
+        index = memphisrider.XnameIndex()
+        version = index.version
+        index.add("ADDON", "0x12345678")
+        self.assertEqual(index.version, version + 1)
+        ## a clash changes nothing
+        index.add("CLASH", "0x12345678")
+        self.assertEqual(index.version, version + 1)
+        index.rebuild({})
+        self.assertGreater(index.version, version + 1)
+        self.assertEqual(index.lookup(bytes.fromhex("12345678")), "0x12345678")
+
+    def testReaddWithAnotherHash(self):
+        index = memphisrider.XnameIndex({"ADDON": "0x12345678"})
+        version = index.version
+        index.add("ADDON", "0x11111111")
+        self.assertEqual(index.version, version + 1)
+        self.assertEqual(index.lookup(bytes.fromhex("11111111")), "ADDON")
+        self.assertEqual(index.lookup(bytes.fromhex("12345678")), "0x12345678")
+
+    def testSlotNamesFollowTheIndex(self):
+        profile = memphisrider.Profile(bytes(memphisrider.PROFILE_SIZE))
+        profile.importPreset(MY_CARS, 0, "0x12345678", bytes(748))
+        index = memphisrider.XnameIndex()
+        self.assertEqual(profile.slotXname(MY_CARS, 0, index), "0x12345678")
+        index.add("ADDON", "0x12345678")
+        self.assertEqual(profile.slotXname(MY_CARS, 0, index), "ADDON")
+
+    def testHashString(self):
+        for name in common.carXnames[:20]:
+            self.assertEqual(memphisrider.formatXnameHash(memphisrider.hashString(name)), memphisrider.xnames[name])
+
+if __name__ == '__main__':
+    unittest.main()